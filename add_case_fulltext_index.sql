@@ -0,0 +1,5 @@
+-- 为case表添加标题+简介的全文索引（ngram 分词，支持中文），用于案件关键词搜索
+-- 执行此SQL脚本来更新现有数据库
+
+ALTER TABLE `case`
+ADD FULLTEXT INDEX `ft_case_title_introduction` (`title`, `introduction`) WITH PARSER ngram;
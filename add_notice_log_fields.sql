@@ -0,0 +1,7 @@
+-- 为notice_log表添加案件、通知时间字段及通知列表索引
+-- 执行此SQL脚本来更新现有数据库
+
+ALTER TABLE `notice_log`
+ADD COLUMN `case_id` INT NULL COMMENT '案件表主键' AFTER `content`,
+ADD COLUMN `timestamp` INT NULL COMMENT '通知时间' AFTER `case_id`,
+ADD INDEX `idx_notice_log_account_id` (`account_id`, `notice_log_id`);
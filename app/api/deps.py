@@ -1,10 +1,14 @@
 """
 API 依赖项
 用于请求验证、权限检查等
+带 _async 后缀的依赖使用异步 Redis，供 async def 接口使用，不占用线程池
 """
-from fastapi import HTTPException, Depends
+from typing import Callable
+
+from fastapi import APIRouter, HTTPException, Depends, Header
 from fastapi.security import APIKeyHeader
 
+from app.core.config import ASYNC_DB_ENDPOINTS
 from app.utils.token import TokenManager
 
 # 从请求头 Authorization 中获取 token
@@ -61,3 +65,84 @@ def get_current_user(authorization: str = Depends(auth_header)) -> dict:
         raise HTTPException(status_code=401, detail="Token无效或已过期")
 
     return user_data
+
+
+def _parse_authorization(authorization: str) -> str:
+    """
+    解析 Authorization 请求头，支持 "Bearer token" 和 直接 "token" 两种格式
+
+    :param authorization: 请求头中的 Authorization 值
+    :return: token 字符串
+    :raises HTTPException: 未提供时抛出 401 错误
+    """
+    if not authorization:
+        raise HTTPException(status_code=401, detail="未提供认证信息")
+
+    if authorization.startswith("Bearer ") or authorization.startswith("bearer "):
+        return authorization[7:]
+    return authorization
+
+
+async def get_current_token_async(authorization: str = Depends(auth_header)) -> str:
+    """
+    从请求头获取并验证 Token（异步）
+
+    :param authorization: 请求头中的 Authorization 值
+    :return: token 字符串
+    :raises HTTPException: Token 无效时抛出 401 错误
+    """
+    token = _parse_authorization(authorization)
+    user_data = await TokenManager.averify(token)
+    if not user_data:
+        raise HTTPException(status_code=401, detail="Token无效或已过期")
+
+    return token
+
+
+async def get_current_user_async(authorization: str = Depends(auth_header)) -> dict:
+    """
+    从请求头获取当前用户信息（异步）
+
+    :param authorization: 请求头中的 Authorization 值
+    :return: 用户数据字典
+    :raises HTTPException: Token 无效时抛出 401 错误
+    """
+    token = _parse_authorization(authorization)
+    user_data = await TokenManager.averify(token)
+    if not user_data:
+        raise HTTPException(status_code=401, detail="Token无效或已过期")
+
+    return user_data
+
+
+async def get_token_user_async(token: str = Header(..., description="登录时获取的Token")) -> dict:
+    """
+    从请求头 token 获取当前用户信息（异步），与各业务接口的 token 请求头一致
+
+    :param token: 登录时获取的Token
+    :return: 用户数据字典
+    :raises HTTPException: Token 无效时抛出 401 错误
+    """
+    user_data = await TokenManager.averify(token)
+    if not user_data:
+        raise HTTPException(status_code=401, detail="Token无效或已过期")
+
+    return user_data
+
+
+def register_db_route(router: APIRouter, path: str, sync_endpoint: Callable, async_endpoint: Callable, **kwargs):
+    """
+    按 ASYNC_DB_ENDPOINTS 配置为同一路径注册同步或异步实现（POST）
+
+    配置中的接口名为同步实现的函数名，如 "case_list"、"login"
+
+    :param router: 路由
+    :param path: 接口路径，如 "/case_list"
+    :param sync_endpoint: 同步实现（def，运行在线程池）
+    :param async_endpoint: 异步实现（async def，使用 AsyncSession 与异步 Redis）
+    :param kwargs: 透传给 router.add_api_route 的其他参数
+    """
+    name = sync_endpoint.__name__
+    use_async = "*" in ASYNC_DB_ENDPOINTS or name in ASYNC_DB_ENDPOINTS
+    endpoint = async_endpoint if use_async else sync_endpoint
+    router.add_api_route(path, endpoint, methods=["POST"], **kwargs)
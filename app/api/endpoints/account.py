@@ -1,21 +1,66 @@
 """
 账号管理接口
+get_account、get_account_list 同时提供同步与异步实现，由 ASYNC_DB_ENDPOINTS 配置选择
 """
 import time
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, Header
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, Select
+from sqlalchemy.exc import IntegrityError
 from pydantic import BaseModel, Field, validator
 import re
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
+from app.api.deps import get_token_user_async, register_db_route
 from app.models.account import Account
 from app.utils.token import TokenManager
+from app.utils.account_resolver import invalidate_account
+from app.utils.fields import FieldSet, FieldSpec
 from app.schemas import success, error
 
 # 每页条数
 PAGE_SIZE = 20
+# 客户端指定每页条数时的上限
+MAX_PAGE_SIZE = 100
+
+# 用户列表读取的列，结果为行元组而非 ORM 对象
+ACCOUNT_LIST_COLUMNS = (
+    Account.account_id,
+    Account.name,
+    Account.mobile,
+    Account.sign_up_timestamp,
+    Account.close,
+    Account.type
+)
+
+
+def format_sign_up_time(ts: Optional[int]) -> str:
+    """注册时间转 年-月-日 时:分"""
+    if not ts:
+        return ""
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
+
+
+# 用户返回字段
+ACCOUNT_FIELDS = FieldSet({
+    "account_id": FieldSpec((Account.account_id,), lambda a: a.account_id),
+    "name": FieldSpec((Account.name,), lambda a: a.name or ""),
+    "mobile": FieldSpec((Account.mobile,), lambda a: a.mobile or ""),
+    "sign_up_timestamp_string": FieldSpec(
+        (Account.sign_up_timestamp,), lambda a: format_sign_up_time(a.sign_up_timestamp)
+    ),
+    "close": FieldSpec((Account.close,), lambda a: a.close or 0),
+    "type": FieldSpec((Account.type,), lambda a: a.type or 0),
+})
+
+# 用户列表可选返回字段（last_item 由 format_account_list 填写）
+ACCOUNT_LIST_FIELDS = FieldSet({
+    **ACCOUNT_FIELDS.specs,
+    "last_item": FieldSpec(),
+}, required=("account_id",))
 
 router = APIRouter()
 
@@ -70,7 +115,12 @@ def create_account(
         sign_up_timestamp=int(time.time())
     )
     db.add(account)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # 并发创建时由 uq_account_mobile 唯一索引兜底
+        db.rollback()
+        return error(code=400, message="该手机号已存在")
     db.refresh(account)
 
     return success(
@@ -131,7 +181,12 @@ def update_account(
     account.mobile = request.mobile
     account.name = request.name
     account.type = request.type
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return error(code=400, message="该手机号已被其他用户使用")
+    invalidate_account(request.account_id)
 
     return success(message="用户编辑成功")
 
@@ -141,7 +196,16 @@ class GetAccountRequest(BaseModel):
     account_id: int = Field(..., description="用户ID")
 
 
-@router.post("/get_account")
+def format_account(account: Account) -> dict:
+    """
+    组装用户返回数据
+
+    :param account: 用户
+    :return: 用户数据
+    """
+    return ACCOUNT_FIELDS.format(account, None)
+
+
 def get_account(
     request: GetAccountRequest,
     db: Session = Depends(get_db),
@@ -161,32 +225,109 @@ def get_account(
         return error(code=401, message="Token无效或已过期")
 
     # 查询用户
-    account = db.query(Account).filter(Account.account_id == request.account_id).first()
+    account = db.get(Account, request.account_id)
+    if not account:
+        return error(code=404, message="用户不存在")
+
+    return success(data=format_account(account))
+
+
+async def get_account_async(
+    request: GetAccountRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user_data: dict = Depends(get_token_user_async)
+):
+    """
+    根据ID获取用户
+
+    :param request: 请求参数
+    :param db: 异步数据库会话
+    :param user_data: 当前用户（由请求头 token 解析）
+    :return: 用户信息
+    """
+    account = await db.get(Account, request.account_id)
     if not account:
         return error(code=404, message="用户不存在")
 
-    # 格式化注册时间
-    sign_up_str = ""
-    if account.sign_up_timestamp:
-        sign_up_str = datetime.fromtimestamp(account.sign_up_timestamp).strftime("%Y-%m-%d %H:%M")
+    return success(data=format_account(account))
+
 
-    return success(data={
-        "account_id": account.account_id,
-        "name": account.name or "",
-        "mobile": account.mobile or "",
-        "sign_up_timestamp_string": sign_up_str,
-        "close": account.close or 0,
-        "type": account.type or 0
-    })
+register_db_route(router, "/get_account", get_account, get_account_async)
 
 
 class GetAccountListRequest(BaseModel):
     """获取用户列表请求参数"""
     page: int = Field(1, description="页数", ge=1)
     type_array: List[int] = Field(..., description="用户类型数组，如 [0,1,2,3]")
+    after_account_id: Optional[int] = Field(
+        None,
+        description="游标分页：首页传 0，之后传上一页最后一个 account_id；不传则按 page 分页",
+        ge=0
+    )
+    page_size: Optional[int] = Field(None, description=f"每页条数，默认 {PAGE_SIZE}，最大 {MAX_PAGE_SIZE}", ge=1)
+    fields: Optional[List[str]] = Field(
+        None,
+        description=f"返回字段，不传返回全部；可选: {','.join(ACCOUNT_LIST_FIELDS.names)}"
+    )
+
+    @validator('fields')
+    def validate_fields(cls, v):
+        """校验返回字段"""
+        return ACCOUNT_LIST_FIELDS.validate(v)
+
+
+def get_account_page_size(request: GetAccountListRequest) -> int:
+    """获取每页条数（客户端指定时不超过 MAX_PAGE_SIZE）"""
+    if request.page_size is None:
+        return PAGE_SIZE
+    return min(request.page_size, MAX_PAGE_SIZE)
+
+
+def build_account_list_query(request: GetAccountListRequest) -> Select:
+    """
+    构建用户列表当前页查询（同步/异步实现共用）
+    多取一条用于判断是否是最后一页，替代 COUNT
+
+    :param request: 请求参数
+    :return: 查询语句，行为 ACCOUNT_LIST_COLUMNS 中所选字段用到的列
+    """
+    page_size = get_account_page_size(request)
+
+    # 查询条件：按类型筛选，按注册时间倒序；只读取所选字段用到的列
+    query = select(*ACCOUNT_LIST_FIELDS.columns(request.fields, ACCOUNT_LIST_COLUMNS)).where(
+        Account.type.in_(request.type_array)
+    ).order_by(Account.account_id.desc())
+
+    if request.after_account_id is not None:
+        # 游标分页：按主键跳过已返回的用户
+        if request.after_account_id > 0:
+            query = query.where(Account.account_id < request.after_account_id)
+    else:
+        query = query.offset((request.page - 1) * page_size)
+
+    return query.limit(page_size + 1)
+
+
+def format_account_list(accounts: list, page_size: int, fields: Optional[List[str]] = None) -> list:
+    """
+    组装用户列表返回数据
+
+    :param accounts: 当前页查询结果行（最多 page_size + 1 条）
+    :param page_size: 每页条数
+    :param fields: 返回字段，None 为全部
+    :return: 列表数据
+    """
+    # 判断是否是最后一页
+    is_last_page = len(accounts) <= page_size
+    accounts = accounts[:page_size]
+
+    last_index = len(accounts) - 1 if is_last_page else -1
+    return [
+        ACCOUNT_LIST_FIELDS.format(a, fields, last_item=1 if i == last_index else 0)
+        for i, a in enumerate(accounts)
+    ]
 
 
-@router.post("/get_account_list")
 def get_account_list(
     request: GetAccountListRequest,
     db: Session = Depends(get_db),
@@ -205,40 +346,30 @@ def get_account_list(
     if not user_data:
         return error(code=401, message="Token无效或已过期")
 
-    # 查询条件：按类型筛选
-    query = db.query(Account).filter(Account.type.in_(request.type_array))
+    accounts = db.execute(build_account_list_query(request)).all()
 
-    # 按注册时间倒序
-    query = query.order_by(Account.account_id.desc())
+    return success(data=format_account_list(accounts, get_account_page_size(request), request.fields))
 
-    # 总数
-    total = query.count()
 
-    # 分页
-    offset = (request.page - 1) * PAGE_SIZE
-    accounts = query.offset(offset).limit(PAGE_SIZE).all()
+async def get_account_list_async(
+    request: GetAccountListRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user_data: dict = Depends(get_token_user_async)
+):
+    """
+    获取用户列表
 
-    # 判断是否是最后一页
-    is_last_page = (offset + len(accounts)) >= total
-
-    # 组装返回数据
-    data = []
-    for i, a in enumerate(accounts):
-        is_last_item = 1 if (is_last_page and i == len(accounts) - 1) else 0
-        sign_up_str = ""
-        if a.sign_up_timestamp:
-            sign_up_str = datetime.fromtimestamp(a.sign_up_timestamp).strftime("%Y-%m-%d %H:%M")
-        data.append({
-            "account_id": a.account_id,
-            "name": a.name or "",
-            "mobile": a.mobile or "",
-            "sign_up_timestamp_string": sign_up_str,
-            "close": a.close or 0,
-            "type": a.type or 0,
-            "last_item": is_last_item
-        })
-
-    return success(data=data)
+    :param request: 请求参数
+    :param db: 异步数据库会话
+    :param user_data: 当前用户（由请求头 token 解析）
+    :return: 用户列表
+    """
+    accounts = (await db.execute(build_account_list_query(request))).all()
+
+    return success(data=format_account_list(accounts, get_account_page_size(request), request.fields))
+
+
+register_db_route(router, "/get_account_list", get_account_list, get_account_list_async)
 
 
 class DeleteAccountRequest(BaseModel):
@@ -281,5 +412,6 @@ def delete_account(
     # 关闭用户
     account.close = 1
     db.commit()
+    invalidate_account(request.account_id)
 
     return success(message="用户删除成功")
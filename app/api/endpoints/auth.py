@@ -1,15 +1,21 @@
 """
 认证相关接口
+login 同时提供同步与异步实现，由 ASYNC_DB_ENDPOINTS 配置选择
+验证码在 Redis 中校验并消费（app/sms/codes.py），sms 表的使用记录由后台任务写入
 """
-import time
-from fastapi import APIRouter, Depends, Header
+from fastapi import APIRouter, BackgroundTasks, Depends, Header
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, Update
+from sqlalchemy.exc import SQLAlchemyError
 from pydantic import BaseModel, Field, validator
 import re
 
-from app.core.database import get_db
+from app.core.database import SessionLocal, get_db, get_async_db
+from app.api.deps import register_db_route
 from app.models.account import Account
 from app.models.sms import Sms
+from app.sms import VerificationCodeStore, CODE_OK, CODE_LOCKED
 from app.utils.token import TokenManager
 from app.schemas import success, error
 
@@ -40,46 +46,93 @@ class LoginRequest(BaseModel):
         return v
 
 
-@login_router.post("/")
-def login(request: LoginRequest, db: Session = Depends(get_db)):
+def build_mark_code_used_query(mobile: str, code: str) -> Update:
+    """
+    构建验证码记录标记为已使用的语句
+
+    :param mobile: 手机号
+    :param code: 验证码
+    :return: 更新语句
+    """
+    return update(Sms).where(
+        Sms.mobile == mobile,
+        Sms.type == 1,  # 未使用
+        Sms.sms_code == code
+    ).values(type=2)
+
+
+def mark_sms_code_used(mobile: str, code: str):
+    """
+    后台任务：sms 表中的验证码记录标记为已使用（仅作记录，校验以 Redis 为准）
+
+    :param mobile: 手机号
+    :param code: 验证码
+    """
+    db = SessionLocal()
+    try:
+        db.execute(build_mark_code_used_query(mobile, code))
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        print(f"验证码使用记录写入失败: {mobile} {e}")
+    finally:
+        db.close()
+
+
+def check_sms_code(result: int):
+    """
+    检查验证码校验结果
+
+    :param result: VerificationCodeStore.consume 的返回值
+    :return: 错误响应，验证码正确时返回 None
+    """
+    if result == CODE_OK:
+        return None
+    if result == CODE_LOCKED:
+        return error(code=400, message="验证码错误次数过多，请重新获取")
+    return error(code=400, message="验证码错误或已过期")
+
+
+def check_login_account(account: Account):
+    """
+    检查登录账号状态
+
+    :param account: 手机号对应的账号
+    :return: 错误响应，账号可登录时返回 None
+    """
+    if not account:
+        return error(code=404, message="该手机号不是系统用户")
+
+    if account.close == 1:
+        return error(code=403, message="账号已被关闭，请联系管理员")
+
+    return None
+
+
+def login(request: LoginRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """
     短信验证码登录
     
     :param request: 请求参数 {"mobile": "手机号", "code": "验证码"}
+    :param background_tasks: 后台任务（写入验证码使用记录）
     :param db: 数据库会话
     :return: {"code": 0, "message": "string", "data": {"token": "string"}}
     """
     mobile = request.mobile
-    code = request.code
-    current_time = int(time.time())
-    five_minutes_ago = current_time - 300  # 5分钟 = 300秒
-    
-    # 1. 查询验证码记录
-    sms_record = db.query(Sms).filter(
-        Sms.mobile == mobile,
-        Sms.sms_code == code,
-        Sms.type == 1,  # 未使用
-        Sms.timestamp >= five_minutes_ago  # 5分钟内
-    ).order_by(Sms.timestamp.desc()).first()
-    
-    if not sms_record:
-        return error(code=400, message="验证码错误或已过期")
     
-    # 2. 验证码验证成功，立即标记为已使用
-    sms_record.type = 2
-    db.commit()
+    # 1. 校验并消费验证码（Redis 一次原子操作，并发登录只有一个成功）
+    code_error = check_sms_code(VerificationCodeStore.consume(mobile, request.code))
+    if code_error:
+        return code_error
     
-    # 3. 查询账号是否存在
-    account = db.query(Account).filter(
-        Account.mobile == mobile
-    ).first()
+    # 2. 响应后在 sms 表中标记为已使用
+    background_tasks.add_task(mark_sms_code_used, mobile, request.code)
     
-    if not account:
-        return error(code=404, message="该手机号不是系统用户")
-    
-    # 4. 检查账号是否被关闭
-    if account.close == 1:
-        return error(code=403, message="账号已被关闭，请联系管理员")
+    # 3. 查询账号是否存在，4. 检查账号是否被关闭
+    account = db.scalar(select(Account).where(Account.mobile == mobile).limit(1))
+    account_error = check_login_account(account)
+    if account_error:
+        return account_error
     
     # 5. 生成 token
     token = TokenManager.generate(
@@ -98,6 +151,47 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
     )
 
 
+async def login_async(request: LoginRequest, background_tasks: BackgroundTasks,
+                      db: AsyncSession = Depends(get_async_db)):
+    """
+    短信验证码登录
+    
+    :param request: 请求参数 {"mobile": "手机号", "code": "验证码"}
+    :param background_tasks: 后台任务（写入验证码使用记录）
+    :param db: 异步数据库会话
+    :return: {"code": 0, "message": "string", "data": {"token": "string"}}
+    """
+    mobile = request.mobile
+
+    code_error = check_sms_code(await VerificationCodeStore.aconsume(mobile, request.code))
+    if code_error:
+        return code_error
+
+    background_tasks.add_task(mark_sms_code_used, mobile, request.code)
+
+    account = await db.scalar(select(Account).where(Account.mobile == mobile).limit(1))
+    account_error = check_login_account(account)
+    if account_error:
+        return account_error
+
+    token = await TokenManager.agenerate(
+        account_id=account.account_id,
+        account_type=account.type,
+        extra_data={
+            "mobile": account.mobile,
+            "name": account.name
+        }
+    )
+
+    return success(
+        data={"token": token},
+        message="登录成功"
+    )
+
+
+register_db_route(login_router, "/", login, login_async)
+
+
 @logout_router.post("/")
 def logout(token: str = Header(..., description="登录时获取的Token")):
     """
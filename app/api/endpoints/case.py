@@ -1,34 +1,114 @@
 """
 案件管理接口
+case_list、case_details、case_sla 同时提供同步与异步实现，由 ASYNC_DB_ENDPOINTS 配置选择
 """
 import time
 from datetime import datetime
-from typing import Optional, List
-from fastapi import APIRouter, Depends, Header
+from typing import Optional, List, Dict, Tuple
+from fastapi import APIRouter, BackgroundTasks, Depends, Header
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
-from pydantic import BaseModel, Field
-
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, asc, select, insert, update, delete, func, Select
+from pydantic import BaseModel, Field, validator
+from redis import RedisError
+
+from app.core.config import CASE_SLA_BUCKET_HOURS
+from app.core.database import get_db, get_async_db
+from app.api.deps import get_token_user_async, register_db_route
 from app.models.case import Case
 from app.models.account_case import AccountCase
 from app.models.account import Account
 from app.utils.token import TokenManager
-from app.schemas import success, error
+from app.utils.message_cache import CaseMessageCache
+from app.utils.account_resolver import AccountResolver, resolve_account, aresolve_account
+from app.utils.case_list_cache import CaseListCache
+from app.utils.case_sla import CaseSlaIndex, open_case_sla_score
+from app.utils.unread import UnreadCounter
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_after
+from app.utils.fields import FieldSet, FieldSpec
+from app.search import case_search_index
+from app.notice import NoticeQueue, case_completed_event, case_archived_event
+from app.schemas import success, error, CaseListResponse, CaseDetailsResponse
 
 router = APIRouter()
 
 # 每页条数
 PAGE_SIZE = 20
+# 律师回复 SLA 每页最大条数
+MAX_SLA_PAGE_SIZE = 100
+
+# 案件列表、详情读取的列（含游标可用的各排序字段），只取返回用到的列，结果为行元组而非 ORM 对象
+CASE_COLUMNS = (
+    Case.case_id,
+    Case.title,
+    Case.introduction,
+    Case.timestamp,
+    Case.complete_timestamp,
+    Case.update_timestamp,
+    Case.lawyer_last_timestamp,
+    Case.progress,
+    Case.type
+)
+
+# 案件列表、详情共有的返回字段
+CASE_FIELD_SPECS = {
+    "case_id": FieldSpec((Case.case_id,), lambda c: c.case_id),
+    "title": FieldSpec((Case.title,), lambda c: c.title or ""),
+    "introduction": FieldSpec((Case.introduction,), lambda c: c.introduction or ""),
+    "timestamp_string": FieldSpec((Case.timestamp,), lambda c: format_timestamp(c.timestamp)),
+    "lawyer_last_timestamp_string": FieldSpec(
+        (Case.lawyer_last_timestamp,), lambda c: format_timestamp(c.lawyer_last_timestamp)
+    ),
+    "lawyer_last_timestamp_interval_h": FieldSpec(
+        (Case.lawyer_last_timestamp,), lambda c: calc_interval_hours(c.lawyer_last_timestamp)
+    ),
+    "update_timestamp": FieldSpec((Case.update_timestamp,), lambda c: c.update_timestamp or 0),
+    "update_timestamp_string": FieldSpec((Case.update_timestamp,), lambda c: format_timestamp(c.update_timestamp)),
+    "progress": FieldSpec((Case.progress,), lambda c: c.progress or 0),
+    "type": FieldSpec((Case.type,), lambda c: c.type or 0),
+}
+
+# 案件列表可选返回字段（last_item 由 format_case_list 填写，unread 由 attach_unread 填写）
+CASE_LIST_FIELDS = FieldSet({
+    **CASE_FIELD_SPECS,
+    "last_item": FieldSpec(),
+    "unread": FieldSpec(),
+}, required=("case_id",))
+
+# 案件详情可选返回字段（account_case 为绑定人员，不需要时不查询）
+CASE_DETAILS_FIELDS = FieldSet({
+    **CASE_FIELD_SPECS,
+    "complete_timestamp_string": FieldSpec(
+        (Case.complete_timestamp,), lambda c: format_timestamp(c.complete_timestamp)
+    ),
+    "account_case": FieldSpec(),
+}, required=("case_id",))
 
 
 class CaseListRequest(BaseModel):
     """获取案件列表请求参数"""
     keyword: str = Field("", description="搜索词")
-    sort_method: int = Field(0, description="排序依据：0按创建时间 1按完成时间 2按消息更新时间 3按律师最后回复时间", ge=0, le=3)
+    sort_method: int = Field(
+        0,
+        description="排序依据：0按创建时间 1按完成时间 2按消息更新时间 3按律师最后回复时间 4按相关度（需搜索词，仅 page 分页）",
+        ge=0, le=4
+    )
     sort: int = Field(0, description="0正序 1倒序", ge=0, le=1)
     filter: int = Field(0, description="0全部 1去掉归档 2归档", ge=0, le=2)
     page: int = Field(1, description="页数", ge=1)
+    cursor: Optional[str] = Field(
+        None,
+        description="游标分页：首页传空字符串，之后传上次返回的 next_cursor；不传则按 page 分页"
+    )
+    fields: Optional[List[str]] = Field(
+        None,
+        description=f"返回字段，不传返回全部；可选: {','.join(CASE_LIST_FIELDS.names)}"
+    )
+
+    @validator('fields')
+    def validate_fields(cls, v):
+        """校验返回字段"""
+        return CASE_LIST_FIELDS.validate(v)
 
 
 class AccountCaseItem(BaseModel):
@@ -37,6 +117,60 @@ class AccountCaseItem(BaseModel):
     type: int = Field(..., description="角色类型 1是客户 2是律师 3是参与者", ge=1, le=3)
 
 
+def build_case_account_ids_query(case_id: int) -> Select:
+    """案件绑定人员ID查询（用于使其案件列表缓存失效）"""
+    return select(AccountCase.account_id).where(AccountCase.case_id == case_id)
+
+
+def unique_account_case(items: List[AccountCaseItem]) -> List[AccountCaseItem]:
+    """绑定人员去重（同一人重复出现时以最后一次为准）"""
+    return list({item.account_id: item for item in items}.values())
+
+
+def find_invalid_account_ids(db: Session, account_ids: List[int]) -> List[int]:
+    """
+    校验绑定人员账号（一次 IN 查询）
+
+    :param db: 数据库会话
+    :param account_ids: 待绑定的账号ID
+    :return: 不存在或已关闭的账号ID
+    """
+    if not account_ids:
+        return []
+    valid_ids = set(db.scalars(select(Account.account_id).where(
+        Account.account_id.in_(account_ids),
+        func.coalesce(Account.close, 0) != 1
+    )).all())
+    return sorted(set(account_ids) - valid_ids)
+
+
+def diff_account_case(existing: Dict[int, int], items: List[AccountCaseItem]) -> Tuple[list, list, Dict[int, list]]:
+    """
+    计算绑定关系变更
+
+    :param existing: 现有绑定 {account_id: type}
+    :param items: 请求的绑定人员（已去重）
+    :return: (新增的 AccountCaseItem 列表, 删除的 account_id 列表, 变更角色 {新type: [account_id]})
+    """
+    requested = {item.account_id: item for item in items}
+    inserts = [item for account_id, item in requested.items() if account_id not in existing]
+    deletes = [account_id for account_id in existing if account_id not in requested]
+    updates: Dict[int, list] = {}
+    for account_id, item in requested.items():
+        if account_id in existing and existing[account_id] != item.type:
+            updates.setdefault(item.type, []).append(account_id)
+    return inserts, deletes, updates
+
+
+def insert_account_case_rows(db: Session, case_id: int, items: List[AccountCaseItem]) -> None:
+    """批量写入绑定关系（一条 INSERT）"""
+    if items:
+        db.execute(insert(AccountCase), [
+            {"case_id": case_id, "account_id": item.account_id, "type": item.type}
+            for item in items
+        ])
+
+
 class CreateCaseRequest(BaseModel):
     """创建案件请求参数"""
     title: str = Field(..., description="标题", min_length=1, max_length=200)
@@ -61,7 +195,170 @@ def calc_interval_hours(ts: Optional[int]) -> int:
     return diff // 3600
 
 
-@router.post("/case_list")
+def get_case_sort_field(sort_method: int):
+    """
+    获取案件列表排序字段
+
+    :param sort_method: 0按创建时间 1按完成时间 2按消息更新时间 3按律师最后回复时间（相关度排序无搜索词时按创建时间）
+    :return: 排序字段
+    """
+    if sort_method == 1:
+        return Case.complete_timestamp
+    elif sort_method == 2:
+        return Case.update_timestamp
+    elif sort_method == 3:
+        return Case.lawyer_last_timestamp
+    return Case.timestamp
+
+
+def decode_case_list_cursor(request: CaseListRequest) -> Optional[list]:
+    """
+    解析案件列表游标，并校验与本次排序方式一致
+
+    :param request: 请求参数（cursor 不为 None）
+    :return: [排序字段值, case_id]，第一页返回 []，无效返回 None
+    """
+    values = decode_cursor(request.cursor)
+    if values == []:
+        return values
+    if not values or len(values) != 4 or values[:2] != [request.sort_method, request.sort]:
+        return None
+    return values[2:]
+
+
+def build_case_list_query(account_id: int, request: CaseListRequest, cursor_values: list = None) -> Select:
+    """
+    构建案件列表查询（同步/异步实现共用）
+
+    :param account_id: 当前用户ID
+    :param request: 请求参数
+    :param cursor_values: 游标 [排序字段值, case_id]，有值时只查询排在其后的案件
+    :return: 已排序、未分页的查询语句，行为 CASE_COLUMNS 中所选字段用到的列（另含排序字段）
+    """
+    # 排序字段，case_id 作为同值时的次级排序，保证翻页稳定
+    sort_field = get_case_sort_field(request.sort_method)
+
+    # 查询该用户关联的案件ID
+    user_case_ids = select(AccountCase.case_id).where(
+        AccountCase.account_id == account_id
+    )
+
+    # 基础查询：只查该用户关联的案件，排除已删除的；只读取所选字段用到的列，排序字段用于生成游标
+    columns = CASE_LIST_FIELDS.columns(request.fields, CASE_COLUMNS, extra=(Case.case_id, sort_field))
+    query = select(*columns).where(
+        Case.case_id.in_(user_case_ids),
+        Case.type != -1
+    )
+
+    # 筛选条件
+    if request.filter == 1:
+        # 去掉归档
+        query = query.where(Case.type != 1)
+    elif request.filter == 2:
+        # 只看归档
+        query = query.where(Case.type == 1)
+
+    # 关键词搜索（全文索引）
+    score = None
+    if request.keyword:
+        condition, score = case_search_index.match(request.keyword)
+        query = query.where(condition)
+
+    # 按相关度排序
+    if request.sort_method == 4 and score is not None:
+        return query.order_by(desc(score), desc(Case.case_id))
+
+    # 游标：跳过已返回的案件
+    if cursor_values:
+        query = query.where(keyset_after(
+            sort_field, Case.case_id, cursor_values[0], cursor_values[1], descending=request.sort == 1
+        ))
+
+    # 排序方向
+    if request.sort == 1:
+        query = query.order_by(desc(sort_field), desc(Case.case_id))
+    else:
+        query = query.order_by(asc(sort_field), asc(Case.case_id))
+
+    return query
+
+
+def build_case_list_page_query(account_id: int, request: CaseListRequest, cursor_values: list = None) -> Select:
+    """
+    构建案件列表当前页查询：多取一条用于判断是否还有下一页，替代 COUNT
+
+    :param account_id: 当前用户ID
+    :param request: 请求参数
+    :param cursor_values: 游标内容（游标分页模式）
+    :return: 查询语句
+    """
+    query = build_case_list_query(account_id, request, cursor_values)
+    if request.cursor is None:
+        query = query.offset((request.page - 1) * PAGE_SIZE)
+    return query.limit(PAGE_SIZE + 1)
+
+
+def format_case_list_page(cases: list, request: CaseListRequest):
+    """
+    组装案件列表当前页返回数据
+
+    :param cases: 当前页查询结果行（最多 PAGE_SIZE + 1 条）
+    :param request: 请求参数
+    :return: page 分页返回列表；游标分页返回 {"list": [], "next_cursor": "", "has_more": 0}
+    """
+    has_more = len(cases) > PAGE_SIZE
+    cases = cases[:PAGE_SIZE]
+    data = format_case_list(cases, is_last_page=not has_more, fields=request.fields)
+    if request.cursor is None:
+        return data
+
+    next_cursor = ""
+    if has_more:
+        last = cases[-1]
+        sort_value = getattr(last, get_case_sort_field(request.sort_method).key)
+        next_cursor = encode_cursor([request.sort_method, request.sort, sort_value, last.case_id])
+    return {
+        "list": data,
+        "next_cursor": next_cursor,
+        "has_more": 1 if has_more else 0
+    }
+
+
+def format_case_list(cases: list, is_last_page: bool, fields: Optional[List[str]] = None) -> list:
+    """
+    组装案件列表返回数据
+
+    :param cases: 当前页案件行
+    :param is_last_page: 是否是最后一页
+    :param fields: 返回字段，None 为全部
+    :return: 列表数据（unread 先填 0，由 attach_unread 按用户填写）
+    """
+    last_index = len(cases) - 1 if is_last_page else -1
+    return [
+        CASE_LIST_FIELDS.format(c, fields, last_item=1 if i == last_index else 0, unread=0)
+        for i, c in enumerate(cases)
+    ]
+
+
+def attach_unread(data, unread: Dict[int, int]):
+    """
+    为案件列表每行加上当前用户的未读数（在结果缓存之外按用户实时读取）
+
+    :param data: format_case_list_page 的返回数据（可能来自缓存，不修改）
+    :param unread: {案件ID: 未读数}
+    :return: 同结构的新数据，每行增加 unread
+    """
+    rows = data["list"] if isinstance(data, dict) else data
+    rows = [dict(row, unread=unread.get(row["case_id"], 0)) for row in rows]
+    return dict(data, list=rows) if isinstance(data, dict) else rows
+
+
+def case_list_ids(data) -> List[int]:
+    """案件列表返回数据中的案件ID"""
+    rows = data["list"] if isinstance(data, dict) else data
+    return [row["case_id"] for row in rows]
+
+
 def case_list(
     request: CaseListRequest,
     db: Session = Depends(get_db),
@@ -83,79 +380,73 @@ def case_list(
     # 获取当前用户 ID
     account_id = user_data.get("account_id")
 
-    # 查询该用户关联的案件ID
-    user_case_ids = db.query(AccountCase.case_id).filter(
-        AccountCase.account_id == account_id
-    ).subquery()
-
-    # 基础查询：只查该用户关联的案件，排除已删除的
-    query = db.query(Case).filter(
-        Case.case_id.in_(user_case_ids),
-        Case.type != -1
-    )
+    # 游标分页模式
+    cursor_values = None
+    if request.cursor is not None:
+        if request.sort_method == 4:
+            return error(code=400, message="相关度排序不支持游标分页")
+        cursor_values = decode_case_list_cursor(request)
+        if cursor_values is None:
+            return error(code=400, message="游标无效")
+
+    # 结果缓存
+    digest = CaseListCache.digest(request.model_dump())
+    version, data = CaseListCache.get(account_id, digest)
+    if data is None:
+        if request.keyword:
+            case_search_index.ensure_loaded(db)
+
+        cases = db.execute(build_case_list_page_query(account_id, request, cursor_values)).all()
+        data = format_case_list_page(cases, request)
+        CaseListCache.set(account_id, version, digest, data)
+
+    # 未读数变化频繁，不进入结果缓存，整页一次读取
+    if CASE_LIST_FIELDS.wants(request.fields, "unread"):
+        data = attach_unread(data, UnreadCounter.counts(account_id, case_list_ids(data)))
+    return success(data=data)
 
-    # 筛选条件
-    if request.filter == 1:
-        # 去掉归档
-        query = query.filter(Case.type != 1)
-    elif request.filter == 2:
-        # 只看归档
-        query = query.filter(Case.type == 1)
 
-    # 关键词搜索
-    if request.keyword:
-        keyword = f"%{request.keyword}%"
-        query = query.filter(
-            (Case.title.like(keyword)) | (Case.introduction.like(keyword))
-        )
-
-    # 排序字段
-    if request.sort_method == 1:
-        sort_field = Case.complete_timestamp
-    elif request.sort_method == 2:
-        sort_field = Case.update_timestamp
-    elif request.sort_method == 3:
-        sort_field = Case.lawyer_last_timestamp
-    else:
-        sort_field = Case.timestamp
+async def case_list_async(
+    request: CaseListRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user_data: dict = Depends(get_token_user_async)
+):
+    """
+    获取案件列表
 
-    # 排序方向
-    if request.sort == 1:
-        query = query.order_by(desc(sort_field))
-    else:
-        query = query.order_by(asc(sort_field))
-
-    # 总数
-    total = query.count()
-
-    # 分页
-    offset = (request.page - 1) * PAGE_SIZE
-    cases = query.offset(offset).limit(PAGE_SIZE).all()
-
-    # 判断是否是最后一页
-    is_last_page = (offset + len(cases)) >= total
-
-    # 组装返回数据
-    data = []
-    for i, c in enumerate(cases):
-        is_last_item = 1 if (is_last_page and i == len(cases) - 1) else 0
-        data.append({
-            "case_id": c.case_id,
-            "title": c.title or "",
-            "introduction": c.introduction or "",
-            "timestamp_string": format_timestamp(c.timestamp),
-            "lawyer_last_timestamp_string": format_timestamp(c.lawyer_last_timestamp),
-            "lawyer_last_timestamp_interval_h": calc_interval_hours(c.lawyer_last_timestamp),
-            "update_timestamp": c.update_timestamp or 0,
-            "update_timestamp_string": format_timestamp(c.update_timestamp),
-            "progress": c.progress or 0,
-            "type": c.type or 0,
-            "last_item": is_last_item
-        })
+    :param request: 请求参数
+    :param db: 异步数据库会话
+    :param user_data: 当前用户（由请求头 token 解析）
+    :return: 案件列表
+    """
+    account_id = user_data.get("account_id")
 
+    cursor_values = None
+    if request.cursor is not None:
+        if request.sort_method == 4:
+            return error(code=400, message="相关度排序不支持游标分页")
+        cursor_values = decode_case_list_cursor(request)
+        if cursor_values is None:
+            return error(code=400, message="游标无效")
+
+    digest = CaseListCache.digest(request.model_dump())
+    version, data = await CaseListCache.aget(account_id, digest)
+    if data is None:
+        if request.keyword:
+            await case_search_index.aensure_loaded(db)
+
+        cases = (await db.execute(build_case_list_page_query(account_id, request, cursor_values))).all()
+        data = format_case_list_page(cases, request)
+        await CaseListCache.aset(account_id, version, digest, data)
+
+    if CASE_LIST_FIELDS.wants(request.fields, "unread"):
+        data = attach_unread(data, await UnreadCounter.acounts(account_id, case_list_ids(data)))
     return success(data=data)
 
 
+register_db_route(router, "/case_list", case_list, case_list_async, response_model=CaseListResponse)
+
+
 @router.post("/create_case")
 def create_case(
     request: CreateCaseRequest,
@@ -177,7 +468,13 @@ def create_case(
 
     current_time = int(time.time())
 
-    # 1. 创建案件
+    # 校验绑定人员
+    account_case_items = unique_account_case(request.account_case)
+    invalid_ids = find_invalid_account_ids(db, [item.account_id for item in account_case_items])
+    if invalid_ids:
+        return error(code=400, message=f"账号不存在或已关闭: {invalid_ids}")
+
+    # 1. 创建案件（flush 获取主键，与绑定关系同一事务提交）
     case = Case(
         title=request.title,
         introduction=request.introduction,
@@ -187,21 +484,21 @@ def create_case(
         type=0       # 默认正常
     )
     db.add(case)
+    db.flush()
+    case_id = case.case_id
+    sla_score = open_case_sla_score(case)
+
+    # 2. 批量创建案件与人物绑定关系
+    insert_account_case_rows(db, case_id, account_case_items)
     db.commit()
-    db.refresh(case)
-
-    # 2. 创建案件与人物绑定关系
-    for item in request.account_case:
-        account_case = AccountCase(
-            case_id=case.case_id,
-            account_id=item.account_id,
-            type=item.type
-        )
-        db.add(account_case)
-    db.commit()
+
+    # 3. 更新搜索索引与 SLA 索引，使绑定人员的案件列表缓存失效
+    case_search_index.index_case(case_id, request.title, request.introduction)
+    CaseSlaIndex.refresh(case_id, sla_score)
+    CaseListCache.bump(item.account_id for item in account_case_items)
 
     return success(
-        data={"case_id": case.case_id},
+        data={"case_id": case_id},
         message="案件创建成功"
     )
 
@@ -218,6 +515,7 @@ class UpdateCaseRequest(BaseModel):
 @router.post("/update_case")
 def update_case(
     request: UpdateCaseRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     token: str = Header(..., description="登录时获取的Token")
 ):
@@ -225,6 +523,7 @@ def update_case(
     更新编辑案件数据
 
     :param request: 请求参数
+    :param background_tasks: 后台任务（发送提醒通知）
     :param db: 数据库会话
     :param token: 认证Token
     :return: {"code": 0, "message": "string", "data": {}}
@@ -239,28 +538,59 @@ def update_case(
     if not case:
         return error(code=404, message="案件不存在")
 
+    # 计算绑定关系变更，校验新增/变更角色的人员
+    existing = dict(db.execute(
+        select(AccountCase.account_id, AccountCase.type).where(AccountCase.case_id == request.case_id)
+    ).all())
+    account_case_items = unique_account_case(request.account_case)
+    inserts, deletes, updates = diff_account_case(existing, account_case_items)
+    changed_ids = [item.account_id for item in inserts] + [i for ids in updates.values() for i in ids]
+    invalid_ids = find_invalid_account_ids(db, changed_ids)
+    if invalid_ids:
+        return error(code=400, message=f"账号不存在或已关闭: {invalid_ids}")
+
     # 2. 更新案件信息
+    current_time = int(time.time())
+    completed = request.progress == 2 and case.progress != 2
     case.title = request.title
     case.introduction = request.introduction
     case.progress = request.progress
 
     # 如果进度改为完成，记录完成时间
     if request.progress == 2 and not case.complete_timestamp:
-        case.complete_timestamp = int(time.time())
-
-    # 3. 删除旧的绑定关系
-    db.query(AccountCase).filter(AccountCase.case_id == request.case_id).delete()
+        case.complete_timestamp = current_time
+
+    # 3. 删除移除的绑定关系
+    if deletes:
+        db.execute(delete(AccountCase).where(
+            AccountCase.case_id == request.case_id,
+            AccountCase.account_id.in_(deletes)
+        ))
+
+    # 4. 更新角色变更的绑定关系（每种角色一条 UPDATE）
+    for binding_type, account_ids in updates.items():
+        db.execute(update(AccountCase).where(
+            AccountCase.case_id == request.case_id,
+            AccountCase.account_id.in_(account_ids)
+        ).values(type=binding_type))
+
+    # 5. 批量创建新增的绑定关系
+    insert_account_case_rows(db, request.case_id, inserts)
+
+    sla_score = open_case_sla_score(case)
+    db.commit()
 
-    # 4. 创建新的绑定关系
-    for item in request.account_case:
-        account_case = AccountCase(
-            case_id=request.case_id,
-            account_id=item.account_id,
-            type=item.type
-        )
-        db.add(account_case)
+    # 6. 更新搜索索引与 SLA 索引，使新旧绑定人员的案件列表缓存失效
+    case_search_index.index_case(request.case_id, request.title, request.introduction)
+    CaseSlaIndex.refresh(request.case_id, sla_score)
+    CaseListCache.bump(set(existing) | {item.account_id for item in account_case_items})
+    UnreadCounter.clear(request.case_id, deletes)
 
-    db.commit()
+    # 7. 案件完成时通知绑定人员（响应后写入通知队列）
+    if completed:
+        background_tasks.add_task(NoticeQueue.emit, case_completed_event(
+            request.case_id, request.title, user_data.get("account_id"), current_time
+        ))
 
     return success(message="案件更新成功")
 
@@ -274,6 +604,7 @@ class CaseTypeRequest(BaseModel):
 @router.post("/case_type")
 def case_type(
     request: CaseTypeRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     token: str = Header(..., description="登录时获取的Token")
 ):
@@ -281,6 +612,7 @@ def case_type(
     案件状态变更（删除/正常/归档）
 
     :param request: 请求参数
+    :param background_tasks: 后台任务（发送提醒通知）
     :param db: 数据库会话
     :param token: 认证Token
     :return: {"code": 0, "message": "string", "data": {}}
@@ -305,9 +637,31 @@ def case_type(
         return error(code=400, message=f"案件已是{type_map.get(request.type, '')}状态")
 
     # 更新状态
+    case_title = case.title
     case.type = request.type
+    sla_score = open_case_sla_score(case)
     db.commit()
 
+    # 更新 SLA 索引，使绑定人员的案件列表缓存失效
+    account_ids = db.scalars(build_case_account_ids_query(request.case_id)).all()
+    CaseSlaIndex.refresh(request.case_id, sla_score)
+    CaseListCache.bump(account_ids)
+
+    # 删除的案件移出搜索索引，清除最近消息缓存和未读数
+    if request.type == -1:
+        case_search_index.remove_case(case.case_id)
+        UnreadCounter.clear(request.case_id, account_ids)
+        try:
+            CaseMessageCache.invalidate(case.case_id)
+        except RedisError as e:
+            print(f"案件消息缓存清除失败: {e}")
+
+    # 归档时通知绑定人员（响应后写入通知队列）
+    if request.type == 1:
+        background_tasks.add_task(NoticeQueue.emit, case_archived_event(
+            request.case_id, case_title, user_data.get("account_id"), int(time.time())
+        ))
+
     type_map = {-1: "删除", 0: "恢复正常", 1: "归档"}
     return success(message=f"案件{type_map.get(request.type, '')}成功")
 
@@ -315,9 +669,76 @@ def case_type(
 class CaseDetailsRequest(BaseModel):
     """案件详情请求参数"""
     case_id: int = Field(..., description="案件ID")
+    fields: Optional[List[str]] = Field(
+        None,
+        description=f"返回字段，不传返回全部；可选: {','.join(CASE_DETAILS_FIELDS.names)}"
+    )
+
+    @validator('fields')
+    def validate_fields(cls, v):
+        """校验返回字段"""
+        return CASE_DETAILS_FIELDS.validate(v)
+
+
+def build_case_details_query(request: CaseDetailsRequest) -> Select:
+    """
+    构建案件详情查询（只读取所选字段用到的列）
+
+    :param request: 请求参数
+    :return: 查询语句
+    """
+    columns = CASE_DETAILS_FIELDS.columns(request.fields, CASE_COLUMNS)
+    return select(*columns).where(Case.case_id == request.case_id)
+
+
+def build_case_bindings_query(case_id: int) -> Select:
+    """
+    构建案件绑定人员查询（同步/异步实现共用，姓名由 attach_binding_names 补齐）
+
+    :param case_id: 案件ID
+    :return: 查询语句，行为 (account_id, type)
+    """
+    return select(AccountCase.account_id, AccountCase.type).where(
+        AccountCase.case_id == case_id
+    )
+
+
+def attach_binding_names(bindings: list, resolver: AccountResolver) -> list:
+    """
+    为绑定人员补齐姓名，账号不存在的绑定不返回
+
+    :param bindings: (account_id, type) 列表
+    :param resolver: 已加载的账号解析器
+    :return: (account_id, type, name) 列表
+    """
+    return [
+        (account_id, binding_type, resolver.name(account_id))
+        for account_id, binding_type in bindings
+        if resolver.get(account_id) is not None
+    ]
+
+
+def format_case_details(case, bindings: list, fields: Optional[List[str]] = None) -> dict:
+    """
+    组装案件详情返回数据
+
+    :param case: build_case_details_query 的查询结果行
+    :param bindings: 绑定人员 (account_id, type, name) 列表
+    :param fields: 返回字段，None 为全部
+    :return: 详情数据
+    """
+    # 组装绑定人员数据
+    account_case_list = []
+    for account_id, binding_type, name in bindings:
+        account_case_list.append({
+            "account_id": account_id,
+            "type": binding_type,
+            "name": name or ""
+        })
+
+    return CASE_DETAILS_FIELDS.format(case, fields, account_case=account_case_list)
 
 
-@router.post("/case_details")
 def case_details(
     request: CaseDetailsRequest,
     db: Session = Depends(get_db),
@@ -337,40 +758,156 @@ def case_details(
         return error(code=401, message="Token无效或已过期")
 
     # 查询案件
-    case = db.query(Case).filter(Case.case_id == request.case_id).first()
+    case = db.execute(build_case_details_query(request)).first()
     if not case:
         return error(code=404, message="案件不存在")
 
-    # 查询案件绑定的人员，关联 account 表获取姓名
-    bindings = db.query(AccountCase, Account.name).join(
-        Account, AccountCase.account_id == Account.account_id
-    ).filter(
-        AccountCase.case_id == request.case_id
-    ).all()
+    # 查询案件绑定的人员
+    bindings = []
+    if CASE_DETAILS_FIELDS.wants(request.fields, "account_case"):
+        bindings = db.execute(build_case_bindings_query(request.case_id)).all()
+        resolver = AccountResolver().add(account_id for account_id, _ in bindings).load(db)
+        bindings = attach_binding_names(bindings, resolver)
+
+    return success(data=format_case_details(case, bindings, request.fields))
+
+
+async def case_details_async(
+    request: CaseDetailsRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user_data: dict = Depends(get_token_user_async)
+):
+    """
+    获取案件详情
+
+    :param request: 请求参数
+    :param db: 异步数据库会话
+    :param user_data: 当前用户（由请求头 token 解析）
+    :return: 案件详情数据
+    """
+    case = (await db.execute(build_case_details_query(request))).first()
+    if not case:
+        return error(code=404, message="案件不存在")
+
+    bindings = []
+    if CASE_DETAILS_FIELDS.wants(request.fields, "account_case"):
+        bindings = (await db.execute(build_case_bindings_query(request.case_id))).all()
+        resolver = await AccountResolver().add(account_id for account_id, _ in bindings).aload(db)
+        bindings = attach_binding_names(bindings, resolver)
+
+    return success(data=format_case_details(case, bindings, request.fields))
 
-    # 组装绑定人员数据
-    account_case_list = []
-    for binding, name in bindings:
-        account_case_list.append({
-            "account_id": binding.account_id,
-            "type": binding.type,
-            "name": name or ""
-        })
 
-    # 组装返回数据
-    data = {
-        "case_id": case.case_id,
-        "title": case.title or "",
-        "introduction": case.introduction or "",
-        "timestamp_string": format_timestamp(case.timestamp),
-        "complete_timestamp_string": format_timestamp(case.complete_timestamp),
-        "lawyer_last_timestamp_string": format_timestamp(case.lawyer_last_timestamp),
-        "lawyer_last_timestamp_interval_h": calc_interval_hours(case.lawyer_last_timestamp),
-        "update_timestamp": case.update_timestamp or 0,
-        "update_timestamp_string": format_timestamp(case.update_timestamp),
-        "progress": case.progress or 0,
-        "type": case.type or 0,
-        "account_case": account_case_list
+register_db_route(router, "/case_details", case_details, case_details_async,
+                  response_model=CaseDetailsResponse)
+
+
+class CaseSlaRequest(BaseModel):
+    """律师回复 SLA 请求参数"""
+    min_hours: int = Field(0, description="只列出等待律师回复超过该小时数的案件", ge=0)
+    page: int = Field(1, description="页数", ge=1)
+    page_size: int = Field(PAGE_SIZE, description="每页条数", ge=1, le=MAX_SLA_PAGE_SIZE)
+
+
+def format_case_sla(total: int, counts: List[int], entries: List[Tuple[int, int]], titles: Dict[int, str],
+                    request: CaseSlaRequest) -> dict:
+    """
+    组装律师回复 SLA 返回数据
+
+    :param total: 等待中的案件总数
+    :param counts: CASE_SLA_BUCKET_HOURS 各区间的案件数
+    :param entries: 本页案件 (case_id, 律师最后回复时间)，多取一条判断是否还有更多
+    :param titles: {案件ID: 标题}
+    :param request: 请求参数
+    :return: {"total": 0, "buckets": [], "list": [], "has_more": 0}
+    """
+    return {
+        "total": total,
+        "buckets": [{"hours": hours, "count": count} for hours, count in zip(CASE_SLA_BUCKET_HOURS, counts)],
+        "list": [
+            {
+                "case_id": case_id,
+                "title": titles.get(case_id, ""),
+                "lawyer_last_timestamp": last_timestamp,
+                "lawyer_last_timestamp_string": format_timestamp(last_timestamp),
+                "lawyer_last_timestamp_interval_h": calc_interval_hours(last_timestamp)
+            }
+            for case_id, last_timestamp in entries[:request.page_size]
+        ],
+        "has_more": 1 if len(entries) > request.page_size else 0
     }
 
-    return success(data=data)
+
+def build_case_titles_query(case_ids: List[int]) -> Select:
+    """构建案件标题查询（一次 IN 查询）"""
+    return select(Case.case_id, Case.title).where(Case.case_id.in_(case_ids))
+
+
+def case_sla(
+    request: CaseSlaRequest,
+    db: Session = Depends(get_db),
+    token: str = Header(..., description="登录时获取的Token")
+):
+    """
+    律师回复 SLA（仅主任）：各超时区间的案件数，及等待律师回复最久的进行中案件
+    统计与排序均由 Redis 有序集合完成，耗时与案件总数无关
+
+    :param request: 请求参数
+    :param db: 数据库会话
+    :param token: 认证Token
+    :return: {"code": 0, "message": "string", "data": {"total": 0, "buckets": [], "list": [], "has_more": 0}}
+    """
+    user_data = TokenManager.verify(token)
+    if not user_data:
+        return error(code=401, message="Token无效或已过期")
+
+    account = resolve_account(db, user_data.get("account_id"))
+    if not account or account.type != 0:
+        return error(code=403, message="仅主任可查看")
+
+    now = int(time.time())
+    offset = (request.page - 1) * request.page_size
+    try:
+        total, counts = CaseSlaIndex.count_waiting(now, CASE_SLA_BUCKET_HOURS)
+        entries = CaseSlaIndex.oldest(now - request.min_hours * 3600, offset, request.page_size + 1)
+    except RedisError as e:
+        print(f"SLA 索引读取失败: {e}")
+        return error(code=500, message="SLA 数据读取失败")
+
+    titles = dict(db.execute(build_case_titles_query([case_id for case_id, _ in entries])).all()) if entries else {}
+    return success(data=format_case_sla(total, counts, entries, titles, request))
+
+
+async def case_sla_async(
+    request: CaseSlaRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user_data: dict = Depends(get_token_user_async)
+):
+    """
+    律师回复 SLA（仅主任）
+
+    :param request: 请求参数
+    :param db: 异步数据库会话
+    :param user_data: 当前用户（由请求头 token 解析）
+    :return: {"code": 0, "message": "string", "data": {"total": 0, "buckets": [], "list": [], "has_more": 0}}
+    """
+    account = await aresolve_account(db, user_data.get("account_id"))
+    if not account or account.type != 0:
+        return error(code=403, message="仅主任可查看")
+
+    now = int(time.time())
+    offset = (request.page - 1) * request.page_size
+    try:
+        total, counts = await CaseSlaIndex.acount_waiting(now, CASE_SLA_BUCKET_HOURS)
+        entries = await CaseSlaIndex.aoldest(now - request.min_hours * 3600, offset, request.page_size + 1)
+    except RedisError as e:
+        print(f"SLA 索引读取失败: {e}")
+        return error(code=500, message="SLA 数据读取失败")
+
+    titles = {}
+    if entries:
+        titles = dict((await db.execute(build_case_titles_query([case_id for case_id, _ in entries]))).all())
+    return success(data=format_case_sla(total, counts, entries, titles, request))
+
+
+register_db_route(router, "/case_sla", case_sla, case_sla_async)
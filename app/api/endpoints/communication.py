@@ -1,30 +1,339 @@
 """
 案件交流接口
+case_communication、case_communication_message 同时提供同步与异步实现，由 ASYNC_DB_ENDPOINTS 配置选择
+新消息通过 WebSocket（/ws/{case_id}）或 SSE（/sse/{case_id}）实时推送，无需轮询
+未读数由 UnreadCounter 在消息提交时增量维护，mark_read 标记已读
+最近消息缓存在 Redis（CaseMessageCache），打开交流大厅时多数请求无需访问数据库
 """
+import asyncio
+import json
 import time
 from datetime import datetime
-from fastapi import APIRouter, Depends, Header
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from redis import RedisError
 from sqlalchemy.orm import Session
-from sqlalchemy import asc
-from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import asc, desc, func, select, insert, Select
+from pydantic import BaseModel, Field, validator
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db, AsyncSessionLocal
+from app.api.deps import get_token_user_async, register_db_route
 from app.models.case import Case
+from app.api.endpoints.case import build_case_account_ids_query
 from app.models.case_communication import CaseCommunication
-from app.models.account import Account
 from app.models.account_case import AccountCase
+from app.models.communication_search_token import CommunicationSearchToken
+from app.search.communication_index import (
+    MESSAGE_COLUMNS,
+    CommunicationSearchPage,
+    build_hits_query,
+    make_snippet,
+    message_token_rows
+)
+from app.notice import NoticeQueue, new_message_event
+from app.utils.case_hub import case_message_hub
+from app.utils.message_cache import CaseMessageCache, CachedMessages
+from app.utils.case_list_cache import CaseListCache
+from app.utils.case_sla import CaseSlaIndex
+from app.utils.unread import UnreadCounter
+from app.utils.account_resolver import AccountResolver, AccountInfo, resolve_account, aresolve_account
+from app.utils.fields import FieldSet, FieldSpec
 from app.utils.token import TokenManager
-from app.schemas import success, error
+from app.schemas import success, error, CaseCommunicationResponse
 
 router = APIRouter()
 
+# 交流大厅分页模式最大条数
+MAX_COMMUNICATION_LIMIT = 100
+# SSE 心跳间隔（秒），防止代理断开空闲连接
+SSE_HEARTBEAT_SECONDS = 15
+# 搜索每页默认条数
+SEARCH_PAGE_SIZE = 20
+# 搜索每页最大条数
+MAX_SEARCH_PAGE_SIZE = 50
+
+# 交流记录返回字段（name、is_me 由 format_message 按发送人、当前用户填写）
+MESSAGE_FIELDS = FieldSet({
+    "case_communication_id": FieldSpec(
+        (CaseCommunication.case_communication_id,), lambda r: r.case_communication_id
+    ),
+    "message_type": FieldSpec((CaseCommunication.message_type,), lambda r: r.message_type or 0),
+    "message": FieldSpec((CaseCommunication.message,), lambda r: r.message or ""),
+    "account_id": FieldSpec((CaseCommunication.account_id,), lambda r: r.account_id),
+    "name": FieldSpec((CaseCommunication.account_id,)),
+    "is_me": FieldSpec((CaseCommunication.account_id,)),
+    "type": FieldSpec((CaseCommunication.type,), lambda r: r.type or 0),
+    "timestamp_string": FieldSpec((CaseCommunication.timestamp,), lambda r: format_message_time(r.timestamp)),
+}, required=("case_communication_id",))
+
+
+def format_message_time(ts: Optional[int]) -> str:
+    """将时间戳转为 年-月-日 时:分 格式"""
+    if not ts:
+        return ""
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
+
 
 class CaseCommunicationRequest(BaseModel):
-    """交流大厅请求参数"""
+    """
+    交流大厅请求参数
+    不传 limit/before_id/after_id 时返回全部记录；
+    分页模式：传 limit 获取最新 N 条，向上翻页再传 before_id（当前最早一条的ID）；
+    增量模式：传 after_id（当前最新一条的ID），只返回之后的新消息
+    """
     case_id: int = Field(..., description="案件ID")
+    limit: Optional[int] = Field(None, description="每次返回条数", ge=1, le=MAX_COMMUNICATION_LIMIT)
+    before_id: Optional[int] = Field(None, description="向上翻页：只返回该ID之前的记录", ge=1)
+    after_id: Optional[int] = Field(None, description="增量拉取：只返回该ID之后的记录", ge=0)
+    fields: Optional[List[str]] = Field(
+        None,
+        description=f"返回字段，不传返回全部；可选: {','.join(MESSAGE_FIELDS.names)}"
+    )
+
+    @validator('fields')
+    def validate_fields(cls, v):
+        """校验返回字段"""
+        return MESSAGE_FIELDS.validate(v)
+
+
+def build_case_communication_query(case_id: int, fields: Optional[List[str]] = None) -> Select:
+    """
+    构建交流记录查询，按时间正序（同步/异步实现共用，发送人姓名由 load_communication 补齐）
+
+    :param case_id: 案件ID
+    :param fields: 返回字段，只读取其用到的列，None 为全部
+    :return: 查询语句，行为 MESSAGE_COLUMNS 中所选字段用到的列
+    """
+    return select(*MESSAGE_FIELDS.columns(fields, MESSAGE_COLUMNS)).where(
+        CaseCommunication.case_id == case_id
+    ).order_by(asc(CaseCommunication.timestamp))
+
+
+def load_communication(db: Session, query: Select, with_names: bool = True) -> list:
+    """
+    查询交流记录，发送人姓名由 AccountResolver 一次补齐（不逐行关联 account 表）
+
+    :param db: 数据库会话
+    :param query: 行为 MESSAGE_COLUMNS 的查询
+    :param with_names: 是否补齐发送人姓名（不返回姓名时不查询，姓名为 ""）
+    :return: (消息行, name) 列表
+    """
+    records = db.execute(query).all()
+    if not with_names:
+        return [(record, "") for record in records]
+    names = AccountResolver().add(record.account_id for record in records).load(db)
+    return [(record, names.name(record.account_id)) for record in records]
+
+
+async def aload_communication(db: AsyncSession, query: Select, with_names: bool = True) -> list:
+    """查询交流记录并补齐发送人姓名（异步）"""
+    records = (await db.execute(query)).all()
+    if not with_names:
+        return [(record, "") for record in records]
+    names = await AccountResolver().add(record.account_id for record in records).aload(db)
+    return [(record, names.name(record.account_id)) for record in records]
+
+
+def is_paged_communication(request: CaseCommunicationRequest) -> bool:
+    """是否为分页/增量模式"""
+    return request.limit is not None or request.before_id is not None or request.after_id is not None
+
+
+def build_case_communication_page_query(request: CaseCommunicationRequest) -> Select:
+    """
+    构建分页/增量交流记录查询，沿 (case_id, case_communication_id) 索引定位，多取一条判断是否还有更多
+
+    :param request: 请求参数
+    :return: 查询语句，行为 MESSAGE_COLUMNS 中所选字段用到的列；增量模式按ID正序，分页模式按ID倒序
+    """
+    limit = request.limit or MAX_COMMUNICATION_LIMIT
+    query = select(*MESSAGE_FIELDS.columns(request.fields, MESSAGE_COLUMNS)).where(
+        CaseCommunication.case_id == request.case_id
+    )
+    if request.after_id is not None:
+        query = query.where(
+            CaseCommunication.case_communication_id > request.after_id
+        ).order_by(asc(CaseCommunication.case_communication_id))
+    else:
+        if request.before_id is not None:
+            query = query.where(CaseCommunication.case_communication_id < request.before_id)
+        query = query.order_by(desc(CaseCommunication.case_communication_id))
+    return query.limit(limit + 1)
+
+
+def format_case_communication_page(records: list, request: CaseCommunicationRequest,
+                                   current_account_id: int) -> dict:
+    """
+    组装分页/增量交流记录返回数据
+
+    :param records: build_case_communication_page_query 的查询结果 (消息行, name)
+    :param request: 请求参数
+    :param current_account_id: 当前用户ID
+    :return: {"list": [], "has_more": 0}，列表按时间正序
+    """
+    limit = request.limit or MAX_COMMUNICATION_LIMIT
+    has_more = len(records) > limit
+    records = records[:limit]
+    if request.after_id is None:
+        records = records[::-1]
+    return {
+        "list": format_case_communication(records, current_account_id, request.fields),
+        "has_more": 1 if has_more else 0
+    }
+
+
+def format_case_communication(records: list, current_account_id: int, fields: Optional[List[str]] = None) -> list:
+    """
+    组装交流记录返回数据
+
+    :param records: (消息行, name) 列表
+    :param current_account_id: 当前用户ID
+    :param fields: 返回字段，None 为全部
+    :return: 列表数据
+    """
+    return [format_message(record, name, current_account_id, fields) for record, name in records]
+
+
+def format_message(record, name: Optional[str], current_account_id: int, fields: Optional[List[str]] = None) -> dict:
+    """组装单条交流记录（record 为 CaseCommunication 或 MESSAGE_COLUMNS 查询结果行）"""
+    computed = {"name": name or ""}
+    if MESSAGE_FIELDS.wants(fields, "is_me"):
+        computed["is_me"] = 1 if record.account_id == current_account_id else 0
+    return MESSAGE_FIELDS.format(record, fields, **computed)
+
+
+def personalize_message(message: dict, current_account_id: int, fields: Optional[List[str]] = None,
+                        names: Optional[AccountResolver] = None) -> dict:
+    """按当前用户填写 is_me，传 names 时补齐发送人姓名（缓存中的消息不含姓名），只保留所选字段"""
+    message = dict(message, is_me=1 if message.get("account_id") == current_account_id else 0)
+    if names is not None:
+        message["name"] = names.name(message.get("account_id"))
+    return MESSAGE_FIELDS.pick(message, fields)
+
+
+def cached_sender_names(cached: CachedMessages, request: CaseCommunicationRequest) -> Optional[AccountResolver]:
+    """
+    缓存可能满足本次请求且需返回姓名时，登记缓存消息的发送人（调用方随后 load/aload）
+
+    :return: 账号解析器，无需解析时返回 None
+    """
+    if not cached.filled or request.before_id is not None or not MESSAGE_FIELDS.wants(request.fields, "name"):
+        return None
+    return AccountResolver().add(m.get("account_id") for m in cached.messages)
+
+
+def format_cached_communication(cached: CachedMessages, request: CaseCommunicationRequest,
+                                current_account_id: int, names: Optional[AccountResolver] = None):
+    """
+    由最近消息缓存组装交流记录返回数据
+
+    :param cached: 缓存读取结果
+    :param request: 请求参数
+    :param current_account_id: 当前用户ID
+    :param names: 已加载的发送人解析器（cached_sender_names），不返回姓名时为 None
+    :return: 返回数据（格式同数据库查询），缓存无法满足该请求时返回 None
+    """
+    if not cached.filled or request.before_id is not None:
+        return None
+    messages = cached.messages
+
+    # 增量模式：after_id 之后的消息需全部在缓存内
+    if request.after_id is not None:
+        if not cached.complete and request.after_id < cached.first_id:
+            return None
+        limit = request.limit or MAX_COMMUNICATION_LIMIT
+        messages = [m for m in messages if m["case_communication_id"] > request.after_id]
+        return {
+            "list": [personalize_message(m, current_account_id, request.fields, names) for m in messages[:limit]],
+            "has_more": 1 if len(messages) > limit else 0
+        }
+
+    # 分页模式首页：最新 limit 条
+    if request.limit is not None:
+        if request.limit > len(messages) and not cached.complete:
+            return None
+        has_more = len(messages) > request.limit or not cached.complete
+        return {
+            "list": [
+                personalize_message(m, current_account_id, request.fields, names) for m in messages[-request.limit:]
+            ],
+            "has_more": 1 if has_more else 0
+        }
+
+    # 全部记录：缓存需包含全部消息
+    if not cached.complete:
+        return None
+    return [personalize_message(m, current_account_id, request.fields, names) for m in messages]
+
+
+def should_fill_cache(cached: Optional[CachedMessages], request: CaseCommunicationRequest) -> bool:
+    """缓存未加载，且本次请求读取的是最新消息（全部记录或分页首页）时回填缓存"""
+    return cached is not None and not cached.filled and request.before_id is None and request.after_id is None
+
+
+def build_fill_request(request: CaseCommunicationRequest) -> CaseCommunicationRequest:
+    """分页首页需回填缓存时，至少读取缓存条数的消息，读取全部字段"""
+    return request.model_copy(update={"limit": max(request.limit, CaseMessageCache.SIZE), "fields": None})
+
+
+def build_fill_messages(records: list, query_request: CaseCommunicationRequest) -> Tuple[list, bool]:
+    """
+    由数据库查询结果生成回填缓存的消息
+
+    :param records: 查询结果（全部记录为正序；分页首页为倒序且多取一条）
+    :param query_request: 实际查询使用的请求参数
+    :return: (消息列表正序, 是否为该案件全部消息)
+    """
+    if query_request.limit is None:
+        return [format_message(record, name, 0) for record, name in records], True
+    messages = [format_message(record, name, 0) for record, name in records[:query_request.limit]]
+    return messages[::-1], len(records) <= query_request.limit
+
+
+def read_message_cache(case_id: int) -> Optional[CachedMessages]:
+    """读取最近消息缓存，未启用或 Redis 异常时返回 None（直接查询数据库）"""
+    if not CaseMessageCache.enabled():
+        return None
+    try:
+        return CaseMessageCache.read(case_id)
+    except RedisError as e:
+        print(f"案件消息缓存读取失败: {e}")
+        return None
+
+
+async def aread_message_cache(case_id: int) -> Optional[CachedMessages]:
+    """读取最近消息缓存（异步）"""
+    if not CaseMessageCache.enabled():
+        return None
+    try:
+        return await CaseMessageCache.aread(case_id)
+    except RedisError as e:
+        print(f"案件消息缓存读取失败: {e}")
+        return None
+
+
+def fill_message_cache(case_id: int, cached: CachedMessages, records: list,
+                       query_request: CaseCommunicationRequest) -> None:
+    """回填最近消息缓存"""
+    messages, complete = build_fill_messages(records, query_request)
+    try:
+        CaseMessageCache.fill(case_id, cached.version, messages, complete)
+    except RedisError as e:
+        print(f"案件消息缓存回填失败: {e}")
+
+
+async def afill_message_cache(case_id: int, cached: CachedMessages, records: list,
+                              query_request: CaseCommunicationRequest) -> None:
+    """回填最近消息缓存（异步）"""
+    messages, complete = build_fill_messages(records, query_request)
+    try:
+        await CaseMessageCache.afill(case_id, cached.version, messages, complete)
+    except RedisError as e:
+        print(f"案件消息缓存回填失败: {e}")
 
 
-@router.post("/case_communication")
 def case_communication(
     request: CaseCommunicationRequest,
     db: Session = Depends(get_db),
@@ -36,7 +345,7 @@ def case_communication(
     :param request: 请求参数
     :param db: 数据库会话
     :param token: 认证Token
-    :return: 交流记录列表
+    :return: 交流记录列表；分页/增量模式返回 {"list": [], "has_more": 0}
     """
     # 验证 token
     user_data = TokenManager.verify(token)
@@ -46,32 +355,80 @@ def case_communication(
     # 当前用户ID
     current_account_id = user_data.get("account_id")
 
-    # 查询交流记录，关联 account 表获取姓名，按时间正序
-    records = db.query(CaseCommunication, Account.name).outerjoin(
-        Account, CaseCommunication.account_id == Account.account_id
-    ).filter(
-        CaseCommunication.case_id == request.case_id
-    ).order_by(asc(CaseCommunication.timestamp)).all()
+    # 优先由最近消息缓存返回
+    cached = read_message_cache(request.case_id)
+    if cached is not None:
+        names = cached_sender_names(cached, request)
+        if names is not None:
+            names.load(db)
+        data = format_cached_communication(cached, request, current_account_id, names)
+        if data is not None:
+            return success(data=data)
+    fill = should_fill_cache(cached, request)
 
-    # 组装返回数据
-    data = []
-    for record, name in records:
-        timestamp_str = ""
-        if record.timestamp:
-            timestamp_str = datetime.fromtimestamp(record.timestamp).strftime("%Y-%m-%d %H:%M")
+    # 分页/增量模式
+    if is_paged_communication(request):
+        query_request = build_fill_request(request) if fill else request
+        records = load_communication(db, build_case_communication_page_query(query_request),
+                                   with_names=MESSAGE_FIELDS.wants(query_request.fields, "name"))
+        if fill:
+            fill_message_cache(request.case_id, cached, records, query_request)
+        return success(data=format_case_communication_page(records, request, current_account_id))
 
-        data.append({
-            "case_communication_id": record.case_communication_id,
-            "message_type": record.message_type or 0,
-            "message": record.message or "",
-            "account_id": record.account_id,
-            "name": name or "",
-            "is_me": 1 if record.account_id == current_account_id else 0,
-            "type": record.type or 0,
-            "timestamp_string": timestamp_str
-        })
+    # 查询全部交流记录（回填缓存时读取全部字段）
+    fields = None if fill else request.fields
+    records = load_communication(db, build_case_communication_query(request.case_id, fields),
+                                 with_names=MESSAGE_FIELDS.wants(fields, "name"))
+    if fill:
+        fill_message_cache(request.case_id, cached, records, request)
 
-    return success(data=data)
+    return success(data=format_case_communication(records, current_account_id, request.fields))
+
+
+async def case_communication_async(
+    request: CaseCommunicationRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user_data: dict = Depends(get_token_user_async)
+):
+    """
+    交流大厅获取数据
+
+    :param request: 请求参数
+    :param db: 异步数据库会话
+    :param user_data: 当前用户（由请求头 token 解析）
+    :return: 交流记录列表；分页/增量模式返回 {"list": [], "has_more": 0}
+    """
+    current_account_id = user_data.get("account_id")
+
+    cached = await aread_message_cache(request.case_id)
+    if cached is not None:
+        names = cached_sender_names(cached, request)
+        if names is not None:
+            await names.aload(db)
+        data = format_cached_communication(cached, request, current_account_id, names)
+        if data is not None:
+            return success(data=data)
+    fill = should_fill_cache(cached, request)
+
+    if is_paged_communication(request):
+        query_request = build_fill_request(request) if fill else request
+        records = await aload_communication(db, build_case_communication_page_query(query_request),
+                                          with_names=MESSAGE_FIELDS.wants(query_request.fields, "name"))
+        if fill:
+            await afill_message_cache(request.case_id, cached, records, query_request)
+        return success(data=format_case_communication_page(records, request, current_account_id))
+
+    fields = None if fill else request.fields
+    records = await aload_communication(db, build_case_communication_query(request.case_id, fields),
+                                        with_names=MESSAGE_FIELDS.wants(fields, "name"))
+    if fill:
+        await afill_message_cache(request.case_id, cached, records, request)
+
+    return success(data=format_case_communication(records, current_account_id, request.fields))
+
+
+register_db_route(router, "/case_communication", case_communication, case_communication_async,
+                  response_model=CaseCommunicationResponse)
 
 
 class CaseCommunicationMessageRequest(BaseModel):
@@ -81,9 +438,48 @@ class CaseCommunicationMessageRequest(BaseModel):
     message_type: int = Field(..., description="消息类型 1文字 2文件", ge=1, le=2)
 
 
-@router.post("/case_communication_message")
+def resolve_role_type(binding: Optional[AccountCase], account: Optional[AccountInfo]) -> Optional[int]:
+    """
+    确定发消息用户在案件中的角色
+
+    :param binding: 用户与案件的绑定关系
+    :param account: 用户账号
+    :return: 角色类型，非案件参与人员返回 None
+    """
+    if binding:
+        return binding.type
+    if account and account.type == 0:
+        return 0  # 主任
+    return None
+
+
+def build_message_record(request: CaseCommunicationMessageRequest, account_id: int, role_type: int,
+                         current_time: int) -> CaseCommunication:
+    """创建交流记录对象"""
+    return CaseCommunication(
+        case_id=request.case_id,
+        account_id=account_id,
+        type=role_type,
+        message_type=request.message_type,
+        message=request.message,
+        timestamp=current_time
+    )
+
+
+def build_message_event(message: dict, case_id: int) -> dict:
+    """
+    组装推送给订阅者的新消息（is_me 由各连接按当前用户填写）
+
+    :param message: format_message 组装的消息
+    :param case_id: 案件ID
+    :return: 消息数据，格式同 case_communication 列表项，另加 case_id
+    """
+    return dict(message, case_id=case_id)
+
+
 def case_communication_message(
     request: CaseCommunicationMessageRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     token: str = Header(..., description="登录时获取的Token")
 ):
@@ -91,6 +487,7 @@ def case_communication_message(
     交流消息提交
 
     :param request: 请求参数
+    :param background_tasks: 后台任务（发送提醒通知）
     :param db: 数据库会话
     :param token: 认证Token
     :return: {"code": 0, "message": "string", "data": {"case_communication_id": 0}}
@@ -104,44 +501,489 @@ def case_communication_message(
     current_time = int(time.time())
 
     # 查询案件是否存在
-    case = db.query(Case).filter(Case.case_id == request.case_id).first()
+    case = db.get(Case, request.case_id)
     if not case:
         return error(code=404, message="案件不存在")
 
     # 查询当前用户在该案件中的角色
-    binding = db.query(AccountCase).filter(
+    binding = db.scalar(select(AccountCase).where(
         AccountCase.case_id == request.case_id,
         AccountCase.account_id == current_account_id
-    ).first()
+    ))
 
     # 获取用户在account表中的type（主任为0）
-    account = db.query(Account).filter(Account.account_id == current_account_id).first()
-    if binding:
-        role_type = binding.type
-    elif account and account.type == 0:
-        role_type = 0  # 主任
-    else:
+    account = resolve_account(db, current_account_id)
+    role_type = resolve_role_type(binding, account)
+    if role_type is None:
         return error(code=403, message="您不是该案件的参与人员")
 
     # 创建交流记录
-    record = CaseCommunication(
-        case_id=request.case_id,
-        account_id=current_account_id,
-        type=role_type,
-        message_type=request.message_type,
-        message=request.message,
-        timestamp=current_time
-    )
+    record = build_message_record(request, current_account_id, role_type, current_time)
     db.add(record)
 
     # 如果是律师发消息，更新案件的律师最后回复时间
     if role_type == 2:
         case.lawyer_last_timestamp = current_time
 
+    # 同一事务内写入搜索索引
+    db.flush()
+    token_rows = message_token_rows(record)
+    if token_rows:
+        db.execute(insert(CommunicationSearchToken), token_rows)
+
+    case_title = case.title
     db.commit()
     db.refresh(record)
 
+    # 其他绑定人员的未读数加一
+    account_ids = db.scalars(build_case_account_ids_query(request.case_id)).all()
+    UnreadCounter.incr(request.case_id, (i for i in account_ids if i != current_account_id))
+
+    # 写入最近消息缓存并推送给在线的订阅者（失败不影响消息提交，客户端可用 after_id 补齐）
+    # 律师回复改变了案件列表中的律师最后回复时间，使绑定人员的案件列表缓存失效，重新计算 SLA
+    if role_type == 2:
+        CaseListCache.bump(account_ids)
+        CaseSlaIndex.touch(request.case_id, current_time)
+
+    message = format_message(record, account.name if account else "", 0)
+    try:
+        if CaseMessageCache.enabled():
+            CaseMessageCache.append(request.case_id, message)
+        case_message_hub.publish(request.case_id, build_message_event(message, request.case_id))
+    except RedisError as e:
+        print(f"案件消息缓存/推送失败: {e}")
+
+    # 通知案件其他绑定人员（响应后写入通知队列）
+    background_tasks.add_task(NoticeQueue.emit, new_message_event(
+        request.case_id, case_title, current_account_id, message["name"],
+        request.message, request.message_type, current_time
+    ))
+
     return success(
         data={"case_communication_id": record.case_communication_id},
         message="消息发送成功"
     )
+
+
+async def case_communication_message_async(
+    request: CaseCommunicationMessageRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    user_data: dict = Depends(get_token_user_async)
+):
+    """
+    交流消息提交
+
+    :param request: 请求参数
+    :param background_tasks: 后台任务（发送提醒通知）
+    :param db: 异步数据库会话
+    :param user_data: 当前用户（由请求头 token 解析）
+    :return: {"code": 0, "message": "string", "data": {"case_communication_id": 0}}
+    """
+    current_account_id = user_data.get("account_id")
+    current_time = int(time.time())
+
+    case = await db.get(Case, request.case_id)
+    if not case:
+        return error(code=404, message="案件不存在")
+
+    binding = await db.scalar(select(AccountCase).where(
+        AccountCase.case_id == request.case_id,
+        AccountCase.account_id == current_account_id
+    ))
+    account = await aresolve_account(db, current_account_id)
+    role_type = resolve_role_type(binding, account)
+    if role_type is None:
+        return error(code=403, message="您不是该案件的参与人员")
+
+    record = build_message_record(request, current_account_id, role_type, current_time)
+    db.add(record)
+
+    if role_type == 2:
+        case.lawyer_last_timestamp = current_time
+
+    await db.flush()
+    token_rows = message_token_rows(record)
+    if token_rows:
+        await db.execute(insert(CommunicationSearchToken), token_rows)
+
+    # expire_on_commit=False，提交后主键已回填，无需 refresh
+    await db.commit()
+
+    account_ids = (await db.scalars(build_case_account_ids_query(request.case_id))).all()
+    await UnreadCounter.aincr(request.case_id, (i for i in account_ids if i != current_account_id))
+
+    if role_type == 2:
+        await CaseListCache.abump(account_ids)
+        await CaseSlaIndex.atouch(request.case_id, current_time)
+
+    message = format_message(record, account.name if account else "", 0)
+    try:
+        if CaseMessageCache.enabled():
+            await CaseMessageCache.aappend(request.case_id, message)
+        await case_message_hub.apublish(request.case_id, build_message_event(message, request.case_id))
+    except RedisError as e:
+        print(f"案件消息缓存/推送失败: {e}")
+
+    background_tasks.add_task(NoticeQueue.aemit, new_message_event(
+        request.case_id, case.title, current_account_id, message["name"],
+        request.message, request.message_type, current_time
+    ))
+
+    return success(
+        data={"case_communication_id": record.case_communication_id},
+        message="消息发送成功"
+    )
+
+
+register_db_route(router, "/case_communication_message", case_communication_message,
+                  case_communication_message_async)
+
+
+class MarkReadRequest(BaseModel):
+    """标记已读请求参数"""
+    case_id: int = Field(..., description="案件ID")
+    last_id: Optional[int] = Field(None, description="已读到的消息ID，不传为全部已读", ge=0)
+
+
+def build_case_member_query(case_id: int, account_id: int) -> Select:
+    """构建用户与案件绑定关系查询"""
+    return select(AccountCase).where(
+        AccountCase.case_id == case_id,
+        AccountCase.account_id == account_id
+    )
+
+
+def build_latest_message_id_query(case_id: int) -> Select:
+    """构建案件最新消息ID查询（沿 (case_id, case_communication_id) 索引）"""
+    return select(func.max(CaseCommunication.case_communication_id)).where(
+        CaseCommunication.case_id == case_id
+    )
+
+
+def build_messages_after_count_query(case_id: int, last_id: int, account_id: int) -> Select:
+    """
+    构建案件中某条消息之后他人发送的消息数查询（沿 (case_id, case_communication_id) 索引）
+    自己发送的消息不计入未读，与发送消息时的未读计数一致
+    """
+    return select(func.count()).select_from(CaseCommunication).where(
+        CaseCommunication.case_id == case_id,
+        CaseCommunication.case_communication_id > last_id,
+        CaseCommunication.account_id != account_id
+    )
+
+
+def mark_read(
+    request: MarkReadRequest,
+    db: Session = Depends(get_db),
+    token: str = Header(..., description="登录时获取的Token")
+):
+    """
+    标记案件交流已读
+
+    :param request: 请求参数
+    :param db: 数据库会话
+    :param token: 认证Token
+    :return: {"code": 0, "message": "string", "data": {"last_read_id": 0, "unread": 0}}
+    """
+    user_data = TokenManager.verify(token)
+    if not user_data:
+        return error(code=401, message="Token无效或已过期")
+
+    current_account_id = user_data.get("account_id")
+    binding = db.scalar(build_case_member_query(request.case_id, current_account_id))
+    account = None if binding else resolve_account(db, current_account_id)
+    if resolve_role_type(binding, account) is None:
+        return error(code=403, message="您不是该案件的参与人员")
+
+    # 不传 last_id 时读到最新一条；传入时该消息之后的仍为未读
+    if request.last_id is None:
+        last_id = db.scalar(build_latest_message_id_query(request.case_id)) or 0
+        remaining = 0
+    else:
+        last_id = request.last_id
+        count_query = build_messages_after_count_query(request.case_id, last_id, current_account_id)
+        remaining = db.scalar(count_query) or 0
+
+    try:
+        if not UnreadCounter.mark_read(current_account_id, request.case_id, last_id, remaining):
+            # 已读位置已在更后面（如其他设备已标记）
+            last_id = UnreadCounter.read_mark(current_account_id, request.case_id)
+            remaining = UnreadCounter.counts(current_account_id, [request.case_id]).get(request.case_id, 0)
+    except RedisError as e:
+        print(f"标记已读失败: {e}")
+        return error(code=500, message="标记已读失败")
+
+    return success(data={"last_read_id": last_id, "unread": remaining})
+
+
+async def mark_read_async(
+    request: MarkReadRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user_data: dict = Depends(get_token_user_async)
+):
+    """
+    标记案件交流已读
+
+    :param request: 请求参数
+    :param db: 异步数据库会话
+    :param user_data: 当前用户（由请求头 token 解析）
+    :return: {"code": 0, "message": "string", "data": {"last_read_id": 0, "unread": 0}}
+    """
+    current_account_id = user_data.get("account_id")
+    binding = await db.scalar(build_case_member_query(request.case_id, current_account_id))
+    account = None if binding else await aresolve_account(db, current_account_id)
+    if resolve_role_type(binding, account) is None:
+        return error(code=403, message="您不是该案件的参与人员")
+
+    if request.last_id is None:
+        last_id = await db.scalar(build_latest_message_id_query(request.case_id)) or 0
+        remaining = 0
+    else:
+        last_id = request.last_id
+        count_query = build_messages_after_count_query(request.case_id, last_id, current_account_id)
+        remaining = await db.scalar(count_query) or 0
+
+    try:
+        if not await UnreadCounter.amark_read(current_account_id, request.case_id, last_id, remaining):
+            last_id = await UnreadCounter.aread_mark(current_account_id, request.case_id)
+            remaining = (await UnreadCounter.acounts(current_account_id, [request.case_id])).get(request.case_id, 0)
+    except RedisError as e:
+        print(f"标记已读失败: {e}")
+        return error(code=500, message="标记已读失败")
+
+    return success(data={"last_read_id": last_id, "unread": remaining})
+
+
+register_db_route(router, "/mark_read", mark_read, mark_read_async)
+
+
+async def check_case_member(case_id: int, account_id: int) -> bool:
+    """
+    是否为案件参与人员（主任可查看全部案件）
+    使用独立的短会话，不在长连接期间占用数据库连接
+
+    :param case_id: 案件ID
+    :param account_id: 账号ID
+    :return: 是否可订阅该案件消息
+    """
+    async with AsyncSessionLocal() as db:
+        binding = await db.scalar(build_case_member_query(case_id, account_id))
+        account = None if binding else await aresolve_account(db, account_id)
+    return resolve_role_type(binding, account) is not None
+
+
+@router.websocket("/ws/{case_id}")
+async def case_message_ws(
+    websocket: WebSocket,
+    case_id: int,
+    token: str = Query(..., description="登录时获取的Token")
+):
+    """
+    案件新消息推送（WebSocket）
+
+    连接: ws://host/api/communication/ws/{case_id}?token=xxx
+    服务端推送: 新消息 JSON，格式同 case_communication 列表项，另加 case_id
+    客户端可定时发送任意文本或二进制帧作为心跳，服务端忽略其内容
+    认证失败或非案件参与人员时以 1008 关闭连接
+    """
+    user_data = await TokenManager.averify(token)
+    if not user_data or not await check_case_member(case_id, user_data.get("account_id")):
+        await websocket.close(code=1008)
+        return
+
+    current_account_id = user_data.get("account_id")
+    await websocket.accept()
+    queue = await case_message_hub.subscribe(case_id)
+
+    async def push():
+        while True:
+            message = await queue.get()
+            await websocket.send_json(personalize_message(message, current_account_id))
+
+    sender = asyncio.create_task(push())
+    try:
+        # 读取客户端数据以感知断开（文本、二进制帧均忽略）
+        while True:
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        await case_message_hub.unsubscribe(case_id, queue)
+
+
+@router.get("/sse/{case_id}")
+async def case_message_sse(
+    request: Request,
+    case_id: int,
+    token: str = Query(..., description="登录时获取的Token")
+):
+    """
+    案件新消息推送（SSE，供不支持 WebSocket 的环境使用）
+
+    连接: GET /api/communication/sse/{case_id}?token=xxx
+    事件: event: message，id 为 case_communication_id，data 为新消息 JSON；空闲时定时发送注释行作为心跳
+    """
+    user_data = await TokenManager.averify(token)
+    if not user_data:
+        return error(code=401, message="Token无效或已过期")
+    current_account_id = user_data.get("account_id")
+    if not await check_case_member(case_id, current_account_id):
+        return error(code=403, message="您不是该案件的参与人员")
+
+    async def stream():
+        queue = await case_message_hub.subscribe(case_id)
+        try:
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                data = json.dumps(personalize_message(message, current_account_id), ensure_ascii=False)
+                yield f"id: {message.get('case_communication_id')}\nevent: message\ndata: {data}\n\n"
+        finally:
+            await case_message_hub.unsubscribe(case_id, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+class SearchCommunicationRequest(BaseModel):
+    """交流记录搜索请求参数"""
+    keyword: str = Field(..., description="搜索词", min_length=1, max_length=50)
+    case_id: Optional[int] = Field(None, description="案件ID，不传则搜索当前用户参与的全部案件")
+    before_id: Optional[int] = Field(None, description="翻页：传上次返回的 next_before_id", ge=1)
+    page_size: int = Field(SEARCH_PAGE_SIZE, description="每页条数", ge=1, le=MAX_SEARCH_PAGE_SIZE)
+
+
+def build_user_case_scope(account_id: int) -> Select:
+    """当前用户参与的全部案件ID（子查询）"""
+    return select(AccountCase.case_id).join(
+        Case, AccountCase.case_id == Case.case_id
+    ).where(
+        AccountCase.account_id == account_id,
+        Case.type != -1
+    )
+
+
+def format_search_page(page: CommunicationSearchPage, current_account_id: int) -> dict:
+    """
+    组装搜索结果
+
+    :param page: 检索结果
+    :param current_account_id: 当前用户ID
+    :return: {"list": [], "next_before_id": 0, "has_more": 0}
+    """
+    data = []
+    for record, name in page.hits:
+        snippet, highlights = make_snippet(record.message or "", page.terms)
+        data.append({
+            "case_communication_id": record.case_communication_id,
+            "case_id": record.case_id,
+            "account_id": record.account_id,
+            "name": name or "",
+            "is_me": 1 if record.account_id == current_account_id else 0,
+            "type": record.type or 0,
+            "timestamp_string": format_message_time(record.timestamp),
+            "snippet": snippet,
+            "highlights": highlights
+        })
+    return {
+        "list": data,
+        "next_before_id": page.next_before_id if page.has_more else 0,
+        "has_more": 1 if page.has_more else 0
+    }
+
+
+def search_communication(
+    request: SearchCommunicationRequest,
+    db: Session = Depends(get_db),
+    token: str = Header(..., description="登录时获取的Token")
+):
+    """
+    搜索交流记录（单个案件或当前用户参与的全部案件），按时间倒序分页
+
+    :param request: 请求参数
+    :param db: 数据库会话
+    :param token: 认证Token
+    :return: {"list": [{..., "snippet": "命中上下文", "highlights": [[起, 止]]}], "next_before_id": 0, "has_more": 0}
+    """
+    # 验证 token
+    user_data = TokenManager.verify(token)
+    if not user_data:
+        return error(code=401, message="Token无效或已过期")
+
+    current_account_id = user_data.get("account_id")
+
+    # 确定搜索范围
+    if request.case_id is not None:
+        binding = db.scalar(select(AccountCase).where(
+            AccountCase.case_id == request.case_id,
+            AccountCase.account_id == current_account_id
+        ))
+        account = None if binding else resolve_account(db, current_account_id)
+        if resolve_role_type(binding, account) is None:
+            return error(code=403, message="您不是该案件的参与人员")
+        case_scope = [request.case_id]
+    else:
+        case_scope = build_user_case_scope(current_account_id)
+
+    page = CommunicationSearchPage(request.keyword, case_scope, request.page_size, request.before_id)
+    if not page.terms:
+        return error(code=400, message="搜索词无效")
+
+    while not page.done:
+        ids = db.scalars(page.next_query()).all()
+        rows = load_communication(db, build_hits_query(ids)) if ids else []
+        page.feed(ids, rows)
+
+    return success(data=format_search_page(page, current_account_id))
+
+
+async def search_communication_async(
+    request: SearchCommunicationRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user_data: dict = Depends(get_token_user_async)
+):
+    """
+    搜索交流记录（单个案件或当前用户参与的全部案件），按时间倒序分页
+
+    :param request: 请求参数
+    :param db: 异步数据库会话
+    :param user_data: 当前用户（由请求头 token 解析）
+    :return: {"list": [{..., "snippet": "命中上下文", "highlights": [[起, 止]]}], "next_before_id": 0, "has_more": 0}
+    """
+    current_account_id = user_data.get("account_id")
+
+    if request.case_id is not None:
+        binding = await db.scalar(select(AccountCase).where(
+            AccountCase.case_id == request.case_id,
+            AccountCase.account_id == current_account_id
+        ))
+        account = None if binding else await aresolve_account(db, current_account_id)
+        if resolve_role_type(binding, account) is None:
+            return error(code=403, message="您不是该案件的参与人员")
+        case_scope = [request.case_id]
+    else:
+        case_scope = build_user_case_scope(current_account_id)
+
+    page = CommunicationSearchPage(request.keyword, case_scope, request.page_size, request.before_id)
+    if not page.terms:
+        return error(code=400, message="搜索词无效")
+
+    while not page.done:
+        ids = (await db.scalars(page.next_query())).all()
+        rows = await aload_communication(db, build_hits_query(ids)) if ids else []
+        page.feed(ids, rows)
+
+    return success(data=format_search_page(page, current_account_id))
+
+
+register_db_route(router, "/search_communication", search_communication, search_communication_async)
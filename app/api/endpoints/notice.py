@@ -0,0 +1,120 @@
+"""
+提醒通知接口
+通知由 notice_worker.py 写入 notice_log；notice_list 同时提供同步与异步实现，由 ASYNC_DB_ENDPOINTS 配置选择
+"""
+from datetime import datetime
+from typing import Optional, List
+from fastapi import APIRouter, Depends, Header
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, select, Select
+from pydantic import BaseModel, Field
+
+from app.core.database import get_db, get_async_db
+from app.api.deps import get_token_user_async, register_db_route
+from app.models.notice_log import NoticeLog
+from app.utils.token import TokenManager
+from app.schemas import success, error
+
+router = APIRouter()
+
+# 每页默认条数
+NOTICE_PAGE_SIZE = 20
+# 每页最大条数
+MAX_NOTICE_PAGE_SIZE = 100
+
+
+class NoticeListRequest(BaseModel):
+    """
+    通知列表请求参数
+    按时间倒序，首页不传 before_id，之后传当前最后一条的 notice_log_id
+    """
+    limit: int = Field(NOTICE_PAGE_SIZE, description="每次返回条数", ge=1, le=MAX_NOTICE_PAGE_SIZE)
+    before_id: Optional[int] = Field(None, description="向后翻页：只返回该ID之前的通知", ge=1)
+
+
+def build_notice_list_query(account_id: int, request: NoticeListRequest) -> Select:
+    """
+    构建通知列表查询，沿 (account_id, notice_log_id) 索引定位，多取一条判断是否还有更多
+
+    :param account_id: 当前用户ID
+    :param request: 请求参数
+    :return: 查询语句，行为 NoticeLog，按ID倒序
+    """
+    query = select(NoticeLog).where(NoticeLog.account_id == account_id)
+    if request.before_id is not None:
+        query = query.where(NoticeLog.notice_log_id < request.before_id)
+    return query.order_by(desc(NoticeLog.notice_log_id)).limit(request.limit + 1)
+
+
+def format_notice_time(ts: Optional[int]) -> str:
+    """时间戳转 年-月-日 时:分"""
+    if not ts:
+        return ""
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
+
+
+def format_notice_list(records: List[NoticeLog], request: NoticeListRequest) -> dict:
+    """
+    组装通知列表返回数据
+
+    :param records: build_notice_list_query 的查询结果
+    :param request: 请求参数
+    :return: {"list": [], "has_more": 0}
+    """
+    return {
+        "list": [
+            {
+                "notice_log_id": record.notice_log_id,
+                "notice_type": record.notice_type or 0,
+                "title": record.title or "",
+                "content": record.content or "",
+                "case_id": record.case_id or 0,
+                "timestamp": record.timestamp or 0,
+                "timestamp_string": format_notice_time(record.timestamp)
+            }
+            for record in records[:request.limit]
+        ],
+        "has_more": 1 if len(records) > request.limit else 0
+    }
+
+
+def notice_list(
+    request: NoticeListRequest,
+    db: Session = Depends(get_db),
+    token: str = Header(..., description="登录时获取的Token")
+):
+    """
+    当前用户的通知列表
+
+    :param request: 请求参数
+    :param db: 数据库会话
+    :param token: 认证Token
+    :return: {"code": 0, "message": "string", "data": {"list": [], "has_more": 0}}
+    """
+    user_data = TokenManager.verify(token)
+    if not user_data:
+        return error(code=401, message="Token无效或已过期")
+
+    records = db.scalars(build_notice_list_query(user_data.get("account_id"), request)).all()
+    return success(data=format_notice_list(records, request))
+
+
+async def notice_list_async(
+    request: NoticeListRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user_data: dict = Depends(get_token_user_async)
+):
+    """
+    当前用户的通知列表
+
+    :param request: 请求参数
+    :param db: 异步数据库会话
+    :param user_data: 当前用户（由请求头 token 解析）
+    :return: {"code": 0, "message": "string", "data": {"list": [], "has_more": 0}}
+    """
+    records = (await db.scalars(build_notice_list_query(user_data.get("account_id"), request))).all()
+    return success(data=format_notice_list(records, request))
+
+
+register_db_route(router, "/notice_list", notice_list, notice_list_async)
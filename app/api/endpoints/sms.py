@@ -4,17 +4,22 @@
 import random
 import time
 import re
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Request
 from pydantic import BaseModel
+from redis import RedisError
 
-from app.core.database import get_db
-from app.models.sms import Sms
-from app.core.aliyun.sms_code import send_sms
+from app.core.config import SMS_LIMIT_MOBILE_PER_MINUTE, SMS_LIMIT_MOBILE_PER_DAY, SMS_LIMIT_IP_PER_HOUR
+from app.sms import SmsOutbox
 from app.schemas import success, error
+from app.utils.rate_limiter import RateLimiter, RateRule, client_ip
 
 router = APIRouter()
 
+# 发送频率限制规则
+MOBILE_PER_MINUTE = RateRule("sms_mobile_minute", SMS_LIMIT_MOBILE_PER_MINUTE, 60)
+MOBILE_PER_DAY = RateRule("sms_mobile_day", SMS_LIMIT_MOBILE_PER_DAY, 86400)
+IP_PER_HOUR = RateRule("sms_ip_hour", SMS_LIMIT_IP_PER_HOUR, 3600)
+
 
 class SmsRequest(BaseModel):
     """短信请求参数"""
@@ -22,12 +27,13 @@ class SmsRequest(BaseModel):
 
 
 @router.post("/")
-def send_sms_code(request: SmsRequest, db: Session = Depends(get_db)):
+def send_sms_code(request: SmsRequest, http_request: Request):
     """
     发送短信验证码
+    频率限制与入队均在 Redis 中完成，不访问数据库
     
     :param request: 请求参数 {"mobile": "手机号"}
-    :param db: 数据库会话
+    :param http_request: 请求对象（取客户端 IP）
     :return: {"code": 0, "message": "string", "data": {}}
     """
     mobile = request.mobile
@@ -37,41 +43,24 @@ def send_sms_code(request: SmsRequest, db: Session = Depends(get_db)):
         return error(code=400, message="手机号格式错误")
     
     current_time = int(time.time())
-    one_minute_ago = current_time - 60
-
-    # 查询1分钟内是否有发送成功的记录
-    recent_sms = db.query(Sms).filter(
-        Sms.mobile == mobile,
-        Sms.type == 1,  # 假设 type=1 表示发送成功
-        Sms.timestamp >= one_minute_ago,
-        Sms.timestamp <= current_time
-    ).first()
-
-    if recent_sms:
-        return error(code=429, message="发送过于频繁，请稍后再试")
 
     # 生成6位随机验证码
     code = str(random.randint(100000, 999999))
-    
-    # 调用阿里云发送短信
-    response = send_sms(mobile, code)
-    
-    # 判断是否发送成功
-    is_success = response is not None and hasattr(response, "code") and response.code == "OK"
-    
-    # 只有发送成功时才插入数据库
-    if is_success:
-        sms_record = Sms(
-            mobile=mobile,
-            sms_code=code,
-            timestamp=current_time,
-            type=1
-        )
-        db.add(sms_record)
-        db.commit()
-        db.refresh(sms_record)
-        return success(message="短信发送成功")
-    else:
-        # 发送失败，不插入数据库，直接返回错误
-        error_message = getattr(response, "message", "短信发送失败") if response else "短信发送失败"
-        return error(code=500, message=error_message)
+
+    try:
+        # 按手机号（每分钟、每天）和 IP（每小时）限制发送频率，一次往返检查并记录
+        limit = RateLimiter.hit([
+            (MOBILE_PER_MINUTE, mobile),
+            (MOBILE_PER_DAY, mobile),
+            (IP_PER_HOUR, client_ip(http_request))
+        ])
+        if not limit.allowed:
+            return error(code=429, message="发送过于频繁，请稍后再试", data={"retry_after": limit.retry_after})
+
+        # 写入发送队列后立即返回，由 sms_worker.py 发送并写入 sms 表
+        SmsOutbox.enqueue(mobile, code, current_time)
+    except RedisError as e:
+        print(f"短信频率检查或入队失败: {e}")
+        return error(code=500, message="短信发送失败")
+
+    return success(message="短信发送成功")
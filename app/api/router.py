@@ -10,6 +10,7 @@ from app.api.endpoints.auth import login_router, logout_router
 from app.api.endpoints.account import router as account_router
 from app.api.endpoints.case import router as case_router
 from app.api.endpoints.communication import router as communication_router
+from app.api.endpoints.notice import router as notice_router
 
 api_router = APIRouter()
 
@@ -19,6 +20,7 @@ api_router.include_router(logout_router, prefix="/logout", tags=["登录认证"]
 api_router.include_router(account_router, prefix="/account", tags=["账号管理"])
 api_router.include_router(case_router, prefix="/case", tags=["案件管理"])
 api_router.include_router(communication_router, prefix="/communication", tags=["案件交流"])
+api_router.include_router(notice_router, prefix="/notice", tags=["提醒通知"])
 api_router.include_router(users_router, prefix="/users", tags=["用户管理"])
 api_router.include_router(items_router, prefix="/items", tags=["物品管理"])
 api_router.include_router(sms_router, prefix="/sms", tags=["短信验证码"])
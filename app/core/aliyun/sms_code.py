@@ -2,6 +2,7 @@
 # This file is auto-generated, don't edit it. Thanks.
 import os
 import sys
+import threading
 from typing import List
 
 from alibabacloud_dysmsapi20170525.client import Client as Dysmsapi20170525Client
@@ -11,32 +12,56 @@ from alibabacloud_tea_util import models as util_models
 from alibabacloud_tea_util.client import Client as UtilClient
 
 
-def send_sms(phone, message):
+# 长期复用的短信客户端（复用 HTTP 连接，避免每次发送重新创建）
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_sms_client() -> Dysmsapi20170525Client:
     """
-    发送阿里云短信验证码
+    获取阿里云短信客户端（进程内单例）
+    :return: 客户端
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from app.core.config import ALIYUN_ACCESS_KEY_ID, ALIYUN_ACCESS_KEY_SECRET
+                config = open_api_models.Config(
+                    access_key_id=ALIYUN_ACCESS_KEY_ID,
+                    access_key_secret=ALIYUN_ACCESS_KEY_SECRET,
+                    endpoint='dysmsapi.aliyuncs.com'
+                )
+                _client = Dysmsapi20170525Client(config)
+    return _client
+
+
+def build_send_sms_request(phone, message) -> dysmsapi_20170525_models.SendSmsRequest:
+    """
+    构建验证码短信请求
     :param phone: 手机号
     :param message: 验证码
-    :return: 响应对象
+    :return: 请求对象
     """
-    from app.core.config import (
-        ALIYUN_ACCESS_KEY_ID,
-        ALIYUN_ACCESS_KEY_SECRET,
-        ALIYUN_SMS_SIGN_NAME,
-        ALIYUN_SMS_TEMPLATE_CODE
-    )
-    
-    config = open_api_models.Config(
-        access_key_id=ALIYUN_ACCESS_KEY_ID,
-        access_key_secret=ALIYUN_ACCESS_KEY_SECRET,
-        endpoint='dysmsapi.aliyuncs.com'
-    )
-    client = Dysmsapi20170525Client(config)
-    request = dysmsapi_20170525_models.SendSmsRequest(
+    from app.core.config import ALIYUN_SMS_SIGN_NAME, ALIYUN_SMS_TEMPLATE_CODE
+
+    return dysmsapi_20170525_models.SendSmsRequest(
         phone_numbers=phone,
         sign_name=ALIYUN_SMS_SIGN_NAME,
         template_code=ALIYUN_SMS_TEMPLATE_CODE,
         template_param=f'{{"code":"{message}"}}'
     )
+
+
+def send_sms(phone, message):
+    """
+    发送阿里云短信验证码
+    :param phone: 手机号
+    :param message: 验证码
+    :return: 响应对象
+    """
+    client = get_sms_client()
+    request = build_send_sms_request(phone, message)
     try:
         response = client.send_sms_with_options(request, util_models.RuntimeOptions())
         print(f"短信请求成功: {response}")
@@ -13,8 +13,27 @@ DB_USER = os.getenv("DB_USER", "root")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "")
 DB_NAME = os.getenv("DB_NAME", "lvshi")
 
-# 数据库连接 URL
-DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
+# 数据库连接 URL（可通过环境变量整体覆盖，如本地测试用 sqlite:///./lvshi.db）
+DATABASE_URL = os.getenv("DATABASE_URL") or (
+    f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
+)
+
+# 异步数据库连接 URL（aiomysql），本地测试可用 sqlite+aiosqlite:///./lvshi.db
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or (
+    f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
+)
+
+# 案件搜索后端: mysql（FULLTEXT ngram 全文索引）/ memory（进程内倒排索引，本地测试用）
+# 未配置时 SQLite 数据库使用 memory，其余使用 mysql
+CASE_SEARCH_BACKEND = os.getenv("CASE_SEARCH_BACKEND") or (
+    "memory" if DATABASE_URL.startswith("sqlite") else "mysql"
+)
+
+# 使用异步数据库会话的接口（async def），便于逐步切换
+# 为空表示全部使用同步实现，"*" 表示全部切换，也可填逗号分隔的接口名，如 "case_list,case_communication"
+ASYNC_DB_ENDPOINTS = {
+    name.strip() for name in os.getenv("ASYNC_DB_ENDPOINTS", "").split(",") if name.strip()
+}
 
 # Redis 配置
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
@@ -24,9 +43,60 @@ REDIS_DB = int(os.getenv("REDIS_DB", 0))
 
 # Token 配置
 TOKEN_EXPIRE_SECONDS = int(os.getenv("TOKEN_EXPIRE_SECONDS", 86400))  # 默认24小时
+# 进程内 Token 缓存（减少每个请求的 Redis 读取），最大条目数为 0 时禁用
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", 10000))
+# 进程内 Token 缓存最长陈旧时间（秒），其他进程删除 Token 后最多在该时间内仍被本进程视为有效
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", 5))
+# Token 模式: redis（随机串，用户数据存 Redis）/ signed（HMAC 签名的无状态 Token，本地校验）
+TOKEN_MODE = os.getenv("TOKEN_MODE", "redis")
+# 签名 Token 的 HMAC 密钥（signed 模式必填）
+TOKEN_SECRET_KEY = os.getenv("TOKEN_SECRET_KEY", "")
+# 签名 Token 吊销状态（会话纪元 + 吊销列表）的进程内缓存时间（秒）
+TOKEN_REVOCATION_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_REVOCATION_CACHE_TTL_SECONDS", 5))
+
+# 进程内账号信息缓存（姓名、类型、关闭状态），最大条目数为 0 时禁用
+ACCOUNT_CACHE_MAX_ENTRIES = int(os.getenv("ACCOUNT_CACHE_MAX_ENTRIES", 10000))
+# 进程内账号信息缓存最长陈旧时间（秒），其他进程修改账号后最多在该时间内仍读到旧值
+ACCOUNT_CACHE_TTL_SECONDS = float(os.getenv("ACCOUNT_CACHE_TTL_SECONDS", 30))
+
+# 案件最近消息缓存（Redis），每个案件缓存的消息条数，0 表示禁用
+MESSAGE_CACHE_SIZE = int(os.getenv("MESSAGE_CACHE_SIZE", 50))
+# 案件最近消息缓存的过期时间（秒），每次读写时续期
+MESSAGE_CACHE_TTL_SECONDS = int(os.getenv("MESSAGE_CACHE_TTL_SECONDS", 7 * 86400))
+
+# 案件列表结果缓存（Redis）过期时间（秒），0 表示禁用；列表中"距今小时数"最多陈旧该时长
+CASE_LIST_CACHE_TTL_SECONDS = int(os.getenv("CASE_LIST_CACHE_TTL_SECONDS", 60))
 
 # 阿里云短信配置
 ALIYUN_ACCESS_KEY_ID = os.getenv("ALIYUN_ACCESS_KEY_ID", "")
 ALIYUN_ACCESS_KEY_SECRET = os.getenv("ALIYUN_ACCESS_KEY_SECRET", "")
 ALIYUN_SMS_SIGN_NAME = os.getenv("ALIYUN_SMS_SIGN_NAME", "")
 ALIYUN_SMS_TEMPLATE_CODE = os.getenv("ALIYUN_SMS_TEMPLATE_CODE", "")
+
+# 短信发送配置
+# 短信通道: aliyun（阿里云）/ fake（不实际发送，本地测试用）
+SMS_PROVIDER = os.getenv("SMS_PROVIDER", "aliyun")
+# 单条短信最多发送次数（含首次）
+SMS_MAX_ATTEMPTS = int(os.getenv("SMS_MAX_ATTEMPTS", 5))
+# 重试间隔基数（秒），第 n 次重试等待 基数 × 2^(n-1)
+SMS_RETRY_BASE_SECONDS = float(os.getenv("SMS_RETRY_BASE_SECONDS", 2))
+
+# 短信发送频率限制（滑动窗口，0 表示不限制该项）
+SMS_LIMIT_MOBILE_PER_MINUTE = int(os.getenv("SMS_LIMIT_MOBILE_PER_MINUTE", 1))
+SMS_LIMIT_MOBILE_PER_DAY = int(os.getenv("SMS_LIMIT_MOBILE_PER_DAY", 10))
+SMS_LIMIT_IP_PER_HOUR = int(os.getenv("SMS_LIMIT_IP_PER_HOUR", 20))
+# 客户端 IP 所在请求头（部署在反向代理后时设置，如 X-Forwarded-For，取第一个地址）；为空时使用连接地址
+CLIENT_IP_HEADER = os.getenv("CLIENT_IP_HEADER", "")
+
+# 验证码有效期（秒），从短信发送成功开始计算
+SMS_CODE_TTL_SECONDS = int(os.getenv("SMS_CODE_TTL_SECONDS", 300))
+# 验证码最多输错次数，达到后作废需重新获取
+SMS_CODE_MAX_ATTEMPTS = int(os.getenv("SMS_CODE_MAX_ATTEMPTS", 5))
+
+# 提醒通知：律师超过该小时数未回复（进行中的正常案件）时通知绑定人员
+LAWYER_REPLY_OVERDUE_HOURS = int(os.getenv("LAWYER_REPLY_OVERDUE_HOURS", 24))
+# 律师回复超时检查间隔（秒），由 notice_worker.py 执行
+NOTICE_OVERDUE_SCAN_SECONDS = int(os.getenv("NOTICE_OVERDUE_SCAN_SECONDS", 300))
+
+# 律师回复 SLA 统计区间（小时，逗号分隔），统计等待律师回复超过各小时数的案件数
+CASE_SLA_BUCKET_HOURS = [int(h) for h in os.getenv("CASE_SLA_BUCKET_HOURS", "24,72").split(",") if h.strip()]
@@ -1,11 +1,13 @@
 """
 数据库连接配置
+同步会话供普通接口和脚本使用，异步会话供 async def 接口使用（见 ASYNC_DB_ENDPOINTS）
 """
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-from app.core.config import DATABASE_URL
+from app.core.config import DATABASE_URL, ASYNC_DATABASE_URL
 
 # 创建数据库引擎
 engine = create_engine(
@@ -18,6 +20,22 @@ engine = create_engine(
 # 创建会话工厂
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 创建异步数据库引擎（连接在首次使用时建立）
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    echo=False
+)
+
+# 创建异步会话工厂（提交后不过期属性，避免在异步上下文中触发隐式加载）
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # 模型基类
 Base = declarative_base()
 
@@ -32,3 +50,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    获取异步数据库会话
+    用于 FastAPI 依赖注入（async def 接口）
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,47 @@
+"""
+JSON 响应
+使用 orjson 直接序列化返回数据，不经过 FastAPI 的 jsonable_encoder（逐层遍历转换）和标准库 json；
+未安装 orjson 时退回标准库 json（同样不经过 jsonable_encoder）
+"""
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """orjson / json 不能直接序列化的类型（Pydantic 模型等）"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    return jsonable_encoder(obj)
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    序列化为 UTF-8 JSON（中文不转义）
+
+    :param content: 返回数据
+    :return: JSON 字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    高性能 JSON 响应（应用默认响应类）
+
+    使用方法:
+        return FastJSONResponse({"code": 0, "message": "success", "data": ...})
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
@@ -1,7 +1,9 @@
 """
 Redis 连接配置
+同步客户端供普通接口和脚本（如 init_db.py）使用，异步客户端供 async def 接口使用
 """
 import redis
+import redis.asyncio as aioredis
 
 from app.core.config import REDIS_HOST, REDIS_PORT, REDIS_PASSWORD, REDIS_DB
 
@@ -18,6 +20,24 @@ pool = redis.ConnectionPool(
 redis_client = redis.Redis(connection_pool=pool)
 
 
+# 异步 Redis 连接池（连接在首次使用时于当前事件循环中建立）
+async_pool = aioredis.ConnectionPool(
+    host=REDIS_HOST,
+    port=REDIS_PORT,
+    password=REDIS_PASSWORD,
+    db=REDIS_DB,
+    decode_responses=True
+)
+
+# 异步 Redis 客户端
+async_redis_client = aioredis.Redis(connection_pool=async_pool)
+
+
 def get_redis() -> redis.Redis:
     """获取 Redis 客户端"""
     return redis_client
+
+
+def get_async_redis() -> aioredis.Redis:
+    """获取异步 Redis 客户端"""
+    return async_redis_client
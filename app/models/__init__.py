@@ -5,3 +5,4 @@ from app.models.case import Case
 from app.models.account_case import AccountCase
 from app.models.case_communication import CaseCommunication
 from app.models.notice_log import NoticeLog
+from app.models.communication_search_token import CommunicationSearchToken
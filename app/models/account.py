@@ -1,7 +1,7 @@
 """
 账号表
 """
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String
 
 from app.core.database import Base
 
@@ -13,6 +13,12 @@ class Account(Base):
     close: 0-正常 1-关闭
     """
     __tablename__ = "account"
+    __table_args__ = (
+        # 登录、创建/编辑用户时按手机号查找，手机号唯一
+        Index("uq_account_mobile", "mobile", unique=True),
+        # 用户列表：按类型筛选，按 account_id 倒序分页
+        Index("idx_account_type_account", "type", "account_id"),
+    )
 
     account_id = Column(Integer, primary_key=True, autoincrement=True, comment="主键")
     name = Column(String(50), nullable=True, comment="姓名")
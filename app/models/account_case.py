@@ -1,7 +1,7 @@
 """
 案件与人物绑定表
 """
-from sqlalchemy import Column, Integer
+from sqlalchemy import Column, Index, Integer
 
 from app.core.database import Base
 
@@ -12,6 +12,12 @@ class AccountCase(Base):
     type: 1-客户 2-律师 3-参与者
     """
     __tablename__ = "account_case"
+    __table_args__ = (
+        # 同一案件同一人只绑定一次；案件详情、发消息时按案件（+人）查找
+        Index("uq_account_case_case_account", "case_id", "account_id", unique=True),
+        # 案件列表：按人查找参与的案件
+        Index("idx_account_case_account_case", "account_id", "case_id"),
+    )
 
     account_case_id = Column(Integer, primary_key=True, autoincrement=True, comment="主键")
     case_id = Column(Integer, nullable=False, comment="案件表主键")
@@ -1,7 +1,7 @@
 """
 案件表
 """
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Index, Integer, String, Text
 
 from app.core.database import Base
 
@@ -13,6 +13,18 @@ class Case(Base):
     type: -1-删除 0-正常 1-归档
     """
     __tablename__ = "case"
+    __table_args__ = (
+        # 案件列表的排序字段
+        Index("idx_case_timestamp", "timestamp"),
+        Index("idx_case_complete_timestamp", "complete_timestamp"),
+        Index("idx_case_update_timestamp", "update_timestamp"),
+        Index("idx_case_lawyer_last_timestamp", "lawyer_last_timestamp"),
+        # 标题 + 简介全文索引（ngram 分词，支持中文），用于关键词搜索
+        Index(
+            "ft_case_title_introduction", "title", "introduction",
+            mysql_prefix="FULLTEXT", mysql_with_parser="ngram"
+        ),
+    )
 
     case_id = Column(Integer, primary_key=True, autoincrement=True, comment="主键")
     title = Column(String(200), nullable=True, comment="标题")
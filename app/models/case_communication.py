@@ -1,7 +1,7 @@
 """
 案件交流表
 """
-from sqlalchemy import Column, Integer, Text
+from sqlalchemy import Column, Index, Integer, Text
 
 from app.core.database import Base
 
@@ -13,6 +13,12 @@ class CaseCommunication(Base):
     message_type: 1-文字 2-文件
     """
     __tablename__ = "case_communication"
+    __table_args__ = (
+        # 交流大厅：按案件查找，按时间排序
+        Index("idx_case_communication_case_timestamp", "case_id", "timestamp"),
+        # 交流大厅分页 / 增量拉取：按案件查找，按主键定位
+        Index("idx_case_communication_case_id", "case_id", "case_communication_id"),
+    )
 
     case_communication_id = Column(Integer, primary_key=True, autoincrement=True, comment="主键")
     case_id = Column(Integer, nullable=False, comment="案件表主键")
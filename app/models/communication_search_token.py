@@ -0,0 +1,25 @@
+"""
+交流消息搜索词元表（倒排索引）
+"""
+from sqlalchemy import Column, Index, Integer, String
+
+from app.core.database import Base
+
+
+class CommunicationSearchToken(Base):
+    """
+    交流消息搜索词元表
+    每条文字消息按 n-gram 切分后，每个不同的词元一行，随 case_communication_message 写入
+    """
+    __tablename__ = "communication_search_token"
+    __table_args__ = (
+        # 按 词元 -> 案件 -> 消息 检索，覆盖索引，检索时无需回表
+        Index("idx_cst_token_case_communication", "token", "case_id", "case_communication_id"),
+        # 重建索引时按消息删除
+        Index("idx_cst_case_communication", "case_communication_id"),
+    )
+
+    communication_search_token_id = Column(Integer, primary_key=True, autoincrement=True, comment="主键")
+    token = Column(String(20), nullable=False, comment="词元")
+    case_id = Column(Integer, nullable=False, comment="案件表主键")
+    case_communication_id = Column(Integer, nullable=False, comment="案件交流表主键")
@@ -1,7 +1,7 @@
 """
 提醒通知记录表
 """
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Index, Integer, String, Text
 
 from app.core.database import Base
 
@@ -9,11 +9,18 @@ from app.core.database import Base
 class NoticeLog(Base):
     """
     提醒通知记录表
+    notice_type: 1-案件新消息 2-案件完成 3-案件归档 4-律师回复超时
     """
     __tablename__ = "notice_log"
+    __table_args__ = (
+        # 通知列表：按账号 + 主键倒序游标分页
+        Index("idx_notice_log_account_id", "account_id", "notice_log_id"),
+    )
 
     notice_log_id = Column(Integer, primary_key=True, autoincrement=True, comment="主键")
     account_id = Column(Integer, nullable=False, comment="账号表主键")
-    notice_type = Column(Integer, nullable=True, comment="消息类型")
+    notice_type = Column(Integer, nullable=True, comment="消息类型 1案件新消息 2案件完成 3案件归档 4律师回复超时")
     title = Column(String(200), nullable=True, comment="消息标题")
     content = Column(Text, nullable=True, comment="消息内容")
+    case_id = Column(Integer, nullable=True, comment="案件表主键")
+    timestamp = Column(Integer, nullable=True, comment="通知时间")
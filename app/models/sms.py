@@ -1,7 +1,7 @@
 """
 验证码表
 """
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String
 
 from app.core.database import Base
 
@@ -11,9 +11,13 @@ class Sms(Base):
     验证码表
     """
     __tablename__ = "sms"
+    __table_args__ = (
+        # 验证码使用记录：按手机号 + 类型查找
+        Index("idx_sms_mobile_type_timestamp", "mobile", "type", "timestamp"),
+    )
 
     sms_id = Column(Integer, primary_key=True, autoincrement=True, comment="主键")
     mobile = Column(String(20), nullable=True, comment="手机号")
     sms_code = Column(String(10), nullable=True, comment="验证码")
     timestamp = Column(Integer, nullable=True, comment="发送时间")
-    type = Column(Integer, nullable=True, comment="类型")
+    type = Column(Integer, nullable=True, comment="类型 1未使用 2已使用 3发送失败")
@@ -0,0 +1,21 @@
+"""
+提醒通知
+接口通过 NoticeQueue 写入事件，notice_worker.py 按案件绑定人员展开后批量写入 notice_log
+"""
+from app.notice.events import (
+    NOTICE_NEW_MESSAGE,
+    NOTICE_CASE_COMPLETED,
+    NOTICE_CASE_ARCHIVED,
+    NOTICE_LAWYER_OVERDUE,
+    new_message_event,
+    case_completed_event,
+    case_archived_event,
+    lawyer_overdue_event
+)
+from app.notice.queue import NoticeQueue
+
+__all__ = [
+    "NoticeQueue",
+    "NOTICE_NEW_MESSAGE", "NOTICE_CASE_COMPLETED", "NOTICE_CASE_ARCHIVED", "NOTICE_LAWYER_OVERDUE",
+    "new_message_event", "case_completed_event", "case_archived_event", "lawyer_overdue_event"
+]
@@ -0,0 +1,71 @@
+"""
+提醒通知事件
+接口在响应后（BackgroundTasks）将事件写入通知队列，notice_worker.py 按案件绑定人员展开写入 notice_log
+"""
+from typing import Optional
+
+# 通知类型（notice_log.notice_type）
+NOTICE_NEW_MESSAGE = 1
+NOTICE_CASE_COMPLETED = 2
+NOTICE_CASE_ARCHIVED = 3
+NOTICE_LAWYER_OVERDUE = 4
+
+# 新消息通知中消息内容的最大长度
+CONTENT_PREVIEW_LENGTH = 100
+
+
+def build_notice_event(notice_type: int, case_id: int, title: str, content: str, timestamp: int,
+                       actor_id: Optional[int] = None) -> dict:
+    """
+    组装通知事件
+
+    :param notice_type: 通知类型
+    :param case_id: 案件ID（通知发给该案件的全部绑定人员）
+    :param title: 通知标题
+    :param content: 通知内容
+    :param timestamp: 事件时间
+    :param actor_id: 触发事件的账号ID（不通知本人），系统事件为 None
+    :return: 事件数据（队列字段均为字符串）
+    """
+    return {
+        "notice_type": str(notice_type),
+        "case_id": str(case_id),
+        "actor_id": str(actor_id or 0),
+        "title": title,
+        "content": content,
+        "timestamp": str(timestamp)
+    }
+
+
+def new_message_event(case_id: int, case_title: Optional[str], sender_id: int, sender_name: str,
+                      message: str, message_type: int, timestamp: int) -> dict:
+    """案件新消息"""
+    preview = message[:CONTENT_PREVIEW_LENGTH] if message_type == 1 else "[文件]"
+    return build_notice_event(
+        NOTICE_NEW_MESSAGE, case_id, f"{case_title or ''} 有新消息",
+        f"{sender_name}: {preview}", timestamp, sender_id
+    )
+
+
+def case_completed_event(case_id: int, case_title: Optional[str], operator_id: int, timestamp: int) -> dict:
+    """案件完成"""
+    return build_notice_event(
+        NOTICE_CASE_COMPLETED, case_id, f"{case_title or ''} 已完成",
+        "案件进度已更新为完成", timestamp, operator_id
+    )
+
+
+def case_archived_event(case_id: int, case_title: Optional[str], operator_id: int, timestamp: int) -> dict:
+    """案件归档"""
+    return build_notice_event(
+        NOTICE_CASE_ARCHIVED, case_id, f"{case_title or ''} 已归档",
+        "案件已归档", timestamp, operator_id
+    )
+
+
+def lawyer_overdue_event(case_id: int, case_title: Optional[str], hours: int, timestamp: int) -> dict:
+    """律师回复超时"""
+    return build_notice_event(
+        NOTICE_LAWYER_OVERDUE, case_id, f"{case_title or ''} 律师回复超时",
+        f"律师已超过 {hours} 小时未回复", timestamp
+    )
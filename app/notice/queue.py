@@ -0,0 +1,123 @@
+"""
+提醒通知队列（Redis Stream）
+接口只写入事件（一次 XADD，在响应后的后台任务中执行），由 notice_worker.py 消费写入 notice_log
+
+键结构:
+    notice_events              stream，待处理的通知事件，消费组 notice_workers
+    notice_overdue:{case_id}   string，律师回复超时已通知标记（值为当时的律师最后回复时间）
+"""
+from typing import List, Tuple
+
+from redis import RedisError, ResponseError
+
+from app.core.redis import redis_client, async_redis_client
+
+# 队列最大长度（近似裁剪，防止 worker 长时间停止时无限增长）
+NOTICE_MAX_LENGTH = 100000
+# 律师回复超时已通知标记的保留时间（秒）
+OVERDUE_MARK_SECONDS = 30 * 86400
+
+
+class NoticeQueue:
+    """
+    提醒通知队列
+
+    使用方法（接口，响应后执行，不增加接口耗时）:
+        background_tasks.add_task(NoticeQueue.emit, new_message_event(...))
+        background_tasks.add_task(NoticeQueue.aemit, new_message_event(...))   # 异步接口
+
+    使用方法（worker）:
+        NoticeQueue.ensure_group()
+        for entry_id, event in NoticeQueue.read(consumer):
+            ...
+        NoticeQueue.done([entry_id, ...])
+    """
+
+    STREAM_KEY = "notice_events"
+    GROUP = "notice_workers"
+    OVERDUE_PREFIX = "notice_overdue:"
+
+    @classmethod
+    def emit(cls, event: dict) -> None:
+        """
+        写入通知事件（失败只打印日志，不影响业务）
+
+        :param event: build_notice_event 组装的事件
+        """
+        try:
+            redis_client.xadd(cls.STREAM_KEY, event, maxlen=NOTICE_MAX_LENGTH, approximate=True)
+        except RedisError as e:
+            print(f"通知事件写入失败: {e}")
+
+    @classmethod
+    async def aemit(cls, event: dict) -> None:
+        """写入通知事件（异步）"""
+        try:
+            await async_redis_client.xadd(cls.STREAM_KEY, event, maxlen=NOTICE_MAX_LENGTH, approximate=True)
+        except RedisError as e:
+            print(f"通知事件写入失败: {e}")
+
+    @classmethod
+    def ensure_group(cls) -> None:
+        """创建消费组（已存在时忽略）"""
+        try:
+            redis_client.xgroup_create(cls.STREAM_KEY, cls.GROUP, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    @classmethod
+    def read(cls, consumer: str, count: int = 100, block_ms: int = 1000) -> List[Tuple[str, dict]]:
+        """
+        读取新事件
+
+        :param consumer: 消费者名称（每个 worker 进程唯一）
+        :param count: 最多读取条数
+        :param block_ms: 无事件时最长等待毫秒数
+        :return: [(消息ID, 事件)]
+        """
+        result = redis_client.xreadgroup(cls.GROUP, consumer, {cls.STREAM_KEY: ">"}, count=count, block=block_ms)
+        if not result:
+            return []
+        return [(entry_id, fields) for entry_id, fields in result[0][1] if fields]
+
+    @classmethod
+    def claim_stale(cls, consumer: str, min_idle_ms: int, count: int = 100) -> List[Tuple[str, dict]]:
+        """
+        接管长时间未确认的事件（其他 worker 处理中途退出）
+
+        :param consumer: 当前消费者名称
+        :param min_idle_ms: 未确认超过该毫秒数的事件才接管
+        :param count: 最多接管条数
+        :return: [(消息ID, 事件)]
+        """
+        result = redis_client.xautoclaim(cls.STREAM_KEY, cls.GROUP, consumer, min_idle_ms, "0-0", count=count)
+        return [(entry_id, fields) for entry_id, fields in result[1] if fields]
+
+    @classmethod
+    def done(cls, entry_ids: List[str]) -> None:
+        """确认并删除事件（一次往返）"""
+        if not entry_ids:
+            return
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.xack(cls.STREAM_KEY, cls.GROUP, *entry_ids)
+        pipe.xdel(cls.STREAM_KEY, *entry_ids)
+        pipe.execute()
+
+    @classmethod
+    def mark_overdue(cls, marks: List[Tuple[int, int]]) -> List[int]:
+        """
+        标记律师回复超时已通知（同一案件同一律师最后回复时间只通知一次，一次往返）
+
+        :param marks: [(案件ID, 律师最后回复时间)]
+        :return: 本次新标记（需要通知）的案件ID
+        """
+        if not marks:
+            return []
+        pipe = redis_client.pipeline(transaction=False)
+        for case_id, last_timestamp in marks:
+            key = f"{cls.OVERDUE_PREFIX}{case_id}"
+            # 值不同（律师回复过后再次超时）时覆盖
+            pipe.set(key, last_timestamp, ex=OVERDUE_MARK_SECONDS, get=True)
+        previous = pipe.execute()
+        return [case_id for (case_id, last_timestamp), old in zip(marks, previous) if old != str(last_timestamp)]
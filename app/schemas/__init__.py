@@ -1,4 +1,8 @@
 # schemas 包
 from app.schemas.response import Response, success, error
 from app.schemas.user import UserCreateRequest, UserUpdateRequest, UserResponse
-from app.schemas.case import CaseCreateRequest, CaseUpdateRequest, CaseResponse
+from app.schemas.case import (
+    CaseCreateRequest, CaseUpdateRequest, CaseResponse,
+    CaseListItem, CaseListPage, CaseDetailsData, CaseListResponse, CaseDetailsResponse
+)
+from app.schemas.communication import CommunicationItem, CommunicationPage, CaseCommunicationResponse
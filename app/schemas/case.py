@@ -1,9 +1,11 @@
 """
 案件相关的 Pydantic 模型
 """
-from typing import Optional
+from typing import List, Optional, Union
 from pydantic import BaseModel, Field
 
+from app.schemas.response import Response
+
 
 class CaseCreateRequest(BaseModel):
     """创建案件请求"""
@@ -33,3 +35,60 @@ class CaseResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class CaseListItem(BaseModel):
+    """
+    案件列表项
+    请求传 fields 时只返回所选字段（case_id 始终返回），其余字段不出现在返回数据中
+    """
+    case_id: int
+    title: Optional[str] = None
+    introduction: Optional[str] = None
+    timestamp_string: Optional[str] = None
+    lawyer_last_timestamp_string: Optional[str] = None
+    lawyer_last_timestamp_interval_h: Optional[int] = None
+    update_timestamp: Optional[int] = None
+    update_timestamp_string: Optional[str] = None
+    progress: Optional[int] = None
+    type: Optional[int] = None
+    last_item: Optional[int] = Field(None, description="是否为最后一条（page 分页）")
+    unread: Optional[int] = Field(None, description="当前用户未读消息数")
+
+
+class CaseListPage(BaseModel):
+    """案件列表（游标分页）"""
+    list: List[CaseListItem]
+    next_cursor: str
+    has_more: int
+
+
+class CaseAccountItem(BaseModel):
+    """案件绑定人员"""
+    account_id: int
+    type: int
+    name: str
+
+
+class CaseDetailsData(BaseModel):
+    """
+    案件详情
+    请求传 fields 时只返回所选字段（case_id 始终返回），其余字段不出现在返回数据中
+    """
+    case_id: int
+    title: Optional[str] = None
+    introduction: Optional[str] = None
+    timestamp_string: Optional[str] = None
+    complete_timestamp_string: Optional[str] = None
+    lawyer_last_timestamp_string: Optional[str] = None
+    lawyer_last_timestamp_interval_h: Optional[int] = None
+    update_timestamp: Optional[int] = None
+    update_timestamp_string: Optional[str] = None
+    progress: Optional[int] = None
+    type: Optional[int] = None
+    account_case: Optional[List[CaseAccountItem]] = None
+
+
+# 接口响应模型（用于文档，page 分页返回列表，游标分页返回 CaseListPage；请求传 fields 时只返回所选字段）
+CaseListResponse = Response[Union[List[CaseListItem], CaseListPage]]
+CaseDetailsResponse = Response[CaseDetailsData]
@@ -0,0 +1,32 @@
+"""
+案件交流相关的 Pydantic 模型
+"""
+from typing import List, Optional, Union
+from pydantic import BaseModel, Field
+
+from app.schemas.response import Response
+
+
+class CommunicationItem(BaseModel):
+    """
+    交流记录
+    请求传 fields 时只返回所选字段（case_communication_id 始终返回），其余字段不出现在返回数据中
+    """
+    case_communication_id: int
+    message_type: Optional[int] = Field(None, description="消息类型 1文字 2文件")
+    message: Optional[str] = None
+    account_id: Optional[int] = None
+    name: Optional[str] = None
+    is_me: Optional[int] = None
+    type: Optional[int] = Field(None, description="发送人角色 0主任 1客户 2律师 3参与者")
+    timestamp_string: Optional[str] = None
+
+
+class CommunicationPage(BaseModel):
+    """交流记录（分页/增量模式）"""
+    list: List[CommunicationItem]
+    has_more: int
+
+
+# 接口响应模型（用于文档，不传分页参数时返回列表；请求传 fields 时只返回所选字段）
+CaseCommunicationResponse = Response[Union[List[CommunicationItem], CommunicationPage]]
@@ -1,9 +1,13 @@
 """
 统一响应格式
+success() / error() 直接返回序列化好的 FastJSONResponse，FastAPI 不再对返回数据做 jsonable_encoder 转换和响应模型校验；
+接口上声明的 response_model 只用于生成文档
 """
 from typing import Any, Generic, TypeVar, Optional
 from pydantic import BaseModel
 
+from app.core.json_response import FastJSONResponse
+
 T = TypeVar("T")
 
 
@@ -21,33 +25,33 @@ class Response(BaseModel, Generic[T]):
     data: Optional[T] = None
 
 
-def success(data: Any = None, message: str = "success") -> dict:
+def success(data: Any = None, message: str = "success") -> FastJSONResponse:
     """
     返回成功响应
     
     :param data: 响应数据，可以是对象、数组或 None
     :param message: 成功消息
-    :return: 统一格式的响应字典
+    :return: 统一格式的响应
     """
-    return {
+    return FastJSONResponse({
         "code": 0,
         "message": message,
         "data": data
-    }
+    })
 
 
 
-def error(code: int = -1, message: str = "error", data: Any = None) -> dict:
+def error(code: int = -1, message: str = "error", data: Any = None) -> FastJSONResponse:
     """
     返回错误响应
     
     :param code: 错误码，非0表示错误
     :param message: 错误消息
     :param data: 附加数据（可选）
-    :return: 统一格式的响应字典
+    :return: 统一格式的响应
     """
-    return {
+    return FastJSONResponse({
         "code": code,
         "message": message,
         "data": data
-    }
+    })
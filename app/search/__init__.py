@@ -0,0 +1,2 @@
+# search 包
+from app.search.case_index import case_search_index
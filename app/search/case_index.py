@@ -0,0 +1,204 @@
+"""
+案件全文搜索（标题 + 简介）
+生产环境使用 MySQL FULLTEXT(ngram) 索引，由 InnoDB 随写入自动维护；
+本地测试（SQLite）使用进程内倒排索引，首次搜索时从数据库加载，之后由 create_case / update_case 增量维护
+"""
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, literal, case as sql_case
+from sqlalchemy.dialects.mysql import match as mysql_match
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import CASE_SEARCH_BACKEND
+from app.models.case import Case
+from app.search.tokenizer import tokenize, query_terms, normalize, NGRAM_SIZE
+
+# 标题命中相对简介的权重
+TITLE_WEIGHT = 2.0
+
+
+def like_condition(keyword: str) -> ColumnElement:
+    """标题或简介包含搜索词（LIKE，无法使用索引，仅用于过短的搜索词）"""
+    pattern = f"%{keyword}%"
+    return (Case.title.like(pattern)) | (Case.introduction.like(pattern))
+
+
+class CaseSearchIndex(ABC):
+    """
+    案件搜索索引
+
+    使用方法:
+        case_search_index.ensure_loaded(db)   # 进程内索引首次使用时从数据库加载（异步会话用 aensure_loaded）
+        condition, score = case_search_index.match("合同纠纷")
+        query = select(Case).where(condition)
+        if score is not None:
+            query = query.order_by(score.desc())  # 按相关度排序
+
+        case_search_index.index_case(case_id, title, introduction)  # 案件写入后
+        case_search_index.remove_case(case_id)                      # 案件删除后
+    """
+
+    def ensure_loaded(self, db) -> None:
+        """
+        确保索引可用（同步会话）
+        默认为空实现：MySQL 全文索引由 InnoDB 随写入维护，MySQLFulltextCaseIndex 依赖以下维护钩子不做任何事
+        """
+
+    async def aensure_loaded(self, db) -> None:
+        """确保索引可用（异步会话），默认无需加载（MySQL 全文索引依赖此空实现）"""
+
+    def index_case(self, case_id: int, title: Optional[str], introduction: Optional[str]) -> None:
+        """案件新建或修改后更新索引，默认不处理（MySQL 全文索引依赖此空实现）"""
+
+    def remove_case(self, case_id: int) -> None:
+        """案件删除后移出索引，默认不处理（MySQL 全文索引依赖此空实现）"""
+
+    def match(self, keyword: str) -> Tuple[ColumnElement, Optional[ColumnElement]]:
+        """
+        构建搜索条件
+
+        搜索词按空白、标点拆成多个检索词，需全部命中；任一检索词短于 n-gram 长度时退回 LIKE
+
+        :param keyword: 搜索词
+        :return: (WHERE 条件, 相关度表达式)，退回 LIKE 时相关度为 None
+        """
+        terms = query_terms(keyword)
+        if not terms or any(len(term) < NGRAM_SIZE for term in terms):
+            return like_condition(keyword), None
+        return self._match_terms(terms)
+
+    @abstractmethod
+    def _match_terms(self, terms: List[str]) -> Tuple[ColumnElement, ColumnElement]:
+        """
+        构建检索词均不短于 n-gram 长度时的搜索条件
+
+        :param terms: 检索词
+        :return: (WHERE 条件, 相关度表达式)
+        """
+
+
+class MySQLFulltextCaseIndex(CaseSearchIndex):
+    """
+    基于 MySQL FULLTEXT(ngram) 索引的搜索
+    索引定义见 Case 模型 / add_case_fulltext_index.sql，数据由 InnoDB 自动维护
+    """
+
+    def _match_terms(self, terms: List[str]) -> Tuple[ColumnElement, ColumnElement]:
+        # 布尔模式：每个检索词作为短语必须出现，ngram 解析器下等价于子串匹配
+        against = " ".join(f'+"{term}"' for term in terms)
+        expr = mysql_match(Case.title, Case.introduction, against=against).in_boolean_mode()
+        return expr, expr
+
+
+class MemoryCaseIndex(CaseSearchIndex):
+    """
+    进程内倒排索引（本地测试用）
+    词元 -> {case_id: 加权词频}，相关度为各词元 词频 × IDF 之和
+    注意: 每个进程各自维护，多进程部署时其他进程写入的案件不可见，生产环境请使用 MySQL 全文索引
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 词元 -> {case_id: 加权词频}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        # case_id -> (小写全文, 词元列表)，全文用于排除 n-gram 拼接造成的误命中
+        self._docs: Dict[int, Tuple[str, List[str]]] = {}
+        self._loaded = False
+
+    def ensure_loaded(self, db) -> None:
+        if self._loaded:
+            return
+        rows = db.execute(self._load_query()).all()
+        self._load(rows)
+
+    async def aensure_loaded(self, db) -> None:
+        if self._loaded:
+            return
+        rows = (await db.execute(self._load_query())).all()
+        self._load(rows)
+
+    @staticmethod
+    def _load_query():
+        """加载全部未删除案件"""
+        return select(Case.case_id, Case.title, Case.introduction).where(Case.type != -1)
+
+    def _load(self, rows) -> None:
+        for case_id, title, introduction in rows:
+            self.index_case(case_id, title, introduction)
+        self._loaded = True
+
+    def index_case(self, case_id: int, title: Optional[str], introduction: Optional[str]) -> None:
+        weights: Dict[str, float] = {}
+        for token in tokenize(title):
+            weights[token] = weights.get(token, 0) + TITLE_WEIGHT
+        for token in tokenize(introduction):
+            weights[token] = weights.get(token, 0) + 1
+
+        with self._lock:
+            self._remove(case_id)
+            self._docs[case_id] = (f"{normalize(title)}\n{normalize(introduction)}", list(weights))
+            for token, weight in weights.items():
+                self._postings.setdefault(token, {})[case_id] = weight
+
+    def remove_case(self, case_id: int) -> None:
+        with self._lock:
+            self._remove(case_id)
+
+    def _remove(self, case_id: int) -> None:
+        """移除案件（调用方需持有锁）"""
+        doc = self._docs.pop(case_id, None)
+        if not doc:
+            return
+        for token in doc[1]:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(case_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    def search(self, terms: List[str]) -> Dict[int, float]:
+        """
+        检索
+
+        :param terms: 检索词（需全部命中）
+        :return: {case_id: 相关度}（全部命中，按用户筛选在 SQL 中进行，此处截断会丢失该用户排名靠后的案件）
+        """
+        tokens = {token for term in terms for token in tokenize(term)}
+        scores: Dict[int, float] = {}
+        with self._lock:
+            postings = [self._postings.get(token) for token in tokens]
+            if not postings or not all(postings):
+                return scores
+
+            # 从最短的倒排表开始求交集
+            postings.sort(key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+            total = len(self._docs)
+            for case_id in candidates:
+                text = self._docs[case_id][0]
+                if not all(term in text for term in terms):
+                    continue
+                scores[case_id] = sum(p[case_id] * math.log(1 + total / len(p)) for p in postings)
+
+        return scores
+
+    def _match_terms(self, terms: List[str]) -> Tuple[ColumnElement, ColumnElement]:
+        scores = self.search(terms)
+        if not scores:
+            return Case.case_id.in_([]), literal(0)
+        score = sql_case(scores, value=Case.case_id, else_=0)
+        return Case.case_id.in_(list(scores)), score
+
+
+def create_case_search_index() -> CaseSearchIndex:
+    """按 CASE_SEARCH_BACKEND 配置创建搜索索引"""
+    if CASE_SEARCH_BACKEND == "memory":
+        return MemoryCaseIndex()
+    return MySQLFulltextCaseIndex()
+
+
+# 全局案件搜索索引
+case_search_index = create_case_search_index()
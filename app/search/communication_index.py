@@ -0,0 +1,229 @@
+"""
+案件交流消息搜索
+倒排索引存于 communication_search_token 表（词元, case_id, case_communication_id），
+由 case_communication_message 在同一事务内增量写入；检索只扫描覆盖索引，再按消息 ID 回表取命中消息
+"""
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, func, delete, Select
+
+from app.models.case_communication import CaseCommunication
+from app.models.communication_search_token import CommunicationSearchToken
+from app.search.tokenizer import tokenize, query_terms, normalize, NGRAM_SIZE
+
+# 只索引文字消息（文件消息内容为文件地址）
+INDEXED_MESSAGE_TYPE = 1
+# 命中片段中关键词前后保留的字符数
+SNIPPET_CONTEXT = 30
+# 每页最多翻阅的候选批次（候选需二次校验，个别批次可能全部被排除）
+MAX_SCAN_ROUNDS = 5
+
+# 交流记录读取的列（交流大厅与搜索命中共用），结果为行元组而非 ORM 对象
+MESSAGE_COLUMNS = (
+    CaseCommunication.case_communication_id,
+    CaseCommunication.case_id,
+    CaseCommunication.account_id,
+    CaseCommunication.type,
+    CaseCommunication.message_type,
+    CaseCommunication.message,
+    CaseCommunication.timestamp
+)
+
+
+def message_token_rows(record: CaseCommunication) -> List[dict]:
+    """
+    生成一条消息的索引行
+
+    :param record: 已分配主键的交流记录
+    :return: communication_search_token 行列表（不同词元各一行）
+    """
+    if record.message_type != INDEXED_MESSAGE_TYPE or not record.message:
+        return []
+    return [
+        {"token": token, "case_id": record.case_id, "case_communication_id": record.case_communication_id}
+        for token in set(tokenize(record.message))
+    ]
+
+
+def delete_message_tokens_query(case_communication_ids: List[int]):
+    """删除消息索引行（重建索引用）"""
+    return delete(CommunicationSearchToken).where(
+        CommunicationSearchToken.case_communication_id.in_(case_communication_ids)
+    )
+
+
+def parse_terms(keyword: str) -> Tuple[List[str], bool]:
+    """
+    解析搜索词
+
+    :param keyword: 搜索词
+    :return: (检索词列表, 是否可使用索引)；存在短于 n-gram 长度的检索词时不可使用索引
+    """
+    terms = query_terms(keyword)
+    return terms, bool(terms) and all(len(term) >= NGRAM_SIZE for term in terms)
+
+
+def build_candidate_query(terms: List[str], case_scope, before_id: Optional[int], limit: int) -> Select:
+    """
+    构建候选消息查询：包含全部词元的消息ID，按ID倒序
+
+    :param terms: 检索词
+    :param case_scope: 案件范围（case_id 列表或子查询）
+    :param before_id: 只查该消息ID之前的消息
+    :param limit: 候选条数
+    :return: 查询语句，行为 (case_communication_id,)
+    """
+    tokens = sorted({token for term in terms for token in tokenize(term)})
+    query = select(CommunicationSearchToken.case_communication_id).where(
+        CommunicationSearchToken.token.in_(tokens),
+        CommunicationSearchToken.case_id.in_(case_scope)
+    )
+    if before_id:
+        query = query.where(CommunicationSearchToken.case_communication_id < before_id)
+    return query.group_by(
+        CommunicationSearchToken.case_communication_id
+    ).having(
+        func.count(func.distinct(CommunicationSearchToken.token)) == len(tokens)
+    ).order_by(
+        CommunicationSearchToken.case_communication_id.desc()
+    ).limit(limit)
+
+
+def escape_like(term: str) -> str:
+    """转义 LIKE 通配符（%、_）和转义符本身，配合 escape="\\" 使用"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_like_query(terms: List[str], case_scope, before_id: Optional[int], limit: int) -> Select:
+    """
+    构建 LIKE 查询（仅用于存在过短检索词的搜索词）
+    每个检索词各一个 LIKE 条件，与索引检索一样要求消息包含全部检索词
+
+    :param terms: 检索词
+    :return: 查询语句，行为 (case_communication_id,)
+    """
+    query = select(CaseCommunication.case_communication_id).where(
+        CaseCommunication.case_id.in_(case_scope),
+        CaseCommunication.message_type == INDEXED_MESSAGE_TYPE,
+        *(CaseCommunication.message.like(f"%{escape_like(term)}%", escape="\\") for term in terms)
+    )
+    if before_id:
+        query = query.where(CaseCommunication.case_communication_id < before_id)
+    return query.order_by(CaseCommunication.case_communication_id.desc()).limit(limit)
+
+
+def build_hits_query(case_communication_ids: List[int]) -> Select:
+    """
+    按ID查询候选消息（发送人姓名由调用方通过 AccountResolver 补齐）
+
+    :return: 查询语句，行为 MESSAGE_COLUMNS
+    """
+    return select(*MESSAGE_COLUMNS).where(
+        CaseCommunication.case_communication_id.in_(case_communication_ids)
+    ).order_by(CaseCommunication.case_communication_id.desc())
+
+
+def matches(message: Optional[str], terms: List[str]) -> bool:
+    """消息是否包含全部检索词（排除 n-gram 拼接造成的误命中）"""
+    text = normalize(message)
+    return all(term in text for term in terms)
+
+
+def normalize_aligned(message: str) -> str:
+    """
+    与原文逐字符对齐的小写文本（个别字符小写后长度改变，如 'İ'，保留原字符），
+    其中的位置可直接用于截取原文
+
+    :param message: 消息内容
+    :return: 与 message 等长的小写文本
+    """
+    text = normalize(message)
+    if len(text) == len(message):
+        return text
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in message)
+
+
+def make_snippet(message: str, terms: List[str]) -> Tuple[str, List[List[int]]]:
+    """
+    截取第一个命中位置前后的上下文
+
+    :param message: 消息内容
+    :param terms: 检索词
+    :return: (片段, 片段内各检索词出现位置 [[起, 止], ...])
+    """
+    message = message or ""
+    text = normalize_aligned(message)
+    first = min((text.find(term) for term in terms if term in text), default=0)
+    start = max(first - SNIPPET_CONTEXT, 0)
+    end = min(first + SNIPPET_CONTEXT + max((len(term) for term in terms), default=0), len(message))
+
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end < len(message) else ""
+    window = text[start:end]
+
+    highlights = []
+    for term in terms:
+        pos = window.find(term)
+        while pos != -1:
+            highlights.append([len(prefix) + pos, len(prefix) + pos + len(term)])
+            pos = window.find(term, pos + len(term))
+    highlights.sort()
+    return f"{prefix}{message[start:end]}{suffix}", highlights
+
+
+class CommunicationSearchPage:
+    """
+    分页检索过程（同步/异步实现共用，数据库读取由调用方完成）
+
+    使用方法:
+        page = CommunicationSearchPage(keyword, case_scope, page_size=20, before_id=None)
+        while not page.done:
+            ids = db.scalars(page.next_query()).all()
+            rows = load_communication(db, build_hits_query(ids)) if ids else []  # (消息行, name)
+            page.feed(ids, rows)
+        page.hits, page.next_before_id, page.has_more
+    """
+
+    def __init__(self, keyword: str, case_scope, page_size: int, before_id: Optional[int] = None):
+        self.terms, self.indexed = parse_terms(keyword)
+        self.case_scope = case_scope
+        self.page_size = page_size
+        self.batch_size = page_size * 2
+        self.next_before_id = before_id or 0
+        # 命中的 (消息行, name)
+        self.hits: list = []
+        self.has_more = False
+        self.done = not self.terms
+        self._rounds = 0
+
+    def next_query(self) -> Select:
+        """下一批候选消息ID查询"""
+        if self.indexed:
+            return build_candidate_query(self.terms, self.case_scope, self.next_before_id, self.batch_size)
+        return build_like_query(self.terms, self.case_scope, self.next_before_id, self.batch_size)
+
+    def feed(self, ids: List[int], rows: list) -> None:
+        """
+        处理一批候选
+
+        :param ids: 候选消息ID（倒序）
+        :param rows: 候选消息 (消息行, name)（倒序）
+        """
+        self._rounds += 1
+        self.has_more = len(ids) >= self.batch_size
+        if ids:
+            self.next_before_id = ids[-1]
+
+        for record, name in rows:
+            if not matches(record.message, self.terms):
+                continue
+            self.hits.append((record, name))
+            if len(self.hits) >= self.page_size:
+                # 本批未处理完，下一页从当前命中之后继续
+                if record.case_communication_id != ids[-1]:
+                    self.has_more = True
+                self.next_before_id = record.case_communication_id
+                break
+
+        if not self.has_more or len(self.hits) >= self.page_size or self._rounds >= MAX_SCAN_ROUNDS:
+            self.done = True
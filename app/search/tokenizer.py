@@ -0,0 +1,46 @@
+"""
+搜索分词
+按 n-gram 切分（与 MySQL ngram 全文解析器一致），中文无需词典即可检索任意子串
+"""
+import re
+from typing import List
+
+# 连续的字母、数字、汉字视为一段，其余字符（空白、标点）作为分隔
+_SEGMENT_RE = re.compile(r"\w+")
+
+# n-gram 长度，对应 MySQL 的 ngram_token_size（默认 2）
+NGRAM_SIZE = 2
+
+
+def normalize(text: str) -> str:
+    """统一小写，便于不区分大小写匹配"""
+    return (text or "").lower()
+
+
+def tokenize(text: str, n: int = NGRAM_SIZE) -> List[str]:
+    """
+    将文本切分为 n-gram 词元（保留重复，用于统计词频）
+
+    如 "合同纠纷 abc" -> ["合同", "同纠", "纠纷", "ab", "bc"]，长度不足 n 的段整体作为一个词元
+
+    :param text: 文本
+    :param n: n-gram 长度
+    :return: 词元列表
+    """
+    tokens = []
+    for segment in _SEGMENT_RE.findall(normalize(text)):
+        if len(segment) <= n:
+            tokens.append(segment)
+            continue
+        tokens.extend(segment[i:i + n] for i in range(len(segment) - n + 1))
+    return tokens
+
+
+def query_terms(keyword: str) -> List[str]:
+    """
+    将搜索词切分为检索词（按空白、标点分隔，每个检索词都需命中）
+
+    :param keyword: 搜索词
+    :return: 小写的检索词列表
+    """
+    return _SEGMENT_RE.findall(normalize(keyword))
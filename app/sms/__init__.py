@@ -0,0 +1,13 @@
+"""
+短信发送
+接口通过 SmsOutbox 入队后立即返回，sms_worker.py 调用短信通道（SmsProvider）发送并记录结果，
+发送成功的验证码保存在 VerificationCodeStore 中供登录校验
+"""
+from app.sms.codes import VerificationCodeStore, CODE_OK, CODE_WRONG, CODE_MISSING, CODE_LOCKED
+from app.sms.outbox import SmsOutbox
+from app.sms.providers import SmsProvider, SmsResult, create_sms_provider
+
+__all__ = [
+    "SmsOutbox", "SmsProvider", "SmsResult", "create_sms_provider",
+    "VerificationCodeStore", "CODE_OK", "CODE_WRONG", "CODE_MISSING", "CODE_LOCKED"
+]
@@ -0,0 +1,91 @@
+"""
+有效验证码（Redis）
+短信发送成功后写入，登录时一次 Lua 调用完成校验与消费：验证码正确即删除（并发登录只有一个成功），
+错误次数达到上限后作废；sms 表只作为发送/使用记录，不再参与校验
+
+键结构:
+    sms_code:{mobile}    hash，{code, attempts}，SMS_CODE_TTL_SECONDS 秒后过期
+"""
+from app.core.redis import redis_client, async_redis_client
+from app.core.config import SMS_CODE_TTL_SECONDS, SMS_CODE_MAX_ATTEMPTS
+
+# 校验结果
+CODE_OK = 1
+CODE_WRONG = 0
+CODE_MISSING = -1
+CODE_LOCKED = -2
+
+
+# 校验并消费验证码
+# KEYS[1]: 验证码 key
+# ARGV[1]: 提交的验证码, ARGV[2]: 最多错误次数
+# 返回 1 正确（已删除）, 0 错误, -1 不存在或已过期, -2 错误次数过多（已作废）
+_CONSUME_LUA = """
+local stored = redis.call('HGET', KEYS[1], 'code')
+if not stored then
+    return -1
+end
+if stored == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+    return -2
+end
+return 0
+"""
+
+
+class VerificationCodeStore:
+    """
+    有效验证码管理
+
+    使用方法:
+        VerificationCodeStore.issue(mobile, code)                # 短信发送成功后（覆盖该手机号之前的验证码）
+        result = VerificationCodeStore.consume(mobile, code)     # 登录时，CODE_OK 为通过
+
+    consume 有 a 前缀的异步版本
+    """
+
+    PREFIX = "sms_code:"
+    EXPIRE_SECONDS = SMS_CODE_TTL_SECONDS
+
+    _consume_script = redis_client.register_script(_CONSUME_LUA)
+    _aconsume_script = async_redis_client.register_script(_CONSUME_LUA)
+
+    @classmethod
+    def _key(cls, mobile: str) -> str:
+        return f"{cls.PREFIX}{mobile}"
+
+    @classmethod
+    def issue(cls, mobile: str, code: str) -> None:
+        """
+        保存验证码（错误次数清零，重新计算过期时间）
+
+        :param mobile: 手机号
+        :param code: 验证码
+        """
+        key = cls._key(mobile)
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.delete(key)
+        pipe.hset(key, mapping={"code": code, "attempts": 0})
+        pipe.expire(key, cls.EXPIRE_SECONDS)
+        pipe.execute()
+
+    @classmethod
+    def consume(cls, mobile: str, code: str) -> int:
+        """
+        校验并消费验证码（一次往返，原子完成）
+
+        :param mobile: 手机号
+        :param code: 提交的验证码
+        :return: CODE_OK / CODE_WRONG / CODE_MISSING / CODE_LOCKED
+        """
+        return int(cls._consume_script(keys=[cls._key(mobile)], args=[code, SMS_CODE_MAX_ATTEMPTS]))
+
+    @classmethod
+    async def aconsume(cls, mobile: str, code: str) -> int:
+        """校验并消费验证码（异步）"""
+        return int(await cls._aconsume_script(keys=[cls._key(mobile)], args=[code, SMS_CODE_MAX_ATTEMPTS]))
@@ -0,0 +1,170 @@
+"""
+短信发送队列（Redis Stream）
+接口只负责写入队列，由 sms_worker.py 消费发送；失败的短信按退避时间放入重试有序集合，到期后重新入队
+
+键结构:
+    sms_outbox              stream，待发送短信，消费组 sms_workers
+    sms_retry               zset，等待重试的短信，score 为重试时间
+
+同一手机号的发送频率由接口通过 RateLimiter 限制，入队本身不再检查
+"""
+import json
+import time
+from typing import List, Tuple
+
+from redis import ResponseError
+
+from app.core.redis import redis_client
+
+# 队列最大长度（近似裁剪，防止 worker 长时间停止时无限增长）
+OUTBOX_MAX_LENGTH = 100000
+# 每次最多重新入队的到期重试数
+PROMOTE_BATCH_SIZE = 100
+
+
+# 放入重试集合并确认原消息
+# KEYS[1]: 队列 key, KEYS[2]: 重试集合 key
+# ARGV[1]: 消费组, ARGV[2]: 消息ID, ARGV[3]: 重试时间, ARGV[4]: 消息内容 JSON
+_RETRY_LUA = """
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[4])
+redis.call('XACK', KEYS[1], ARGV[1], ARGV[2])
+redis.call('XDEL', KEYS[1], ARGV[2])
+return 1
+"""
+
+# 到期的重试重新入队
+# KEYS[1]: 队列 key, KEYS[2]: 重试集合 key
+# ARGV[1]: 当前时间, ARGV[2]: 最多处理条数, ARGV[3]: 队列最大长度
+# 返回重新入队的条数
+_PROMOTE_LUA = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, item in ipairs(items) do
+    local fields = cjson.decode(item)
+    redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[3], '*',
+        'mobile', fields['mobile'], 'code', fields['code'],
+        'requested_at', tostring(fields['requested_at']), 'attempt', tostring(fields['attempt']))
+    redis.call('ZREM', KEYS[2], item)
+end
+return #items
+"""
+
+
+class SmsOutbox:
+    """
+    短信发送队列
+
+    使用方法（接口，先通过 RateLimiter 检查发送频率）:
+        SmsOutbox.enqueue(mobile, code)
+
+    使用方法（worker）:
+        SmsOutbox.ensure_group()
+        SmsOutbox.promote_due_retries()
+        for entry_id, fields in SmsOutbox.read(consumer):
+            ...  # 发送
+            SmsOutbox.done(entry_id)                          # 成功或放弃
+            SmsOutbox.retry(entry_id, fields, delay_seconds)  # 稍后重试
+    """
+
+    STREAM_KEY = "sms_outbox"
+    GROUP = "sms_workers"
+    RETRY_KEY = "sms_retry"
+
+    _retry_script = redis_client.register_script(_RETRY_LUA)
+    _promote_script = redis_client.register_script(_PROMOTE_LUA)
+
+    @classmethod
+    def enqueue(cls, mobile: str, code: str, requested_at: int = None) -> str:
+        """
+        短信入队（写入 Redis 后即返回，由 worker 异步发送）
+
+        :param mobile: 手机号
+        :param code: 验证码
+        :param requested_at: 请求时间，默认当前时间
+        :return: 消息ID
+        """
+        if requested_at is None:
+            requested_at = int(time.time())
+        return redis_client.xadd(cls.STREAM_KEY, {
+            "mobile": mobile,
+            "code": code,
+            "requested_at": requested_at,
+            "attempt": 1
+        }, maxlen=OUTBOX_MAX_LENGTH, approximate=True)
+
+    @classmethod
+    def ensure_group(cls) -> None:
+        """创建消费组（已存在时忽略）"""
+        try:
+            redis_client.xgroup_create(cls.STREAM_KEY, cls.GROUP, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    @classmethod
+    def read(cls, consumer: str, count: int = 10, block_ms: int = 1000) -> List[Tuple[str, dict]]:
+        """
+        读取新消息
+
+        :param consumer: 消费者名称（每个 worker 进程唯一）
+        :param count: 最多读取条数
+        :param block_ms: 无消息时最长等待毫秒数
+        :return: [(消息ID, 字段)]
+        """
+        result = redis_client.xreadgroup(cls.GROUP, consumer, {cls.STREAM_KEY: ">"}, count=count, block=block_ms)
+        if not result:
+            return []
+        return [(entry_id, fields) for entry_id, fields in result[0][1] if fields]
+
+    @classmethod
+    def claim_stale(cls, consumer: str, min_idle_ms: int, count: int = 10) -> List[Tuple[str, dict]]:
+        """
+        接管长时间未确认的消息（其他 worker 处理中途退出）
+
+        :param consumer: 当前消费者名称
+        :param min_idle_ms: 未确认超过该毫秒数的消息才接管
+        :param count: 最多接管条数
+        :return: [(消息ID, 字段)]
+        """
+        result = redis_client.xautoclaim(cls.STREAM_KEY, cls.GROUP, consumer, min_idle_ms, "0-0", count=count)
+        return [(entry_id, fields) for entry_id, fields in result[1] if fields]
+
+    @classmethod
+    def done(cls, entry_id: str) -> None:
+        """确认并删除消息"""
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.xack(cls.STREAM_KEY, cls.GROUP, entry_id)
+        pipe.xdel(cls.STREAM_KEY, entry_id)
+        pipe.execute()
+
+    @classmethod
+    def retry(cls, entry_id: str, fields: dict, delay_seconds: float) -> None:
+        """
+        稍后重试（发送次数加一）
+
+        :param entry_id: 消息ID
+        :param fields: 消息字段
+        :param delay_seconds: 等待秒数
+        """
+        item = json.dumps({
+            "id": entry_id,
+            "mobile": fields["mobile"],
+            "code": fields["code"],
+            "requested_at": int(fields["requested_at"]),
+            "attempt": int(fields.get("attempt", 1)) + 1
+        })
+        cls._retry_script(
+            keys=[cls.STREAM_KEY, cls.RETRY_KEY],
+            args=[cls.GROUP, entry_id, time.time() + delay_seconds, item]
+        )
+
+    @classmethod
+    def promote_due_retries(cls) -> int:
+        """
+        到期的重试重新入队
+
+        :return: 重新入队的条数
+        """
+        return int(cls._promote_script(
+            keys=[cls.STREAM_KEY, cls.RETRY_KEY],
+            args=[time.time(), PROMOTE_BATCH_SIZE, OUTBOX_MAX_LENGTH]
+        ))
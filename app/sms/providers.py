@@ -0,0 +1,103 @@
+"""
+短信通道
+发送逻辑与具体服务商解耦，由 SMS_PROVIDER 配置选择；本地测试使用 fake 通道，不实际发送
+"""
+import threading
+from abc import ABC, abstractmethod
+from typing import List, NamedTuple, Tuple
+
+from app.core.config import SMS_PROVIDER
+
+# 阿里云返回码中可重试的错误（限流、系统繁忙），其余错误（如号码无效）重试无意义
+ALIYUN_RETRYABLE_CODES = {"isv.BUSINESS_LIMIT_CONTROL", "isp.SYSTEM_ERROR"}
+# 阿里云请求超时（毫秒）
+ALIYUN_CONNECT_TIMEOUT = 3000
+ALIYUN_READ_TIMEOUT = 5000
+
+
+class SmsResult(NamedTuple):
+    """发送结果"""
+    ok: bool
+    message: str = ""
+    # 失败时是否值得重试
+    retryable: bool = False
+
+
+class SmsProvider(ABC):
+    """
+    短信通道接口
+
+    使用方法:
+        provider = create_sms_provider()
+        result = provider.send_code("13800000000", "123456")
+        if not result.ok and result.retryable:
+            ...  # 稍后重试
+    """
+
+    name = ""
+
+    @abstractmethod
+    def send_code(self, mobile: str, code: str) -> SmsResult:
+        """
+        发送验证码
+
+        :param mobile: 手机号
+        :param code: 验证码
+        :return: 发送结果
+        """
+
+
+class AliyunSmsProvider(SmsProvider):
+    """阿里云短信，客户端进程内复用"""
+
+    name = "aliyun"
+
+    def send_code(self, mobile: str, code: str) -> SmsResult:
+        from alibabacloud_tea_util import models as util_models
+        from app.core.aliyun.sms_code import get_sms_client, build_send_sms_request
+
+        runtime = util_models.RuntimeOptions(
+            connect_timeout=ALIYUN_CONNECT_TIMEOUT,
+            read_timeout=ALIYUN_READ_TIMEOUT
+        )
+        try:
+            response = get_sms_client().send_sms_with_options(build_send_sms_request(mobile, code), runtime)
+        except Exception as e:
+            # 网络异常、超时等
+            return SmsResult(ok=False, message=str(e), retryable=True)
+
+        body = response.body
+        if body is not None and body.code == "OK":
+            return SmsResult(ok=True, message=body.message or "")
+        result_code = getattr(body, "code", "") or ""
+        return SmsResult(
+            ok=False,
+            message=f"{result_code} {getattr(body, 'message', '') or ''}".strip(),
+            retryable=result_code in ALIYUN_RETRYABLE_CODES
+        )
+
+
+class FakeSmsProvider(SmsProvider):
+    """本地测试通道：不实际发送，记录已发送的验证码"""
+
+    name = "fake"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # [(手机号, 验证码)]
+        self.sent: List[Tuple[str, str]] = []
+
+    def send_code(self, mobile: str, code: str) -> SmsResult:
+        with self._lock:
+            self.sent.append((mobile, code))
+        print(f"[fake 短信] {mobile}: {code}")
+        return SmsResult(ok=True, message="OK")
+
+
+def create_sms_provider() -> SmsProvider:
+    """按 SMS_PROVIDER 配置创建短信通道"""
+    if SMS_PROVIDER == "fake":
+        return FakeSmsProvider()
+    if SMS_PROVIDER == "aliyun":
+        return AliyunSmsProvider()
+    raise ValueError(f"不支持的短信通道: {SMS_PROVIDER}")
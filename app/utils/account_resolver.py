@@ -0,0 +1,107 @@
+"""
+账号信息批量解析
+接口返回中需要账号姓名/类型时，先收集本次请求涉及的账号ID，再用一次 IN 查询补齐进程内缓存中没有的账号，
+替代逐行关联 account 表；缓存按账号保存 (name, type, close)，update_account / delete_account 后主动失效
+"""
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from sqlalchemy import select, Select
+
+from app.core.config import ACCOUNT_CACHE_MAX_ENTRIES, ACCOUNT_CACHE_TTL_SECONDS
+from app.models.account import Account
+from app.utils.ttl_cache import TTLCache
+
+
+class AccountInfo(NamedTuple):
+    """账号信息"""
+    name: Optional[str]
+    type: Optional[int]
+    close: Optional[int]
+
+
+# 进程内账号信息缓存（多进程部署时，其他进程修改账号后最多 ACCOUNT_CACHE_TTL_SECONDS 秒内读到旧值）
+account_info_cache = TTLCache(max_entries=ACCOUNT_CACHE_MAX_ENTRIES, ttl_seconds=ACCOUNT_CACHE_TTL_SECONDS)
+
+
+def invalidate_account(account_id: int) -> None:
+    """账号修改/关闭后清除缓存"""
+    account_info_cache.delete(account_id)
+
+
+class AccountResolver:
+    """
+    请求内账号信息解析
+
+    使用方法:
+        resolver = AccountResolver().add(record.account_id for record in records)
+        resolver.load(db)           # 异步会话用 await resolver.aload(db)
+        resolver.name(account_id)   # 姓名，账号不存在时为 ""
+        resolver.get(account_id)    # AccountInfo，账号不存在时为 None
+    """
+
+    def __init__(self):
+        # 待查询的账号ID
+        self._pending: set = set()
+        # 本次请求已解析的账号
+        self._resolved: Dict[int, AccountInfo] = {}
+
+    def add(self, account_ids: Iterable[Optional[int]]) -> "AccountResolver":
+        """
+        登记需要解析的账号ID，缓存命中的直接解析
+
+        :param account_ids: 账号ID（可重复）
+        :return: self
+        """
+        for account_id in account_ids:
+            if account_id is None or account_id in self._resolved or account_id in self._pending:
+                continue
+            info = account_info_cache.get(account_id)
+            if info is None:
+                self._pending.add(account_id)
+            else:
+                self._resolved[account_id] = info
+        return self
+
+    def _query(self) -> Select:
+        """未命中缓存的账号，一次 IN 查询"""
+        return select(Account.account_id, Account.name, Account.type, Account.close).where(
+            Account.account_id.in_(sorted(self._pending))
+        )
+
+    def _store(self, rows) -> None:
+        for account_id, name, account_type, close in rows:
+            info = AccountInfo(name, account_type, close)
+            account_info_cache.set(account_id, info)
+            self._resolved[account_id] = info
+        self._pending.clear()
+
+    def load(self, db) -> "AccountResolver":
+        """查询未命中缓存的账号（同步会话）"""
+        if self._pending:
+            self._store(db.execute(self._query()).all())
+        return self
+
+    async def aload(self, db) -> "AccountResolver":
+        """查询未命中缓存的账号（异步会话）"""
+        if self._pending:
+            self._store((await db.execute(self._query())).all())
+        return self
+
+    def get(self, account_id: Optional[int]) -> Optional[AccountInfo]:
+        """账号信息，账号不存在时返回 None"""
+        return self._resolved.get(account_id)
+
+    def name(self, account_id: Optional[int]) -> str:
+        """账号姓名，账号不存在时返回空字符串"""
+        info = self._resolved.get(account_id)
+        return (info.name or "") if info else ""
+
+
+def resolve_account(db, account_id: int) -> Optional[AccountInfo]:
+    """获取单个账号信息（同步会话）"""
+    return AccountResolver().add([account_id]).load(db).get(account_id)
+
+
+async def aresolve_account(db, account_id: int) -> Optional[AccountInfo]:
+    """获取单个账号信息（异步会话）"""
+    return (await AccountResolver().add([account_id]).aload(db)).get(account_id)
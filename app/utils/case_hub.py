@@ -0,0 +1,166 @@
+"""
+案件消息实时推送
+case_communication_message 写入消息后发布到 Redis 频道 case_message:{case_id}；
+每个 worker 进程只保持一个订阅连接，只订阅本进程内有 WebSocket / SSE 连接的案件频道
+（案件的第一个连接建立时订阅，最后一个连接断开时取消订阅），收到后分发给这些连接
+"""
+import asyncio
+import json
+from typing import Dict, Optional, Set
+
+from app.core.redis import redis_client, async_redis_client
+
+# 频道前缀
+CHANNEL_PREFIX = "case_message:"
+# 每个连接最多积压的消息数，超出时丢弃最旧的（客户端可用 case_communication 的 after_id 补齐）
+SUBSCRIBER_QUEUE_SIZE = 100
+# 订阅连接断开后的重连间隔（秒）
+RECONNECT_DELAY = 1
+# 读取订阅消息的等待时间（秒）
+LISTEN_TIMEOUT = 1.0
+
+
+class CaseMessageHub:
+    """
+    进程内消息分发中心
+
+    使用方法:
+        case_message_hub.publish(case_id, message)         # 同步接口发布
+        await case_message_hub.apublish(case_id, message)  # 异步接口发布
+
+        queue = await case_message_hub.subscribe(case_id)  # 连接建立后订阅
+        message = await queue.get()
+        await case_message_hub.unsubscribe(case_id, queue) # 连接断开后取消订阅
+    """
+
+    def __init__(self):
+        # case_id -> 本进程内的连接队列
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+        # 当前订阅连接（重连期间为 None，重连后按 _subscribers 重新订阅）
+        self._pubsub = None
+
+    @staticmethod
+    def channel(case_id: int) -> str:
+        """案件频道名"""
+        return f"{CHANNEL_PREFIX}{case_id}"
+
+    def publish(self, case_id: int, message: dict) -> None:
+        """
+        发布消息（同步 Redis 客户端）
+
+        :param case_id: 案件ID
+        :param message: 消息内容（需可 JSON 序列化）
+        """
+        redis_client.publish(self.channel(case_id), json.dumps(message, ensure_ascii=False))
+
+    async def apublish(self, case_id: int, message: dict) -> None:
+        """发布消息（异步 Redis 客户端）"""
+        await async_redis_client.publish(self.channel(case_id), json.dumps(message, ensure_ascii=False))
+
+    async def subscribe(self, case_id: int) -> asyncio.Queue:
+        """
+        订阅案件消息，首次订阅时启动本进程的 Redis 订阅任务，案件的第一个连接订阅该案件频道
+
+        :param case_id: 案件ID
+        :return: 消息队列
+        """
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        queues = self._subscribers.setdefault(case_id, set())
+        queues.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._listen())
+        if len(queues) == 1:
+            await self._update_channel(case_id, subscribe=True)
+        return queue
+
+    async def unsubscribe(self, case_id: int, queue: asyncio.Queue) -> None:
+        """取消订阅，案件的最后一个连接断开时取消订阅该案件频道"""
+        queues = self._subscribers.get(case_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[case_id]
+            await self._update_channel(case_id, subscribe=False)
+
+    async def _update_channel(self, case_id: int, subscribe: bool) -> None:
+        """
+        在当前订阅连接上订阅/取消订阅案件频道
+        订阅任务尚未连接或正在重连时跳过，连接后按 _subscribers 订阅
+        """
+        pubsub = self._pubsub
+        if pubsub is None:
+            return
+        try:
+            if subscribe:
+                await pubsub.subscribe(self.channel(case_id))
+            else:
+                await pubsub.unsubscribe(self.channel(case_id))
+        except Exception as e:
+            # 订阅连接异常，由 _listen 重连后重新订阅
+            print(f"案件消息订阅更新失败: {e}")
+
+    def subscriber_count(self) -> int:
+        """本进程内的连接数"""
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def stop(self) -> None:
+        """停止订阅任务（应用关闭时调用）"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _listen(self) -> None:
+        """读取本进程订阅的案件频道，连接异常时自动重连并重新订阅"""
+        while True:
+            pubsub = async_redis_client.pubsub(ignore_subscribe_messages=True)
+            # 先登记连接，之后新增的案件由 subscribe 直接订阅，不会遗漏
+            self._pubsub = pubsub
+            try:
+                channels = [self.channel(case_id) for case_id in self._subscribers]
+                if channels:
+                    await pubsub.subscribe(*channels)
+                while True:
+                    if pubsub.connection is None:
+                        # 尚未订阅任何频道（连接在首次订阅时建立）
+                        await asyncio.sleep(LISTEN_TIMEOUT)
+                        continue
+                    item = await pubsub.get_message(timeout=LISTEN_TIMEOUT)
+                    if item is not None:
+                        self._dispatch(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"案件消息订阅异常: {e}")
+                await asyncio.sleep(RECONNECT_DELAY)
+            finally:
+                self._pubsub = None
+                await pubsub.aclose()
+
+    def _dispatch(self, item: dict) -> None:
+        """分发一条 Redis 消息给本进程内的订阅者"""
+        if item.get("type") != "message":
+            return
+        try:
+            case_id = int(item["channel"][len(CHANNEL_PREFIX):])
+        except ValueError:
+            return
+        queues = self._subscribers.get(case_id)
+        if not queues:
+            return
+
+        message = json.loads(item["data"])
+        for queue in list(queues):
+            if queue.full():
+                # 消费过慢，丢弃最旧的消息
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+
+# 全局消息分发中心（每个 worker 进程一个）
+case_message_hub = CaseMessageHub()
@@ -0,0 +1,208 @@
+"""
+案件列表结果缓存
+按 (用户, 请求参数) 缓存 case_list 的返回数据，键中带该用户的列表版本号：
+案件新建/修改/状态变更/律师回复后，将所有绑定人员的版本号加一，旧版本的缓存不再被读取，随过期时间自然清除（无需扫描键）
+
+键结构:
+    case_list_version:{account_id}                 string，用户的列表版本号
+    case_list:{account_id}:{version}:{参数摘要}    string，返回数据 JSON
+    case_list_cache_stats                          hash，hits / misses 计数（全部进程合计）
+
+缓存读写失败时只打印日志，接口照常查询数据库
+"""
+import hashlib
+import json
+from typing import Any, Iterable, Optional, Tuple
+
+from redis import RedisError
+
+from app.core.redis import redis_client, async_redis_client
+from app.core.config import CASE_LIST_CACHE_TTL_SECONDS
+
+
+# 读取缓存并计数
+# KEYS[1]: 版本号 key, KEYS[2]: 统计 key
+# ARGV[1]: 缓存 key 前缀（含用户ID）, ARGV[2]: 参数摘要
+# 返回 {版本号, 缓存数据（未命中为 nil）}
+_GET_LUA = """
+local version = redis.call('GET', KEYS[1]) or '0'
+local data = redis.call('GET', ARGV[1] .. version .. ':' .. ARGV[2])
+if data then
+    redis.call('HINCRBY', KEYS[2], 'hits', 1)
+else
+    redis.call('HINCRBY', KEYS[2], 'misses', 1)
+end
+return {version, data}
+"""
+
+
+class CaseListCache:
+    """
+    案件列表结果缓存管理
+
+    使用方法:
+        digest = CaseListCache.digest(request.model_dump())
+        version, data = CaseListCache.get(account_id, digest)
+        if data is None:
+            data = ...  # 查询数据库
+            CaseListCache.set(account_id, version, digest, data)
+
+        CaseListCache.bump(account_ids)  # 案件变更提交后，传入所有绑定人员
+        CaseListCache.stats()            # 命中率
+
+    所有读写方法均有 a 前缀的异步版本
+    """
+
+    VERSION_PREFIX = "case_list_version:"
+    CACHE_PREFIX = "case_list:"
+    STATS_KEY = "case_list_cache_stats"
+    EXPIRE_SECONDS = CASE_LIST_CACHE_TTL_SECONDS
+
+    _get_script = redis_client.register_script(_GET_LUA)
+    _aget_script = async_redis_client.register_script(_GET_LUA)
+
+    @classmethod
+    def enabled(cls) -> bool:
+        """缓存是否启用"""
+        return cls.EXPIRE_SECONDS > 0
+
+    @staticmethod
+    def digest(params: dict) -> str:
+        """请求参数摘要"""
+        raw = json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _get_keys(cls, account_id: int) -> list:
+        return [f"{cls.VERSION_PREFIX}{account_id}", cls.STATS_KEY]
+
+    @classmethod
+    def _cache_key(cls, account_id: int, version: str, digest: str) -> str:
+        return f"{cls.CACHE_PREFIX}{account_id}:{version}:{digest}"
+
+    @staticmethod
+    def _parse_get(result) -> Tuple[str, Any]:
+        version, data = result
+        return str(version), (json.loads(data) if data is not None else None)
+
+    @classmethod
+    def get(cls, account_id: int, digest: str) -> Tuple[Optional[str], Any]:
+        """
+        读取缓存
+
+        :param account_id: 当前用户ID
+        :param digest: 请求参数摘要
+        :return: (版本号, 返回数据)，未命中时数据为 None；缓存不可用时版本号也为 None
+        """
+        if not cls.enabled():
+            return None, None
+        try:
+            result = cls._get_script(
+                keys=cls._get_keys(account_id),
+                args=[f"{cls.CACHE_PREFIX}{account_id}:", digest]
+            )
+        except RedisError as e:
+            print(f"案件列表缓存读取失败: {e}")
+            return None, None
+        return cls._parse_get(result)
+
+    @classmethod
+    def set(cls, account_id: int, version: Optional[str], digest: str, data: Any) -> None:
+        """
+        写入缓存（写在读取时的版本号下，期间版本号已变更则该条缓存不会被读取）
+
+        :param account_id: 当前用户ID
+        :param version: get 返回的版本号，为 None 时不写入
+        :param digest: 请求参数摘要
+        :param data: 返回数据
+        """
+        if version is None:
+            return
+        try:
+            redis_client.set(
+                cls._cache_key(account_id, version, digest),
+                json.dumps(data, ensure_ascii=False),
+                ex=cls.EXPIRE_SECONDS
+            )
+        except RedisError as e:
+            print(f"案件列表缓存写入失败: {e}")
+
+    @classmethod
+    def bump(cls, account_ids: Iterable[int]) -> None:
+        """
+        使用户的案件列表缓存失效（版本号加一，一次往返）
+
+        :param account_ids: 受影响的用户ID
+        """
+        account_ids = set(account_ids)
+        if not cls.enabled() or not account_ids:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for account_id in account_ids:
+                pipe.incr(f"{cls.VERSION_PREFIX}{account_id}")
+            pipe.execute()
+        except RedisError as e:
+            print(f"案件列表缓存失效失败: {e}")
+
+    @classmethod
+    def stats(cls) -> dict:
+        """
+        缓存命中统计（全部进程合计）
+
+        :return: {"hits", "misses", "hit_rate"}
+        """
+        raw = redis_client.hgetall(cls.STATS_KEY)
+        hits = int(raw.get("hits", 0))
+        misses = int(raw.get("misses", 0))
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0
+        }
+
+    # ==================== 异步版本 ====================
+
+    @classmethod
+    async def aget(cls, account_id: int, digest: str) -> Tuple[Optional[str], Any]:
+        """读取缓存（异步）"""
+        if not cls.enabled():
+            return None, None
+        try:
+            result = await cls._aget_script(
+                keys=cls._get_keys(account_id),
+                args=[f"{cls.CACHE_PREFIX}{account_id}:", digest]
+            )
+        except RedisError as e:
+            print(f"案件列表缓存读取失败: {e}")
+            return None, None
+        return cls._parse_get(result)
+
+    @classmethod
+    async def aset(cls, account_id: int, version: Optional[str], digest: str, data: Any) -> None:
+        """写入缓存（异步）"""
+        if version is None:
+            return
+        try:
+            await async_redis_client.set(
+                cls._cache_key(account_id, version, digest),
+                json.dumps(data, ensure_ascii=False),
+                ex=cls.EXPIRE_SECONDS
+            )
+        except RedisError as e:
+            print(f"案件列表缓存写入失败: {e}")
+
+    @classmethod
+    async def abump(cls, account_ids: Iterable[int]) -> None:
+        """使用户的案件列表缓存失效（异步）"""
+        account_ids = set(account_ids)
+        if not cls.enabled() or not account_ids:
+            return
+        try:
+            pipe = async_redis_client.pipeline(transaction=False)
+            for account_id in account_ids:
+                pipe.incr(f"{cls.VERSION_PREFIX}{account_id}")
+            await pipe.execute()
+        except RedisError as e:
+            print(f"案件列表缓存失效失败: {e}")
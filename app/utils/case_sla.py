@@ -0,0 +1,174 @@
+"""
+律师回复 SLA 索引
+进行中的正常案件（progress=1 且 type=0）按律师最后回复时间（未回复过为创建时间）保存在有序集合中，
+主任查看"等待律师回复最久的案件"和各超时区间的案件数时无需扫描案件表
+
+键结构:
+    case_sla_open    zset，成员为案件ID，score 为律师最后回复时间
+
+案件新建/律师回复/进度或状态变更时由接口维护；Redis 数据丢失时运行 python rebuild_case_sla_index.py 重建
+写入失败时只打印日志，不影响接口
+"""
+from typing import List, Optional, Sequence, Tuple
+
+from redis import RedisError
+from sqlalchemy import select
+
+from app.core.redis import redis_client, async_redis_client
+from app.models.case import Case
+
+# 重建时每批读取的案件数
+REBUILD_BATCH_SIZE = 1000
+
+
+def case_sla_score(lawyer_last_timestamp: Optional[int], timestamp: Optional[int]) -> int:
+    """SLA 计时起点：律师最后回复时间，未回复过为创建时间"""
+    return lawyer_last_timestamp or timestamp or 0
+
+
+def open_case_sla_score(case: Case) -> Optional[int]:
+    """
+    案件在索引中的 score（在提交前读取，避免提交后重新加载）
+
+    :param case: 案件
+    :return: 进行中且状态正常的案件返回计时起点，其他返回 None
+    """
+    if (case.progress or 1) == 1 and (case.type or 0) == 0:
+        return case_sla_score(case.lawyer_last_timestamp, case.timestamp)
+    return None
+
+
+class CaseSlaIndex:
+    """
+    律师回复 SLA 索引管理
+
+    使用方法:
+        score = open_case_sla_score(case)               # 案件新建、进度/状态变更，提交前
+        CaseSlaIndex.refresh(case_id, score)            # 提交后
+        CaseSlaIndex.touch(case_id, current_time)       # 律师回复后（只更新已在索引中的案件）
+        CaseSlaIndex.count_waiting(now, [24, 72])       # 各区间案件数
+        CaseSlaIndex.oldest(max_score, offset, limit)   # 等待最久的案件
+
+    touch、count_waiting、oldest 有 a 前缀的异步版本
+    """
+
+    KEY = "case_sla_open"
+
+    @classmethod
+    def refresh(cls, case_id: int, score: Optional[int]) -> None:
+        """
+        按案件当前进度/状态加入或移出索引
+
+        :param case_id: 案件ID
+        :param score: open_case_sla_score 的返回值，None 表示移出
+        """
+        try:
+            if score is not None:
+                redis_client.zadd(cls.KEY, {case_id: score})
+            else:
+                redis_client.zrem(cls.KEY, case_id)
+        except RedisError as e:
+            print(f"SLA 索引更新失败: {e}")
+
+    @classmethod
+    def touch(cls, case_id: int, timestamp: int) -> None:
+        """
+        律师回复后更新计时起点（案件不在索引中，即已完成/归档/删除时不加入）
+
+        :param case_id: 案件ID
+        :param timestamp: 律师回复时间
+        """
+        try:
+            redis_client.zadd(cls.KEY, {case_id: timestamp}, xx=True)
+        except RedisError as e:
+            print(f"SLA 索引更新失败: {e}")
+
+    @classmethod
+    def count_waiting(cls, now: int, hours: Sequence[int]) -> Tuple[int, List[int]]:
+        """
+        各超时区间的案件数（一次往返，每个区间一次 ZCOUNT）
+
+        :param now: 当前时间
+        :param hours: 超时小时数，如 [24, 72]
+        :return: (等待中的案件总数, [等待超过各小时数的案件数])
+        """
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.zcard(cls.KEY)
+        for h in hours:
+            pipe.zcount(cls.KEY, "-inf", now - h * 3600)
+        total, *counts = pipe.execute()
+        return total, counts
+
+    @classmethod
+    def oldest(cls, max_score: int, offset: int, limit: int) -> List[Tuple[int, int]]:
+        """
+        等待最久的案件
+
+        :param max_score: 只返回计时起点不晚于该时间的案件
+        :param offset: 跳过条数
+        :param limit: 返回条数
+        :return: [(案件ID, 律师最后回复时间)]，按等待时间从长到短
+        """
+        rows = redis_client.zrangebyscore(cls.KEY, "-inf", max_score, start=offset, num=limit, withscores=True)
+        return [(int(member), int(score)) for member, score in rows]
+
+    @classmethod
+    def rebuild(cls, db) -> int:
+        """
+        从案件表重建索引（先写临时 key，完成后替换）
+
+        :param db: 数据库会话
+        :return: 等待中的案件数
+        """
+        tmp_key = f"{cls.KEY}:rebuild"
+        redis_client.delete(tmp_key)
+        last_id = 0
+        total = 0
+        while True:
+            rows = db.execute(
+                select(Case.case_id, Case.lawyer_last_timestamp, Case.timestamp).where(
+                    Case.case_id > last_id,
+                    Case.progress == 1,
+                    Case.type == 0
+                ).order_by(Case.case_id).limit(REBUILD_BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            redis_client.zadd(tmp_key, {
+                case_id: case_sla_score(lawyer_ts, created_ts) for case_id, lawyer_ts, created_ts in rows
+            })
+            last_id = rows[-1][0]
+            total += len(rows)
+        if total:
+            redis_client.rename(tmp_key, cls.KEY)
+        else:
+            redis_client.delete(cls.KEY)
+        return total
+
+    # ==================== 异步版本 ====================
+
+    @classmethod
+    async def atouch(cls, case_id: int, timestamp: int) -> None:
+        """律师回复后更新计时起点（异步）"""
+        try:
+            await async_redis_client.zadd(cls.KEY, {case_id: timestamp}, xx=True)
+        except RedisError as e:
+            print(f"SLA 索引更新失败: {e}")
+
+    @classmethod
+    async def acount_waiting(cls, now: int, hours: Sequence[int]) -> Tuple[int, List[int]]:
+        """各超时区间的案件数（异步）"""
+        pipe = async_redis_client.pipeline(transaction=False)
+        pipe.zcard(cls.KEY)
+        for h in hours:
+            pipe.zcount(cls.KEY, "-inf", now - h * 3600)
+        total, *counts = await pipe.execute()
+        return total, counts
+
+    @classmethod
+    async def aoldest(cls, max_score: int, offset: int, limit: int) -> List[Tuple[int, int]]:
+        """等待最久的案件（异步）"""
+        rows = await async_redis_client.zrangebyscore(
+            cls.KEY, "-inf", max_score, start=offset, num=limit, withscores=True
+        )
+        return [(int(member), int(score)) for member, score in rows]
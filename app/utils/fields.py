@@ -0,0 +1,96 @@
+"""
+接口可选返回字段（稀疏字段集）
+客户端通过请求参数 fields 指定需要的字段，接口只读取这些字段用到的列、只返回这些字段；
+不传 fields 时返回全部字段（与之前一致）
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+
+class FieldSpec(NamedTuple):
+    """
+    单个返回字段
+
+    columns: 该字段需要读取的列
+    value: 由查询结果行取值；为 None 时由调用方通过 format 的关键字参数提供
+    """
+    columns: tuple = ()
+    value: Optional[Callable[[Any], Any]] = None
+
+
+class FieldSet:
+    """
+    接口返回字段定义（即该接口 fields 参数的可选值）
+
+    使用方法:
+        CASE_FIELDS = FieldSet({"case_id": FieldSpec((Case.case_id,), lambda c: c.case_id), ...},
+                               required=("case_id",))
+        fields = CASE_FIELDS.validate(fields)          # 请求参数校验（validator 中调用）
+        columns = CASE_FIELDS.columns(fields, ALL_COLUMNS)
+        CASE_FIELDS.format(row, fields, last_item=0)   # 组装返回数据
+        CASE_FIELDS.pick(data, fields)                 # 已组装的数据（如缓存）只保留所选字段
+    """
+
+    def __init__(self, specs: Dict[str, FieldSpec], required: Sequence[str] = ()):
+        """
+        :param specs: 字段名 -> FieldSpec，按返回顺序
+        :param required: 始终返回的字段（如翻页、未读数依赖的主键）
+        """
+        self.specs = specs
+        self.required = tuple(required)
+        self.names = list(specs)
+
+    def validate(self, fields: Optional[List[str]]) -> Optional[List[str]]:
+        """
+        校验请求的字段
+
+        :param fields: 请求参数，None 表示全部字段
+        :return: 去重并补上必返字段后的字段列表（按定义顺序）
+        """
+        if fields is None:
+            return None
+        unknown = [name for name in fields if name not in self.specs]
+        if unknown:
+            raise ValueError(f"不支持的字段: {','.join(unknown)}，可选: {','.join(self.names)}")
+        wanted = set(fields) | set(self.required)
+        return [name for name in self.names if name in wanted]
+
+    def wants(self, fields: Optional[List[str]], name: str) -> bool:
+        """是否需要返回该字段"""
+        return fields is None or name in fields
+
+    def columns(self, fields: Optional[List[str]], all_columns: Sequence, extra: Sequence = ()) -> tuple:
+        """
+        所选字段需要读取的列
+
+        :param fields: validate 后的字段，None 表示全部字段
+        :param all_columns: 全部字段时读取的列（决定列的顺序）
+        :param extra: 不返回但查询需要的列（如游标排序字段）
+        :return: 需要读取的列
+        """
+        if fields is None:
+            return tuple(all_columns)
+        needed = {column.key for column in extra}
+        for name in fields:
+            needed.update(column.key for column in self.specs[name].columns)
+        return tuple(column for column in all_columns if column.key in needed)
+
+    def format(self, row, fields: Optional[List[str]], **computed) -> dict:
+        """
+        组装一行返回数据
+
+        :param row: 查询结果行（或 ORM 对象）
+        :param fields: validate 后的字段，None 表示全部字段
+        :param computed: value 为 None 的字段的值
+        :return: 返回数据
+        """
+        result = {}
+        for name in fields if fields is not None else self.names:
+            value = self.specs[name].value
+            result[name] = value(row) if value is not None else computed[name]
+        return result
+
+    def pick(self, data: dict, fields: Optional[List[str]]) -> dict:
+        """已组装的数据只保留所选字段"""
+        if fields is None:
+            return data
+        return {name: data[name] for name in fields if name in data}
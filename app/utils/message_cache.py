@@ -0,0 +1,239 @@
+"""
+案件最近消息缓存
+每个案件在 Redis 中缓存最近 MESSAGE_CACHE_SIZE 条消息（已含格式化时间），供交流大厅直接返回；
+发送人姓名不写入缓存（账号改名后缓存会随读取续期一直有效），由读取方通过 AccountResolver 补齐
+
+键结构:
+    case_messages:{case_id}       list，消息 JSON，按写入顺序
+    case_messages_meta:{case_id}  hash，filled（已从数据库加载）、complete（是否为全部消息）、version（写入版本）
+
+未加载时由读取方从数据库取最近消息回填；回填只在版本号未变时生效，
+避免回填期间写入的新消息被旧数据覆盖。所有操作均通过 Lua 脚本一次往返完成
+"""
+import json
+from typing import List
+
+from app.core.redis import redis_client, async_redis_client
+from app.core.config import MESSAGE_CACHE_SIZE, MESSAGE_CACHE_TTL_SECONDS
+
+
+# 读取缓存并续期
+# KEYS[1]: 消息列表 key, KEYS[2]: 元数据 key
+# ARGV[1]: 过期秒数
+# 返回 {是否已加载, 是否完整, 版本号, 消息列表}
+_READ_LUA = """
+local meta = redis.call('HMGET', KEYS[2], 'filled', 'complete', 'version')
+local version = meta[3] or '0'
+if meta[1] ~= '1' then
+    return {0, 0, version, {}}
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return {1, tonumber(meta[2] or '0'), version, redis.call('LRANGE', KEYS[1], 0, -1)}
+"""
+
+# 回填缓存（版本号与读取时一致才写入）
+# KEYS[1]: 消息列表 key, KEYS[2]: 元数据 key
+# ARGV[1]: 读取时的版本号, ARGV[2]: 是否完整, ARGV[3]: 过期秒数, ARGV[4...]: 消息
+# 返回是否写入
+_FILL_LUA = """
+local version = redis.call('HGET', KEYS[2], 'version') or '0'
+if version ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+if #ARGV > 3 then
+    redis.call('RPUSH', KEYS[1], unpack(ARGV, 4))
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+redis.call('HSET', KEYS[2], 'filled', 1, 'complete', ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return 1
+"""
+
+# 写入新消息：版本号加一；已加载时追加并截断到最近 N 条
+# KEYS[1]: 消息列表 key, KEYS[2]: 元数据 key
+# ARGV[1]: 消息, ARGV[2]: 缓存条数, ARGV[3]: 过期秒数
+_APPEND_LUA = """
+redis.call('HINCRBY', KEYS[2], 'version', 1)
+if redis.call('HGET', KEYS[2], 'filled') == '1' then
+    local size = tonumber(ARGV[2])
+    if redis.call('RPUSH', KEYS[1], ARGV[1]) > size then
+        redis.call('LTRIM', KEYS[1], -size, -1)
+        redis.call('HSET', KEYS[2], 'complete', 0)
+    end
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return 1
+"""
+
+# 清除缓存：版本号加一（使进行中的回填失效），删除消息列表和加载标记
+# KEYS[1]: 消息列表 key, KEYS[2]: 元数据 key
+# ARGV[1]: 过期秒数
+_INVALIDATE_LUA = """
+redis.call('HINCRBY', KEYS[2], 'version', 1)
+redis.call('HDEL', KEYS[2], 'filled', 'complete')
+redis.call('DEL', KEYS[1])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return 1
+"""
+
+
+class CachedMessages:
+    """
+    缓存读取结果
+
+    filled: 是否已加载（未加载时 messages 为空，需从数据库读取后调用 fill 回填）
+    complete: messages 是否为该案件的全部消息
+    version: 读取时的版本号，回填时原样传回
+    messages: 消息列表，按 case_communication_id 正序（不含 name）
+    """
+
+    def __init__(self, filled: bool, complete: bool, version: str, messages: List[dict]):
+        self.filled = filled
+        self.complete = complete
+        self.version = version
+        self.messages = messages
+
+    @property
+    def first_id(self) -> int:
+        """缓存中最早一条消息的ID，无消息时为 0"""
+        return self.messages[0]["case_communication_id"] if self.messages else 0
+
+
+class CaseMessageCache:
+    """
+    案件最近消息缓存管理
+
+    使用方法:
+        cached = CaseMessageCache.read(case_id)
+        if not cached.filled:
+            messages = ...  # 从数据库读取最近消息（正序）
+            CaseMessageCache.fill(case_id, cached.version, messages[-CaseMessageCache.SIZE:], complete)
+
+        CaseMessageCache.append(case_id, message)  # 新消息提交后
+        CaseMessageCache.invalidate(case_id)       # 案件删除后
+
+    所有方法均有 a 前缀的异步版本
+    """
+
+    LIST_PREFIX = "case_messages:"
+    META_PREFIX = "case_messages_meta:"
+    SIZE = MESSAGE_CACHE_SIZE
+    EXPIRE_SECONDS = MESSAGE_CACHE_TTL_SECONDS
+
+    _read_script = redis_client.register_script(_READ_LUA)
+    _fill_script = redis_client.register_script(_FILL_LUA)
+    _append_script = redis_client.register_script(_APPEND_LUA)
+    _invalidate_script = redis_client.register_script(_INVALIDATE_LUA)
+
+    _aread_script = async_redis_client.register_script(_READ_LUA)
+    _afill_script = async_redis_client.register_script(_FILL_LUA)
+    _aappend_script = async_redis_client.register_script(_APPEND_LUA)
+    _ainvalidate_script = async_redis_client.register_script(_INVALIDATE_LUA)
+
+    @classmethod
+    def enabled(cls) -> bool:
+        """缓存是否启用"""
+        return cls.SIZE > 0
+
+    @classmethod
+    def _keys(cls, case_id: int) -> list:
+        return [f"{cls.LIST_PREFIX}{case_id}", f"{cls.META_PREFIX}{case_id}"]
+
+    @staticmethod
+    def _parse_read(result) -> CachedMessages:
+        filled, complete, version, items = result
+        # 按ID去重：回填读到的新消息随后又被 append 追加时会出现两次
+        by_id = {}
+        for item in items:
+            message = json.loads(item)
+            by_id[message["case_communication_id"]] = message
+        # 并发写入时追加顺序可能与ID顺序不一致
+        messages = [by_id[message_id] for message_id in sorted(by_id)]
+        return CachedMessages(int(filled) == 1, int(complete) == 1, str(version), messages)
+
+    @staticmethod
+    def _dump(message: dict) -> str:
+        """序列化写入缓存的消息（去掉发送人姓名）"""
+        return json.dumps({k: v for k, v in message.items() if k != "name"}, ensure_ascii=False)
+
+    @classmethod
+    def _fill_args(cls, version: str, messages: List[dict], complete: bool) -> list:
+        items = [cls._dump(m) for m in messages[-cls.SIZE:]]
+        return [version, 1 if complete else 0, cls.EXPIRE_SECONDS] + items
+
+    @classmethod
+    def read(cls, case_id: int) -> CachedMessages:
+        """
+        读取案件最近消息
+
+        :param case_id: 案件ID
+        :return: 读取结果
+        """
+        result = cls._read_script(keys=cls._keys(case_id), args=[cls.EXPIRE_SECONDS])
+        return cls._parse_read(result)
+
+    @classmethod
+    def fill(cls, case_id: int, version: str, messages: List[dict], complete: bool) -> bool:
+        """
+        回填缓存
+
+        :param case_id: 案件ID
+        :param version: read 返回的版本号
+        :param messages: 最近消息（正序），超出缓存条数时只保留最后的部分
+        :param complete: messages 是否为该案件的全部消息
+        :return: 是否写入（期间有新消息或缓存被清除时不写入）
+        """
+        if len(messages) > cls.SIZE:
+            complete = False
+        result = cls._fill_script(keys=cls._keys(case_id), args=cls._fill_args(version, messages, complete))
+        return int(result) == 1
+
+    @classmethod
+    def append(cls, case_id: int, message: dict) -> None:
+        """
+        写入新消息（消息提交后调用）
+
+        :param case_id: 案件ID
+        :param message: 消息数据（name 不写入缓存）
+        """
+        cls._append_script(
+            keys=cls._keys(case_id),
+            args=[cls._dump(message), cls.SIZE, cls.EXPIRE_SECONDS]
+        )
+
+    @classmethod
+    def invalidate(cls, case_id: int) -> None:
+        """清除案件缓存（案件删除后调用）"""
+        cls._invalidate_script(keys=cls._keys(case_id), args=[cls.EXPIRE_SECONDS])
+
+    # ==================== 异步版本 ====================
+
+    @classmethod
+    async def aread(cls, case_id: int) -> CachedMessages:
+        """读取案件最近消息（异步）"""
+        result = await cls._aread_script(keys=cls._keys(case_id), args=[cls.EXPIRE_SECONDS])
+        return cls._parse_read(result)
+
+    @classmethod
+    async def afill(cls, case_id: int, version: str, messages: List[dict], complete: bool) -> bool:
+        """回填缓存（异步）"""
+        if len(messages) > cls.SIZE:
+            complete = False
+        result = await cls._afill_script(keys=cls._keys(case_id), args=cls._fill_args(version, messages, complete))
+        return int(result) == 1
+
+    @classmethod
+    async def aappend(cls, case_id: int, message: dict) -> None:
+        """写入新消息（异步）"""
+        await cls._aappend_script(
+            keys=cls._keys(case_id),
+            args=[cls._dump(message), cls.SIZE, cls.EXPIRE_SECONDS]
+        )
+
+    @classmethod
+    async def ainvalidate(cls, case_id: int) -> None:
+        """清除案件缓存（异步）"""
+        await cls._ainvalidate_script(keys=cls._keys(case_id), args=[cls.EXPIRE_SECONDS])
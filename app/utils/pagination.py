@@ -0,0 +1,70 @@
+"""
+游标（keyset）分页工具
+游标对客户端不透明，内容为排序键 + 主键，下一页通过 WHERE 跳过已返回的行，而不是 OFFSET
+"""
+import base64
+import json
+from typing import Any, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def encode_cursor(values: list) -> str:
+    """
+    编码游标
+
+    :param values: 游标内容（排序键、主键等，需可 JSON 序列化）
+    :return: URL 安全的游标字符串
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Optional[list]:
+    """
+    解码游标
+
+    :param cursor: 游标字符串，空字符串表示第一页
+    :return: 游标内容，第一页返回 []，无效返回 None
+    """
+    if not cursor:
+        return []
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        return None
+    return values if isinstance(values, list) else None
+
+
+def keyset_after(sort_field, id_field, sort_value: Any, last_id: int, descending: bool) -> ColumnElement:
+    """
+    构建 "排在 (sort_value, last_id) 之后" 的条件，排序需为 ORDER BY sort_field, id_field 同方向
+
+    排序字段允许为 NULL，按 MySQL/SQLite 的规则：正序时 NULL 在最前，倒序时 NULL 在最后
+
+    :param sort_field: 排序字段
+    :param id_field: 主键字段（同值时的次级排序）
+    :param sort_value: 上一页最后一行的排序字段值
+    :param last_id: 上一页最后一行的主键
+    :param descending: 是否倒序
+    :return: WHERE 条件
+    """
+    if descending:
+        if sort_value is None:
+            return and_(sort_field.is_(None), id_field < last_id)
+        return or_(
+            sort_field < sort_value,
+            and_(sort_field == sort_value, id_field < last_id),
+            sort_field.is_(None)
+        )
+
+    if sort_value is None:
+        return or_(
+            and_(sort_field.is_(None), id_field > last_id),
+            sort_field.isnot(None)
+        )
+    return or_(
+        sort_field > sort_value,
+        and_(sort_field == sort_value, id_field > last_id)
+    )
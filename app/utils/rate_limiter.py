@@ -0,0 +1,130 @@
+"""
+滑动窗口频率限制
+每条规则一个有序集合（成员为单次请求，score 为请求时间毫秒），多条规则在一次 Lua 调用内检查并记录：
+任一规则超限则整体拒绝且不记录，全部通过才同时记录
+
+键结构:
+    rate_limit:{规则名}:{对象}    zset，窗口内的请求
+"""
+import time
+import uuid
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from fastapi import Request
+
+from app.core.redis import redis_client, async_redis_client
+from app.core.config import CLIENT_IP_HEADER
+
+
+# 检查并记录
+# KEYS[i]: 第 i 条规则的 key
+# ARGV[1]: 当前时间（毫秒）, ARGV[2]: 本次请求成员, ARGV[2i+1]: 第 i 条规则的次数上限, ARGV[2i+2]: 第 i 条规则的窗口毫秒数
+# 返回 {超限规则序号（0 为通过）, 需等待毫秒数}
+_HIT_LUA = """
+local now = tonumber(ARGV[1])
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[2 * i + 1])
+    local window = tonumber(ARGV[2 * i + 2])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= limit then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        return {i, tonumber(oldest[2]) + window - now}
+    end
+end
+for i, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[2])
+    redis.call('PEXPIRE', key, ARGV[2 * i + 2])
+end
+return {0, 0}
+"""
+
+
+class RateRule(NamedTuple):
+    """限制规则：window_seconds 秒内最多 limit 次（limit 为 0 表示不限制）"""
+    name: str
+    limit: int
+    window_seconds: int
+
+
+class RateLimitResult(NamedTuple):
+    """检查结果"""
+    allowed: bool
+    # 超限的规则名
+    rule: Optional[str] = None
+    # 需等待秒数
+    retry_after: int = 0
+
+
+class RateLimiter:
+    """
+    滑动窗口频率限制
+
+    使用方法:
+        MOBILE_PER_MINUTE = RateRule("sms_mobile_minute", 1, 60)
+        result = RateLimiter.hit([(MOBILE_PER_MINUTE, mobile), (IP_PER_HOUR, ip)])
+        if not result.allowed:
+            ...  # result.rule 超限，result.retry_after 秒后可重试
+
+    hit 有 a 前缀的异步版本
+    """
+
+    PREFIX = "rate_limit:"
+
+    _hit_script = redis_client.register_script(_HIT_LUA)
+    _ahit_script = async_redis_client.register_script(_HIT_LUA)
+
+    @classmethod
+    def _prepare(cls, checks: Iterable[Tuple[RateRule, str]]) -> Tuple[list, list, list]:
+        rules = [(rule, subject) for rule, subject in checks if rule.limit > 0]
+        keys = [f"{cls.PREFIX}{rule.name}:{subject}" for rule, subject in rules]
+        now_ms = int(time.time() * 1000)
+        args = [now_ms, f"{now_ms}-{uuid.uuid4().hex[:8]}"]
+        for rule, _ in rules:
+            args.extend([rule.limit, rule.window_seconds * 1000])
+        return rules, keys, args
+
+    @staticmethod
+    def _parse(rules: list, result) -> RateLimitResult:
+        index, wait_ms = int(result[0]), int(result[1])
+        if index == 0:
+            return RateLimitResult(allowed=True)
+        return RateLimitResult(
+            allowed=False,
+            rule=rules[index - 1][0].name,
+            retry_after=max(1, -(-wait_ms // 1000))
+        )
+
+    @classmethod
+    def hit(cls, checks: Iterable[Tuple[RateRule, str]]) -> RateLimitResult:
+        """
+        检查并记录一次请求（一次往返，原子完成）
+
+        :param checks: [(规则, 限制对象)]，如 [(每分钟规则, 手机号), (每小时规则, IP)]
+        :return: 检查结果，超限时本次请求不计入任何规则
+        """
+        rules, keys, args = cls._prepare(checks)
+        if not rules:
+            return RateLimitResult(allowed=True)
+        return cls._parse(rules, cls._hit_script(keys=keys, args=args))
+
+    @classmethod
+    async def ahit(cls, checks: Iterable[Tuple[RateRule, str]]) -> RateLimitResult:
+        """检查并记录一次请求（异步）"""
+        rules, keys, args = cls._prepare(checks)
+        if not rules:
+            return RateLimitResult(allowed=True)
+        return cls._parse(rules, await cls._ahit_script(keys=keys, args=args))
+
+
+def client_ip(request: Request) -> str:
+    """
+    客户端 IP
+
+    :param request: 请求对象
+    :return: 配置了 CLIENT_IP_HEADER 时取该请求头的第一个地址，否则为连接地址
+    """
+    if CLIENT_IP_HEADER:
+        value = request.headers.get(CLIENT_IP_HEADER, "")
+        if value:
+            return value.split(",")[0].strip()
+    return request.client.host if request.client else ""
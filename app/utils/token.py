@@ -1,18 +1,132 @@
 """
 Token 管理工具
 基于 Redis 实现 Token 的生成、验证、删除
+验证结果在进程内做短时缓存，避免每个请求都访问 Redis
+生成/删除/刷新均通过 Lua 脚本在一次往返内原子完成（脚本假定单机 Redis，见脚本前的说明）
+所有方法均有 a 前缀的异步版本（averify 等），基于 redis.asyncio，供 async def 接口使用
+
+另支持签名 Token（TOKEN_MODE=signed）：Token 内含用户数据、过期时间和 HMAC 签名，
+验证时本地校验，只需按账号读取（并缓存）会话纪元/吊销列表
 """
+import base64
+import hashlib
+import hmac
+import time
 import uuid
 import json
 from typing import Optional, Any
 
-from app.core.redis import redis_client
-from app.core.config import TOKEN_EXPIRE_SECONDS
+from app.core.redis import redis_client, async_redis_client
+from app.core.config import (
+    TOKEN_EXPIRE_SECONDS,
+    TOKEN_CACHE_MAX_ENTRIES,
+    TOKEN_CACHE_TTL_SECONDS,
+    TOKEN_MODE,
+    TOKEN_SECRET_KEY,
+    TOKEN_REVOCATION_CACHE_TTL_SECONDS
+)
+from app.utils.ttl_cache import TTLCache
+
+
+# 以下 Token 脚本假定使用单机 Redis（或主从）：
+# 旧 token key、用户 token 映射 key 只有在脚本内读到 token / 账号ID 后才能确定，由前缀参数拼出，
+# 未全部在 KEYS 中声明，且 token key 与用户 token 映射 key 不在同一个 slot，
+# 不能用于 Redis Cluster 或按 KEYS 路由的代理；改用集群时需先查出这些 key 再传入 KEYS（多一次往返）
+
+# 生成 Token
+# KEYS[1]: token key, KEYS[2]: 用户 token 映射 key
+# ARGV[1]: 用户数据, ARGV[2]: 过期秒数, ARGV[3]: 是否单点登录, ARGV[4]: token, ARGV[5]: token 前缀
+# 单点登录时另删除未声明的旧 token key（ARGV[5] .. 旧 token）
+# 返回被踢出的旧 token（没有则返回 nil）
+_GENERATE_LUA = """
+local old = false
+if ARGV[3] == '1' then
+    old = redis.call('GET', KEYS[2])
+    if old then
+        redis.call('DEL', ARGV[5] .. old)
+    end
+end
+redis.call('SETEX', KEYS[1], ARGV[2], ARGV[1])
+redis.call('SETEX', KEYS[2], ARGV[2], ARGV[4])
+return old
+"""
+
+# 删除 Token，用户 token 映射仅在仍指向该 token 时一并删除
+# KEYS[1]: token key
+# ARGV[1]: 用户 token 映射前缀, ARGV[2]: token
+# 另读写未声明的用户 token 映射 key（ARGV[1] .. 账号ID）
+# 返回删除的 token key 数量
+_DELETE_LUA = """
+local data = redis.call('GET', KEYS[1])
+if not data then
+    return 0
+end
+local ok, decoded = pcall(cjson.decode, data)
+if ok and type(decoded) == 'table' and decoded['account_id'] then
+    local user_token_key = ARGV[1] .. tostring(decoded['account_id'])
+    if redis.call('GET', user_token_key) == ARGV[2] then
+        redis.call('DEL', user_token_key)
+    end
+end
+return redis.call('DEL', KEYS[1])
+"""
+
+# 根据账号删除 Token
+# KEYS[1]: 用户 token 映射 key
+# ARGV[1]: token 前缀
+# 另删除未声明的旧 token key（ARGV[1] .. 旧 token）
+# 返回被删除的 token（没有则返回 nil）
+_DELETE_BY_ACCOUNT_LUA = """
+local old = redis.call('GET', KEYS[1])
+if not old then
+    return false
+end
+redis.call('DEL', ARGV[1] .. old, KEYS[1])
+return old
+"""
 
+# 刷新 Token 及用户 token 映射的过期时间
+# KEYS[1]: token key
+# ARGV[1]: 过期秒数, ARGV[2]: 用户 token 映射前缀
+# 另刷新未声明的用户 token 映射 key（ARGV[2] .. 账号ID）
+# 返回 1 成功，0 token 不存在
+_REFRESH_LUA = """
+local data = redis.call('GET', KEYS[1])
+if not data then
+    return 0
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+local ok, decoded = pcall(cjson.decode, data)
+if ok and type(decoded) == 'table' and decoded['account_id'] then
+    redis.call('EXPIRE', ARGV[2] .. tostring(decoded['account_id']), ARGV[1])
+end
+return 1
+"""
+
+# 吊销单个签名 Token，同时清理已过期的吊销记录（保持吊销列表很小）
+# KEYS[1]: 账号吊销状态 key
+# ARGV[1]: token 编号 jti, ARGV[2]: token 过期时间戳, ARGV[3]: 当前时间戳
+_REVOKE_LUA = """
+local fields = redis.call('HGETALL', KEYS[1])
+for i = 1, #fields, 2 do
+    if fields[i] ~= 'epoch' and tonumber(fields[i + 1]) <= tonumber(ARGV[3]) then
+        redis.call('HDEL', KEYS[1], fields[i])
+    end
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+return 1
+"""
 
 
+def _b64encode(raw: bytes) -> str:
+    """URL 安全的 base64 编码（去掉填充）"""
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
 
 
+def _b64decode(text: str) -> bytes:
+    """URL 安全的 base64 解码（补齐填充）"""
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
 
 class TokenManager:
     """
@@ -32,12 +146,47 @@ class TokenManager:
         
         # 刷新 token 过期时间
         TokenManager.refresh(token)
+
+        # 查看进程内缓存命中情况
+        TokenManager.cache_stats()
+
+        # async def 接口中使用异步版本
+        data = await TokenManager.averify(token)
+
+    签名 Token:
+        TOKEN_MODE=signed 或 generate(..., stateless=True) 时生成 "载荷.签名" 格式的 Token，
+        verify 本地校验签名和过期时间，再对照账号的会话纪元（delete_by_account / 单点登录时递增）
+        和吊销列表（delete 时写入）判断是否已注销；验证时吊销状态按账号在进程内缓存，
+        签发时直接读取 Redis 中的会话纪元
     """
     
     # Token 前缀
     TOKEN_PREFIX = "token:"
     # 用户 Token 映射前缀（用于踢出旧登录）
     USER_TOKEN_PREFIX = "user_token:"
+    # 签名 Token 吊销状态前缀（hash: epoch -> 会话纪元, jti -> 过期时间）
+    REVOKE_PREFIX = "token_revoke:"
+
+    # 进程内 Token 缓存: token -> 用户数据
+    # 本进程内删除会立即失效；其他进程删除的 Token 最多在 TOKEN_CACHE_TTL_SECONDS 内仍可命中
+    _cache = TTLCache(max_entries=TOKEN_CACHE_MAX_ENTRIES, ttl_seconds=TOKEN_CACHE_TTL_SECONDS)
+
+    # Lua 脚本（EVALSHA 调用，脚本未加载时自动回退 EVAL）
+    _generate_script = redis_client.register_script(_GENERATE_LUA)
+    _delete_script = redis_client.register_script(_DELETE_LUA)
+    _delete_by_account_script = redis_client.register_script(_DELETE_BY_ACCOUNT_LUA)
+    _refresh_script = redis_client.register_script(_REFRESH_LUA)
+    _revoke_script = redis_client.register_script(_REVOKE_LUA)
+
+    # 异步客户端上注册的同一组脚本
+    _agenerate_script = async_redis_client.register_script(_GENERATE_LUA)
+    _adelete_script = async_redis_client.register_script(_DELETE_LUA)
+    _adelete_by_account_script = async_redis_client.register_script(_DELETE_BY_ACCOUNT_LUA)
+    _arefresh_script = async_redis_client.register_script(_REFRESH_LUA)
+    _arevoke_script = async_redis_client.register_script(_REVOKE_LUA)
+
+    # 签名 Token 吊销状态的进程内缓存: account_id -> {"epoch": int, "revoked": {jti: 过期时间}}
+    _revocation_cache = TTLCache(max_entries=TOKEN_CACHE_MAX_ENTRIES, ttl_seconds=TOKEN_REVOCATION_CACHE_TTL_SECONDS)
     
     @classmethod
     def _get_token_key(cls, token: str) -> str:
@@ -48,6 +197,144 @@ class TokenManager:
     def _get_user_token_key(cls, account_id: int) -> str:
         """获取用户 Token 映射的 key"""
         return f"{cls.USER_TOKEN_PREFIX}{account_id}"
+
+    @classmethod
+    def _get_revoke_key(cls, account_id: int) -> str:
+        """获取签名 Token 吊销状态的 key"""
+        return f"{cls.REVOKE_PREFIX}{account_id}"
+
+    @staticmethod
+    def _is_signed(token: str) -> bool:
+        """是否为签名 Token（随机 Token 为 32 位十六进制，不含 "."）"""
+        return "." in token
+
+    @staticmethod
+    def _sign(payload: str) -> str:
+        """计算载荷的 HMAC-SHA256 签名"""
+        if not TOKEN_SECRET_KEY:
+            raise RuntimeError("签名 Token 需要配置 TOKEN_SECRET_KEY")
+        digest = hmac.new(TOKEN_SECRET_KEY.encode("utf-8"), payload.encode("ascii"), hashlib.sha256).digest()
+        return _b64encode(digest)
+
+    @classmethod
+    def _decode_signed(cls, token: str) -> Optional[dict]:
+        """
+        校验签名 Token 的签名和过期时间（不访问 Redis）
+
+        :param token: token 字符串
+        :return: 载荷 {"d": 用户数据, "e": 过期时间, "j": token编号, "v": 会话纪元}，无效则返回 None
+        """
+        if not TOKEN_SECRET_KEY:
+            return None
+
+        payload, _, signature = token.partition(".")
+        if not payload or not signature:
+            return None
+        try:
+            if not hmac.compare_digest(cls._sign(payload), signature):
+                return None
+            claims = json.loads(_b64decode(payload))
+        except ValueError:
+            return None
+        if not isinstance(claims, dict) or claims.get("e", 0) <= int(time.time()):
+            return None
+        return claims
+
+    @staticmethod
+    def _parse_revocation(raw: dict) -> dict:
+        """解析 Redis 中的吊销状态 hash"""
+        raw = dict(raw or {})
+        epoch = int(raw.pop("epoch", 0))
+        return {"epoch": epoch, "revoked": {jti: int(expire_at) for jti, expire_at in raw.items()}}
+
+    @classmethod
+    def _get_revocation(cls, account_id: int) -> dict:
+        """
+        获取账号的吊销状态（验证时使用，优先读取进程内缓存）
+
+        :param account_id: 账号ID
+        :return: {"epoch": 会话纪元, "revoked": {jti: 过期时间}}
+        """
+        state = cls._revocation_cache.get(account_id)
+        if state is None:
+            state = cls._load_revocation(account_id)
+        return state
+
+    @classmethod
+    def _load_revocation(cls, account_id: int) -> dict:
+        """
+        从 Redis 读取账号的吊销状态并重置进程内缓存
+        签发 Token 时使用，避免其他进程刚递增纪元后仍按缓存中的旧纪元签发（签发后不久即被判为已注销）
+
+        :param account_id: 账号ID
+        :return: {"epoch": 会话纪元, "revoked": {jti: 过期时间}}
+        """
+        state = cls._parse_revocation(redis_client.hgetall(cls._get_revoke_key(account_id)))
+        cls._revocation_cache.set(account_id, state)
+        return state
+
+    @staticmethod
+    def _is_revoked(claims: dict, state: dict) -> bool:
+        """签名 Token 是否已被注销（纪元落后或在吊销列表中）"""
+        return claims.get("v", 0) < state["epoch"] or claims.get("j") in state["revoked"]
+
+    @classmethod
+    def _generate_signed(cls, data: dict, expire_seconds: int, single_login: bool) -> str:
+        """
+        生成签名 Token
+
+        :param data: 用户数据（含 account_id）
+        :param expire_seconds: 过期时间（秒）
+        :param single_login: 是否单点登录（递增会话纪元，使该账号已有 Token 全部失效）
+        :return: token 字符串
+        """
+        account_id = data["account_id"]
+        if single_login:
+            _, epoch = cls._revoke_account(account_id)
+        else:
+            epoch = cls._load_revocation(account_id)["epoch"]
+        return cls._encode_signed(data, expire_seconds, epoch)
+
+    @classmethod
+    def _encode_signed(cls, data: dict, expire_seconds: int, epoch: int) -> str:
+        """
+        编码并签名 Token 载荷
+
+        :param data: 用户数据（含 account_id）
+        :param expire_seconds: 过期时间（秒）
+        :param epoch: 账号当前会话纪元
+        :return: token 字符串
+        """
+        claims = {
+            "d": data,
+            "e": int(time.time()) + expire_seconds,
+            "j": uuid.uuid4().hex[:16],
+            "v": epoch
+        }
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+        return f"{payload}.{cls._sign(payload)}"
+
+    @classmethod
+    def _revoke_account(cls, account_id: int) -> tuple:
+        """
+        注销账号的全部登录（随机 Token 与签名 Token，一次往返）
+
+        :param account_id: 账号ID
+        :return: (被删除的旧随机 Token, 新的会话纪元)
+        """
+        pipe = redis_client.pipeline(transaction=False)
+        cls._delete_by_account_script(
+            keys=[cls._get_user_token_key(account_id)],
+            args=[cls.TOKEN_PREFIX],
+            client=pipe
+        )
+        pipe.hincrby(cls._get_revoke_key(account_id), "epoch", 1)
+        old_token, epoch = pipe.execute()
+
+        cls._revocation_cache.delete(account_id)
+        if old_token:
+            cls._cache.delete(old_token)
+        return old_token, int(epoch)
     
     @classmethod
     def generate(
@@ -56,7 +343,8 @@ class TokenManager:
         account_type: int = 1,
         extra_data: Optional[dict] = None,
         expire_seconds: int = None,
-        single_login: bool = False
+        single_login: bool = False,
+        stateless: bool = None
     ) -> str:
         """
         生成 Token
@@ -66,17 +354,13 @@ class TokenManager:
         :param extra_data: 额外数据
         :param expire_seconds: 过期时间（秒），默认使用配置
         :param single_login: 是否单点登录（踢出旧登录）
+        :param stateless: 是否生成签名 Token，默认按 TOKEN_MODE 配置
         :return: token 字符串
         """
         if expire_seconds is None:
             expire_seconds = TOKEN_EXPIRE_SECONDS
-        
-        # 单点登录：删除该用户的旧 token
-        if single_login:
-            cls.delete_by_account(account_id)
-        
-        # 生成新 token
-        token = uuid.uuid4().hex
+        if stateless is None:
+            stateless = TOKEN_MODE == "signed"
         
         # 存储数据
         data = {
@@ -84,15 +368,23 @@ class TokenManager:
             "account_type": account_type,
             **(extra_data or {})
         }
+
+        if stateless:
+            return cls._generate_signed(data, expire_seconds, single_login)
+        
+        # 生成新 token
+        token = uuid.uuid4().hex
         
         token_key = cls._get_token_key(token)
         user_token_key = cls._get_user_token_key(account_id)
         
-        # 存储 token -> 用户数据
-        redis_client.setex(token_key, expire_seconds, json.dumps(data))
-        
-        # 存储 用户ID -> token（用于单点登录）
-        redis_client.setex(user_token_key, expire_seconds, token)
+        # 一次往返：单点登录时删除旧 token，存储 token -> 用户数据、用户ID -> token
+        old_token = cls._generate_script(
+            keys=[token_key, user_token_key],
+            args=[json.dumps(data), expire_seconds, 1 if single_login else 0, token, cls.TOKEN_PREFIX]
+        )
+        if old_token:
+            cls._cache.delete(old_token)
         
         return token
     
@@ -106,12 +398,26 @@ class TokenManager:
         """
         if not token:
             return None
+
+        # 签名 Token：本地校验签名和过期时间，再检查吊销状态
+        if cls._is_signed(token):
+            claims = cls._decode_signed(token)
+            if not claims or cls._is_revoked(claims, cls._get_revocation(claims["d"]["account_id"])):
+                return None
+            return dict(claims["d"])
+
+        # 先查进程内缓存
+        cached = cls._cache.get(token)
+        if cached is not None:
+            return dict(cached)
         
         token_key = cls._get_token_key(token)
         data = redis_client.get(token_key)
         
         if data:
-            return json.loads(data)
+            user_data = json.loads(data)
+            cls._cache.set(token, user_data)
+            return dict(user_data)
         return None
     
     @classmethod
@@ -124,41 +430,45 @@ class TokenManager:
         """
         if not token:
             return False
-        
-        # 先获取用户数据，以便删除用户 token 映射
-        data = cls.verify(token)
-        if data:
-            account_id = data.get("account_id")
-            if account_id:
-                user_token_key = cls._get_user_token_key(account_id)
-                redis_client.delete(user_token_key)
-        
+
+        # 签名 Token：写入账号吊销列表
+        if cls._is_signed(token):
+            claims = cls._decode_signed(token)
+            if not claims:
+                return False
+            account_id = claims["d"]["account_id"]
+            cls._revoke_script(
+                keys=[cls._get_revoke_key(account_id)],
+                args=[claims["j"], claims["e"], int(time.time())]
+            )
+            cls._revocation_cache.delete(account_id)
+            return True
+
+        cls._cache.delete(token)
         token_key = cls._get_token_key(token)
-        return redis_client.delete(token_key) > 0
+        deleted = cls._delete_script(keys=[token_key], args=[cls.USER_TOKEN_PREFIX, token])
+        return int(deleted) > 0
     
     @classmethod
     def delete_by_account(cls, account_id: int) -> bool:
         """
         根据账号ID删除 Token（用于踢出登录）
         
+        同时递增会话纪元，使该账号已签发的签名 Token 全部失效
+        
         :param account_id: 账号ID
-        :return: 是否删除成功
+        :return: 是否删除了 Redis 中的 Token
         """
-        user_token_key = cls._get_user_token_key(account_id)
-        old_token = redis_client.get(user_token_key)
-        
-        if old_token:
-            token_key = cls._get_token_key(old_token)
-            redis_client.delete(token_key)
-            redis_client.delete(user_token_key)
-            return True
-        return False
+        old_token, _ = cls._revoke_account(account_id)
+        return bool(old_token)
     
     @classmethod
     def refresh(cls, token: str, expire_seconds: int = None) -> bool:
         """
         刷新 Token 过期时间
         
+        签名 Token 的过期时间写在 Token 内无法延长，仅返回 Token 是否仍然有效
+        
         :param token: token 字符串
         :param expire_seconds: 新的过期时间（秒）
         :return: 是否刷新成功
@@ -169,24 +479,14 @@ class TokenManager:
         if expire_seconds is None:
             expire_seconds = TOKEN_EXPIRE_SECONDS
         
-        token_key = cls._get_token_key(token)
-        
-        # 检查 token 是否存在
-        if not redis_client.exists(token_key):
-            return False
+        if cls._is_signed(token):
+            return cls.verify(token) is not None
         
-        # 刷新过期时间
-        redis_client.expire(token_key, expire_seconds)
-        
-        # 同时刷新用户 token 映射的过期时间
-        data = cls.verify(token)
-        if data:
-            account_id = data.get("account_id")
-            if account_id:
-                user_token_key = cls._get_user_token_key(account_id)
-                redis_client.expire(user_token_key, expire_seconds)
+        token_key = cls._get_token_key(token)
         
-        return True
+        # 检查 token 是否存在，并同时刷新 token 与用户 token 映射的过期时间
+        refreshed = cls._refresh_script(keys=[token_key], args=[expire_seconds, cls.USER_TOKEN_PREFIX])
+        return int(refreshed) == 1
     
     @classmethod
     def get_account_id(cls, token: str) -> Optional[int]:
@@ -213,3 +513,172 @@ class TokenManager:
         if data:
             return data.get("account_type")
         return None
+
+    @classmethod
+    def cache_stats(cls) -> dict:
+        """
+        获取进程内 Token 缓存统计（命中/未命中次数、当前条目数等）
+
+        :return: 统计信息字典
+        """
+        return cls._cache.stats()
+
+    # ---------- 异步版本（redis.asyncio），逻辑与同步版本一致 ----------
+
+    @classmethod
+    async def _aget_revocation(cls, account_id: int) -> dict:
+        """获取账号的吊销状态（异步）"""
+        state = cls._revocation_cache.get(account_id)
+        if state is None:
+            state = await cls._aload_revocation(account_id)
+        return state
+
+    @classmethod
+    async def _aload_revocation(cls, account_id: int) -> dict:
+        """从 Redis 读取账号的吊销状态并重置进程内缓存（异步，签发 Token 时使用）"""
+        state = cls._parse_revocation(await async_redis_client.hgetall(cls._get_revoke_key(account_id)))
+        cls._revocation_cache.set(account_id, state)
+        return state
+
+    @classmethod
+    async def _arevoke_account(cls, account_id: int) -> tuple:
+        """注销账号的全部登录（异步）"""
+        pipe = async_redis_client.pipeline(transaction=False)
+        await cls._adelete_by_account_script(
+            keys=[cls._get_user_token_key(account_id)],
+            args=[cls.TOKEN_PREFIX],
+            client=pipe
+        )
+        pipe.hincrby(cls._get_revoke_key(account_id), "epoch", 1)
+        old_token, epoch = await pipe.execute()
+
+        cls._revocation_cache.delete(account_id)
+        if old_token:
+            cls._cache.delete(old_token)
+        return old_token, int(epoch)
+
+    @classmethod
+    async def agenerate(
+        cls,
+        account_id: int,
+        account_type: int = 1,
+        extra_data: Optional[dict] = None,
+        expire_seconds: int = None,
+        single_login: bool = False,
+        stateless: bool = None
+    ) -> str:
+        """生成 Token（异步），参数同 generate"""
+        if expire_seconds is None:
+            expire_seconds = TOKEN_EXPIRE_SECONDS
+        if stateless is None:
+            stateless = TOKEN_MODE == "signed"
+
+        data = {
+            "account_id": account_id,
+            "account_type": account_type,
+            **(extra_data or {})
+        }
+
+        if stateless:
+            if single_login:
+                _, epoch = await cls._arevoke_account(account_id)
+            else:
+                epoch = (await cls._aload_revocation(account_id))["epoch"]
+            return cls._encode_signed(data, expire_seconds, epoch)
+
+        token = uuid.uuid4().hex
+        old_token = await cls._agenerate_script(
+            keys=[cls._get_token_key(token), cls._get_user_token_key(account_id)],
+            args=[json.dumps(data), expire_seconds, 1 if single_login else 0, token, cls.TOKEN_PREFIX]
+        )
+        if old_token:
+            cls._cache.delete(old_token)
+        return token
+
+    @classmethod
+    async def averify(cls, token: str) -> Optional[dict]:
+        """验证 Token（异步），返回用户数据字典，无效则返回 None"""
+        if not token:
+            return None
+
+        if cls._is_signed(token):
+            claims = cls._decode_signed(token)
+            if not claims:
+                return None
+            state = await cls._aget_revocation(claims["d"]["account_id"])
+            if cls._is_revoked(claims, state):
+                return None
+            return dict(claims["d"])
+
+        cached = cls._cache.get(token)
+        if cached is not None:
+            return dict(cached)
+
+        data = await async_redis_client.get(cls._get_token_key(token))
+        if data:
+            user_data = json.loads(data)
+            cls._cache.set(token, user_data)
+            return dict(user_data)
+        return None
+
+    @classmethod
+    async def adelete(cls, token: str) -> bool:
+        """删除 Token（异步）"""
+        if not token:
+            return False
+
+        if cls._is_signed(token):
+            claims = cls._decode_signed(token)
+            if not claims:
+                return False
+            account_id = claims["d"]["account_id"]
+            await cls._arevoke_script(
+                keys=[cls._get_revoke_key(account_id)],
+                args=[claims["j"], claims["e"], int(time.time())]
+            )
+            cls._revocation_cache.delete(account_id)
+            return True
+
+        cls._cache.delete(token)
+        deleted = await cls._adelete_script(keys=[cls._get_token_key(token)], args=[cls.USER_TOKEN_PREFIX, token])
+        return int(deleted) > 0
+
+    @classmethod
+    async def adelete_by_account(cls, account_id: int) -> bool:
+        """根据账号ID删除 Token（异步）"""
+        old_token, _ = await cls._arevoke_account(account_id)
+        return bool(old_token)
+
+    @classmethod
+    async def arefresh(cls, token: str, expire_seconds: int = None) -> bool:
+        """刷新 Token 过期时间（异步）"""
+        if not token:
+            return False
+
+        if expire_seconds is None:
+            expire_seconds = TOKEN_EXPIRE_SECONDS
+
+        if cls._is_signed(token):
+            return await cls.averify(token) is not None
+
+        refreshed = await cls._arefresh_script(
+            keys=[cls._get_token_key(token)],
+            args=[expire_seconds, cls.USER_TOKEN_PREFIX]
+        )
+        return int(refreshed) == 1
+
+    @classmethod
+    async def aget_account_id(cls, token: str) -> Optional[int]:
+        """从 Token 获取账号ID（异步）"""
+        data = await cls.averify(token)
+        if data:
+            return data.get("account_id")
+        return None
+
+    @classmethod
+    async def aget_account_type(cls, token: str) -> Optional[int]:
+        """从 Token 获取账号类型（异步）"""
+        data = await cls.averify(token)
+        if data:
+            return data.get("account_type")
+        return None
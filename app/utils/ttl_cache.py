@@ -0,0 +1,138 @@
+"""
+进程内 LRU 缓存
+有界、带过期时间、线程安全，用于在 Redis / 数据库前加一层本地缓存
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    有界 LRU 缓存，每个条目带最大存活时间
+
+    使用方法:
+        cache = TTLCache(max_entries=10000, ttl_seconds=5)
+        cache.set("key", {"a": 1})
+        value = cache.get("key")  # 未命中或已过期返回 None
+        cache.delete("key")
+        cache.stats()             # 命中/未命中计数，用于评估容量
+
+    注意: 不缓存 None，get 返回 None 即视为未命中
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 5):
+        """
+        :param max_entries: 最大条目数，超出时淘汰最久未使用的条目，<=0 表示禁用
+        :param ttl_seconds: 条目最大存活时间（秒），<=0 表示禁用
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """缓存是否启用"""
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        读取缓存
+
+        :param key: 缓存键
+        :return: 缓存值，未命中或已过期返回 None
+        """
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expire_at, value = entry
+            if expire_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float = None) -> None:
+        """
+        写入缓存
+
+        :param key: 缓存键
+        :param value: 缓存值（None 不会被缓存）
+        :param ttl_seconds: 本条目的存活时间，默认使用 ttl_seconds，且不会超过它
+        """
+        if not self.enabled or value is None:
+            return
+
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+
+        expire_at = time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (expire_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        删除缓存条目
+
+        :param key: 缓存键
+        :return: 条目是否存在
+        """
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """
+        删除所有满足条件的条目（需遍历全部条目，只用于低频的失效操作）
+
+        :param predicate: 判断函数 (key, value) -> bool
+        :return: 删除的条目数
+        """
+        with self._lock:
+            keys = [k for k, (_, v) in self._data.items() if predicate(k, v)]
+            for k in keys:
+                del self._data[k]
+            return len(keys)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """
+        获取缓存统计信息
+
+        :return: {"size", "max_entries", "ttl_seconds", "hits", "misses", "evictions", "hit_rate"}
+        """
+        with self._lock:
+            size = len(self._data)
+        total = self.hits + self.misses
+        return {
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
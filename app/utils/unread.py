@@ -0,0 +1,176 @@
+"""
+案件交流未读数与已读位置
+新消息提交后为案件其他绑定人员的未读数加一（一次往返），案件列表按页一次 HMGET 读取，不按案件统计消息
+
+键结构:
+    unread:{account_id}       hash，案件ID -> 未读消息数（为 0 时删除字段）
+    read_mark:{account_id}    hash，案件ID -> 已读到的消息ID（只增不减）
+
+读写失败时只打印日志，未读数显示为 0，不影响接口
+"""
+from typing import Dict, Iterable, List
+
+from redis import RedisError
+
+from app.core.redis import redis_client, async_redis_client
+
+
+# 标记已读（已读位置只前进，未读数改为该位置之后的消息数）
+# KEYS[1]: 未读数 key, KEYS[2]: 已读位置 key
+# ARGV[1]: 案件ID, ARGV[2]: 已读到的消息ID, ARGV[3]: 该消息之后的消息数
+# 返回是否更新（已读位置比当前靠前时不更新）
+_MARK_READ_LUA = """
+local current = tonumber(redis.call('HGET', KEYS[2], ARGV[1]) or '0')
+if tonumber(ARGV[2]) < current then
+    return 0
+end
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+if tonumber(ARGV[3]) > 0 then
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[3])
+else
+    redis.call('HDEL', KEYS[1], ARGV[1])
+end
+return 1
+"""
+
+
+class UnreadCounter:
+    """
+    案件交流未读数管理
+
+    使用方法:
+        UnreadCounter.incr(case_id, recipient_ids)              # 新消息提交后（不含发送人）
+        UnreadCounter.counts(account_id, case_ids)              # {case_id: 未读数}
+        UnreadCounter.mark_read(account_id, case_id, last_id, remaining)
+        UnreadCounter.clear(case_id, account_ids)               # 解绑/删除案件后
+
+    所有方法均有 a 前缀的异步版本（clear 除外）
+    """
+
+    UNREAD_PREFIX = "unread:"
+    MARK_PREFIX = "read_mark:"
+
+    _mark_read_script = redis_client.register_script(_MARK_READ_LUA)
+    _amark_read_script = async_redis_client.register_script(_MARK_READ_LUA)
+
+    @classmethod
+    def _keys(cls, account_id: int) -> list:
+        return [f"{cls.UNREAD_PREFIX}{account_id}", f"{cls.MARK_PREFIX}{account_id}"]
+
+    @staticmethod
+    def _parse_counts(case_ids: List[int], values: list) -> Dict[int, int]:
+        return {case_id: int(value) for case_id, value in zip(case_ids, values) if value}
+
+    @classmethod
+    def incr(cls, case_id: int, account_ids: Iterable[int]) -> None:
+        """
+        新消息：接收人的未读数加一
+
+        :param case_id: 案件ID
+        :param account_ids: 接收人（案件绑定人员，不含发送人）
+        """
+        account_ids = set(account_ids)
+        if not account_ids:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for account_id in account_ids:
+                pipe.hincrby(f"{cls.UNREAD_PREFIX}{account_id}", case_id, 1)
+            pipe.execute()
+        except RedisError as e:
+            print(f"未读数更新失败: {e}")
+
+    @classmethod
+    def counts(cls, account_id: int, case_ids: List[int]) -> Dict[int, int]:
+        """
+        用户在各案件的未读数（一次 HMGET）
+
+        :param account_id: 当前用户ID
+        :param case_ids: 案件ID
+        :return: {案件ID: 未读数}，没有未读的案件不在结果中
+        """
+        if not case_ids:
+            return {}
+        try:
+            values = redis_client.hmget(f"{cls.UNREAD_PREFIX}{account_id}", case_ids)
+        except RedisError as e:
+            print(f"未读数读取失败: {e}")
+            return {}
+        return cls._parse_counts(case_ids, values)
+
+    @classmethod
+    def mark_read(cls, account_id: int, case_id: int, last_id: int, remaining: int) -> bool:
+        """
+        标记已读
+
+        :param account_id: 当前用户ID
+        :param case_id: 案件ID
+        :param last_id: 已读到的消息ID
+        :param remaining: 该消息之后的消息数（仍未读）
+        :return: 是否更新（已读位置比当前靠前时不更新）
+        """
+        return bool(cls._mark_read_script(keys=cls._keys(account_id), args=[case_id, last_id, remaining]))
+
+    @classmethod
+    def read_mark(cls, account_id: int, case_id: int) -> int:
+        """已读到的消息ID，未读过为 0"""
+        return int(redis_client.hget(f"{cls.MARK_PREFIX}{account_id}", case_id) or 0)
+
+    @classmethod
+    def clear(cls, case_id: int, account_ids: Iterable[int]) -> None:
+        """
+        清除用户在案件的未读数与已读位置（解绑或案件删除后）
+
+        :param case_id: 案件ID
+        :param account_ids: 用户ID
+        """
+        account_ids = set(account_ids)
+        if not account_ids:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for account_id in account_ids:
+                unread_key, mark_key = cls._keys(account_id)
+                pipe.hdel(unread_key, case_id)
+                pipe.hdel(mark_key, case_id)
+            pipe.execute()
+        except RedisError as e:
+            print(f"未读数清除失败: {e}")
+
+    # ==================== 异步版本 ====================
+
+    @classmethod
+    async def aincr(cls, case_id: int, account_ids: Iterable[int]) -> None:
+        """新消息：接收人的未读数加一（异步）"""
+        account_ids = set(account_ids)
+        if not account_ids:
+            return
+        try:
+            pipe = async_redis_client.pipeline(transaction=False)
+            for account_id in account_ids:
+                pipe.hincrby(f"{cls.UNREAD_PREFIX}{account_id}", case_id, 1)
+            await pipe.execute()
+        except RedisError as e:
+            print(f"未读数更新失败: {e}")
+
+    @classmethod
+    async def acounts(cls, account_id: int, case_ids: List[int]) -> Dict[int, int]:
+        """用户在各案件的未读数（异步）"""
+        if not case_ids:
+            return {}
+        try:
+            values = await async_redis_client.hmget(f"{cls.UNREAD_PREFIX}{account_id}", case_ids)
+        except RedisError as e:
+            print(f"未读数读取失败: {e}")
+            return {}
+        return cls._parse_counts(case_ids, values)
+
+    @classmethod
+    async def amark_read(cls, account_id: int, case_id: int, last_id: int, remaining: int) -> bool:
+        """标记已读（异步）"""
+        return bool(await cls._amark_read_script(keys=cls._keys(account_id), args=[case_id, last_id, remaining]))
+
+    @classmethod
+    async def aread_mark(cls, account_id: int, case_id: int) -> int:
+        """已读到的消息ID（异步）"""
+        return int(await async_redis_client.hget(f"{cls.MARK_PREFIX}{account_id}", case_id) or 0)
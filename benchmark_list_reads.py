@@ -0,0 +1,139 @@
+"""
+列表接口读取方式对比
+对 case_list、get_account_list、case_communication 的查询，分别按 ORM 对象读取（select(模型)）与按列读取（Core）
+（接口实际使用的查询，结果为行元组）并组装返回数据，输出每轮耗时、每行耗时与单轮内存峰值
+运行: python benchmark_list_reads.py [轮数]  （默认 200 轮，使用当前配置的数据库）
+"""
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import select, func, desc
+
+from app.core.database import SessionLocal
+from app.models import Account, AccountCase, Case, CaseCommunication
+from app.api.endpoints.account import (
+    build_account_list_query,
+    format_account_list,
+    GetAccountListRequest,
+    MAX_PAGE_SIZE
+)
+from app.api.endpoints.case import build_case_list_page_query, format_case_list_page, CaseListRequest
+from app.api.endpoints.communication import build_case_communication_query, format_case_communication
+
+# 默认轮数
+DEFAULT_ROUNDS = 200
+
+
+def pick_samples(db) -> tuple:
+    """
+    选取绑定案件最多的账号、消息最多的案件作为样本
+
+    :return: (账号ID, 案件ID)
+    """
+    account_id = db.scalar(
+        select(AccountCase.account_id).group_by(AccountCase.account_id)
+        .order_by(desc(func.count())).limit(1)
+    )
+    case_id = db.scalar(
+        select(CaseCommunication.case_id).group_by(CaseCommunication.case_id)
+        .order_by(desc(func.count())).limit(1)
+    )
+    return account_id or 0, case_id or 0
+
+
+def build_cases(account_id: int, case_id: int) -> list:
+    """
+    对比项
+
+    :return: [(名称, 按列查询, ORM 模型, 组装函数(rows) -> 返回数据)]
+    """
+    case_request = CaseListRequest(sort_method=0, sort=1)
+    # 移动端列表只需标题、进度与更新时间
+    sparse_request = CaseListRequest(sort_method=0, sort=1, fields=["title", "progress", "update_timestamp_string"])
+    account_request = GetAccountListRequest(type_array=[0, 1, 2, 3], page_size=MAX_PAGE_SIZE)
+    return [
+        (
+            "case_list",
+            build_case_list_page_query(account_id, case_request),
+            Case,
+            lambda rows: format_case_list_page(rows, case_request)
+        ),
+        (
+            "case_list fields",
+            build_case_list_page_query(account_id, sparse_request),
+            Case,
+            lambda rows: format_case_list_page(rows, sparse_request)
+        ),
+        (
+            "get_account_list",
+            build_account_list_query(account_request),
+            Account,
+            lambda rows: format_account_list(rows, MAX_PAGE_SIZE)
+        ),
+        (
+            "case_communication",
+            build_case_communication_query(case_id),
+            CaseCommunication,
+            # 发送人姓名与读取方式无关，不参与对比
+            lambda rows: format_case_communication([(row, "") for row in rows], account_id)
+        ),
+    ]
+
+
+def run_round(query, entity, formatter) -> int:
+    """
+    执行一轮（新会话，与接口每次请求一致）
+
+    :param query: 按列查询
+    :param entity: 不为 None 时改为读取该模型的 ORM 对象
+    :param formatter: 组装函数
+    :return: 行数
+    """
+    with SessionLocal() as db:
+        if entity is None:
+            rows = db.execute(query).all()
+        else:
+            rows = db.scalars(query.with_only_columns(entity)).all()
+        formatter(rows)
+        return len(rows)
+
+
+def measure(query, entity, formatter, rounds: int) -> tuple:
+    """
+    :return: (行数, 每轮毫秒, 每行微秒, 单轮内存峰值 KB)
+    """
+    # 预热（建立连接、编译语句缓存）
+    row_count = run_round(query, entity, formatter)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        run_round(query, entity, formatter)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    run_round(query, entity, formatter)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_round_ms = elapsed / rounds * 1000
+    per_row_us = elapsed / rounds / row_count * 1000000 if row_count else 0
+    return row_count, per_round_ms, per_row_us, peak / 1024
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROUNDS
+    with SessionLocal() as db:
+        account_id, case_id = pick_samples(db)
+    print(f"样本: account_id={account_id} case_id={case_id}，每项 {rounds} 轮")
+    print("-" * 72)
+    print(f"{'查询':<22}{'读取方式':<8}{'行数':>6}{'每轮ms':>10}{'每行us':>10}{'内存峰值KB':>12}")
+    for name, query, entity, formatter in build_cases(account_id, case_id):
+        for label, mode in (("ORM", entity), ("Core", None)):
+            row_count, per_round_ms, per_row_us, peak_kb = measure(query, mode, formatter, rounds)
+            print(f"{name:<22}{label:<8}{row_count:>6}{per_round_ms:>10.3f}{per_row_us:>10.2f}{peak_kb:>12.1f}")
+    print("-" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+热点查询执行计划检查
+对各接口的热点查询执行 EXPLAIN，确认每张表的访问都能使用索引（不出现无索引可用的全表扫描）
+运行: python check_query_plans.py  （任一查询不通过时退出码为 1）
+"""
+import re
+import sys
+import time
+
+from sqlalchemy import select, text
+
+from app.core.database import engine
+from app.models import Account, AccountCase
+from app.api.endpoints.auth import build_mark_code_used_query
+from app.api.endpoints.account import build_account_list_query, GetAccountListRequest
+from app.api.endpoints.case import (
+    build_case_list_page_query,
+    build_case_bindings_query,
+    CaseListRequest
+)
+from app.api.endpoints.communication import (
+    build_case_communication_query,
+    build_case_communication_page_query,
+    build_latest_message_id_query,
+    build_messages_after_count_query,
+    CaseCommunicationRequest
+)
+from app.api.endpoints.notice import build_notice_list_query, NoticeListRequest
+from app.search.communication_index import build_candidate_query
+
+# 示例参数（执行计划与具体值无关）
+SAMPLE_ACCOUNT_ID = 1
+SAMPLE_CASE_ID = 1
+SAMPLE_MOBILE = "13800000000"
+
+
+def hot_queries() -> list:
+    """
+    各接口的热点查询
+
+    :return: [(名称, 查询语句), ...]
+    """
+    now = int(time.time())
+    queries = [
+        ("login 验证码使用记录", build_mark_code_used_query(SAMPLE_MOBILE, "123456")),
+        ("login 按手机号查账号", select(Account).where(Account.mobile == SAMPLE_MOBILE).limit(1)),
+        ("get_account_list", build_account_list_query(GetAccountListRequest(type_array=[1, 2]))),
+        ("get_account_list 游标", build_account_list_query(GetAccountListRequest(type_array=[1, 2], after_account_id=100))),
+        ("case_details 绑定人员", build_case_bindings_query(SAMPLE_CASE_ID)),
+        ("case_communication", build_case_communication_query(SAMPLE_CASE_ID)),
+        ("case_communication 分页", build_case_communication_page_query(
+            CaseCommunicationRequest(case_id=SAMPLE_CASE_ID, limit=20, before_id=100)
+        )),
+        ("case_communication 增量", build_case_communication_page_query(
+            CaseCommunicationRequest(case_id=SAMPLE_CASE_ID, after_id=100)
+        )),
+        ("mark_read 最新消息", build_latest_message_id_query(SAMPLE_CASE_ID)),
+        ("mark_read 未读数", build_messages_after_count_query(SAMPLE_CASE_ID, 100, SAMPLE_ACCOUNT_ID)),
+        ("case_communication_message 绑定关系", select(AccountCase).where(
+            AccountCase.case_id == SAMPLE_CASE_ID,
+            AccountCase.account_id == SAMPLE_ACCOUNT_ID
+        )),
+        ("notice_list", build_notice_list_query(SAMPLE_ACCOUNT_ID, NoticeListRequest(before_id=100))),
+        ("search_communication 候选", build_candidate_query(["合同"], [SAMPLE_CASE_ID], None, 40)),
+    ]
+    for sort_method in range(4):
+        request = CaseListRequest(sort_method=sort_method, sort=1, filter=1)
+        queries.append((f"case_list sort_method={sort_method}", build_case_list_page_query(SAMPLE_ACCOUNT_ID, request)))
+    return queries
+
+
+def explain_mysql(conn, sql: str) -> list:
+    """
+    MySQL 执行计划检查
+
+    :return: 问题列表，每张表的访问需有可用索引（type=ALL 且 possible_keys 为空视为问题）
+    """
+    problems = []
+    for row in conn.execute(text(f"EXPLAIN {sql}")).mappings():
+        table = row.get("table") or ""
+        if table.startswith("<"):
+            # 派生表 / 物化子查询
+            continue
+        if row.get("type") == "ALL" and not row.get("possible_keys"):
+            problems.append(f"{table}: 全表扫描且无可用索引")
+    return problems
+
+
+def explain_sqlite(conn, sql: str) -> list:
+    """
+    SQLite 执行计划检查
+
+    :return: 问题列表，出现不使用索引的 "SCAN 表名" 视为问题
+    """
+    problems = []
+    for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")):
+        detail = row[-1]
+        if re.match(r"^SCAN \S+$", detail):
+            problems.append(detail)
+    return problems
+
+
+def main() -> int:
+    dialect = engine.dialect.name
+    if dialect == "mysql":
+        explain = explain_mysql
+    elif dialect == "sqlite":
+        explain = explain_sqlite
+    else:
+        print(f"不支持的数据库: {dialect}")
+        return 1
+
+    failed = 0
+    with engine.connect() as conn:
+        for name, query in hot_queries():
+            sql = str(query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            problems = explain(conn, sql)
+            if problems:
+                failed += 1
+                print(f"[FAIL] {name}")
+                for problem in problems:
+                    print(f"       {problem}")
+            else:
+                print(f"[ OK ] {name}")
+
+    print("-" * 40)
+    print(f"共 {len(hot_queries())} 条查询，{failed} 条未使用索引")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,12 @@
 运行: python init_db.py
 """
 import pymysql
+from sqlalchemy import inspect
+from sqlalchemy.exc import SQLAlchemyError
+
 from app.core.config import DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME
 from app.core.database import engine, Base
-from app.models import Account, Sms, Case, AccountCase, CaseCommunication, NoticeLog
+from app.models import Account, Sms, Case, AccountCase, CaseCommunication, NoticeLog, CommunicationSearchToken
 
 
 def create_database():
@@ -36,6 +39,23 @@ def create_tables():
         print(f"  - {table}")
 
 
+def create_indexes():
+    """为已存在的表补建模型中声明的索引（新建的表已由 create_all 创建）"""
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            if index.name in existing:
+                continue
+            try:
+                index.create(bind=engine)
+                print(f"  + {table.name}.{index.name}")
+            except SQLAlchemyError as e:
+                # 如唯一索引与存量重复数据冲突，需先清理数据后重新执行
+                print(f"  ! {table.name}.{index.name} 创建失败: {e.__class__.__name__}: {e.orig if hasattr(e, 'orig') else e}")
+    print("索引检查完成")
+
+
 if __name__ == "__main__":
     print("开始初始化数据库...")
     print("-" * 40)
@@ -43,4 +63,6 @@ if __name__ == "__main__":
     print("-" * 40)
     create_tables()
     print("-" * 40)
+    create_indexes()
+    print("-" * 40)
     print("数据库初始化完成！")
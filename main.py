@@ -2,16 +2,29 @@
 FastAPI 应用入口
 运行: uvicorn main:app --reload
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.openapi.models import SecuritySchemeType
 from fastapi.security import HTTPBearer
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.api.router import api_router
+from app.core.json_response import FastJSONResponse
+from app.utils.case_hub import case_message_hub
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：关闭时停止案件消息订阅任务"""
+    yield
+    await case_message_hub.stop()
+
 
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     title="FastAPI 项目",
     description="FastAPI 应用",
     version="1.0.0",
@@ -64,7 +77,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         message = f"{field}: {msg}" if field else msg
     else:
         message = "参数错误"
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=200,
         content={"code": 422, "message": message, "data": None}
     )
@@ -74,7 +87,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """统一 HTTP 异常格式"""
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=200,
         content={"code": exc.status_code, "message": str(exc.detail), "data": None}
     )
@@ -0,0 +1,193 @@
+"""
+提醒通知 worker
+消费通知队列（notice_events），按案件绑定人员展开，每批事件一次查询绑定关系、一次批量写入 notice_log；
+并定时检查律师回复超时的案件，生成超时通知
+可同时运行多个进程，同一消费组内自动分摊；进程中途退出时未确认的事件由其他进程接管
+运行: python notice_worker.py [消费者名称]
+"""
+import os
+import signal
+import socket
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from redis import RedisError
+from sqlalchemy import select, insert, and_, or_
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import LAWYER_REPLY_OVERDUE_HOURS, NOTICE_OVERDUE_SCAN_SECONDS
+from app.core.database import SessionLocal
+from app.models import AccountCase, Case, NoticeLog
+from app.notice import NoticeQueue, lawyer_overdue_event
+
+# 每次读取的事件数
+BATCH_SIZE = 100
+# 队列为空时最长等待毫秒数
+BLOCK_MS = 1000
+# 未确认超过该毫秒数的事件由当前进程接管
+STALE_IDLE_MS = 60000
+# 律师回复超时检查每批案件数
+OVERDUE_BATCH_SIZE = 500
+
+running = True
+
+
+def stop(signum, frame):
+    """收到退出信号后处理完当前批次再退出"""
+    global running
+    running = False
+
+
+def load_recipients(db, case_ids: set) -> Dict[int, List[int]]:
+    """
+    案件绑定人员（一次 IN 查询）
+
+    :param db: 数据库会话
+    :param case_ids: 案件ID
+    :return: {案件ID: [账号ID]}
+    """
+    recipients = defaultdict(list)
+    rows = db.execute(
+        select(AccountCase.case_id, AccountCase.account_id).where(AccountCase.case_id.in_(sorted(case_ids)))
+    ).all()
+    for case_id, account_id in rows:
+        recipients[case_id].append(account_id)
+    return recipients
+
+
+def build_notice_rows(events: List[dict], recipients: Dict[int, List[int]]) -> List[dict]:
+    """
+    事件按绑定人员展开为 notice_log 记录（不通知触发事件的本人）
+
+    :param events: 通知事件
+    :param recipients: {案件ID: [账号ID]}
+    :return: notice_log 记录
+    """
+    rows = []
+    for event in events:
+        case_id = int(event["case_id"])
+        actor_id = int(event.get("actor_id") or 0)
+        for account_id in recipients.get(case_id, []):
+            if account_id == actor_id:
+                continue
+            rows.append({
+                "account_id": account_id,
+                "notice_type": int(event["notice_type"]),
+                "title": event["title"],
+                "content": event["content"],
+                "case_id": case_id,
+                "timestamp": int(event["timestamp"])
+            })
+    return rows
+
+
+def process_events(db, entries: List[Tuple[str, dict]]) -> int:
+    """
+    写入一批事件的通知（一个事务），提交后确认
+
+    :param db: 数据库会话
+    :param entries: [(消息ID, 事件)]
+    :return: 写入的通知条数
+    """
+    if not entries:
+        return 0
+    events = [event for _, event in entries]
+    recipients = load_recipients(db, {int(event["case_id"]) for event in events})
+    rows = build_notice_rows(events, recipients)
+    if rows:
+        db.execute(insert(NoticeLog), rows)
+    db.commit()
+    NoticeQueue.done([entry_id for entry_id, _ in entries])
+    return len(rows)
+
+
+def scan_overdue_cases(db, now: int) -> int:
+    """
+    检查律师回复超时的案件（进行中、正常状态，律师最后回复时间（未回复过则为创建时间）早于超时时间），
+    同一案件在律师再次回复前只通知一次
+
+    :param db: 数据库会话
+    :param now: 当前时间
+    :return: 生成的超时事件数
+    """
+    deadline = now - LAWYER_REPLY_OVERDUE_HOURS * 3600
+    last_id = 0
+    emitted = 0
+    while True:
+        rows = db.execute(
+            select(Case.case_id, Case.title, Case.lawyer_last_timestamp, Case.timestamp).where(
+                Case.case_id > last_id,
+                Case.type == 0,
+                Case.progress == 1,
+                or_(
+                    Case.lawyer_last_timestamp < deadline,
+                    and_(Case.lawyer_last_timestamp.is_(None), Case.timestamp < deadline)
+                )
+            ).order_by(Case.case_id).limit(OVERDUE_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        titles = {case_id: title for case_id, title, _, _ in rows}
+        marks = [(case_id, lawyer_ts or created_ts or 0) for case_id, _, lawyer_ts, created_ts in rows]
+        for case_id in NoticeQueue.mark_overdue(marks):
+            NoticeQueue.emit(lawyer_overdue_event(case_id, titles[case_id], LAWYER_REPLY_OVERDUE_HOURS, now))
+            emitted += 1
+        last_id = rows[-1][0]
+    return emitted
+
+
+def run_once(consumer: str, block_ms: int = BLOCK_MS) -> int:
+    """
+    处理一轮：接管超时未确认的事件，读取新事件
+
+    :param consumer: 消费者名称
+    :param block_ms: 队列为空时最长等待毫秒数
+    :return: 本轮写入的通知条数
+    """
+    entries = NoticeQueue.claim_stale(consumer, STALE_IDLE_MS, BATCH_SIZE)
+    if not entries:
+        entries = NoticeQueue.read(consumer, BATCH_SIZE, block_ms)
+
+    db = SessionLocal()
+    try:
+        return process_events(db, entries)
+    except SQLAlchemyError as e:
+        # 未确认，STALE_IDLE_MS 后重新处理
+        db.rollback()
+        print(f"通知写入失败: {e}")
+        return 0
+    finally:
+        db.close()
+
+
+def main():
+    consumer = sys.argv[1] if len(sys.argv) > 1 else f"{socket.gethostname()}-{os.getpid()}"
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    NoticeQueue.ensure_group()
+    print(f"通知 worker 已启动: {consumer}")
+    next_scan = 0
+    while running:
+        try:
+            now = int(time.time())
+            if NOTICE_OVERDUE_SCAN_SECONDS > 0 and now >= next_scan:
+                next_scan = now + NOTICE_OVERDUE_SCAN_SECONDS
+                db = SessionLocal()
+                try:
+                    scan_overdue_cases(db, now)
+                except SQLAlchemyError as e:
+                    print(f"律师回复超时检查失败: {e}")
+                finally:
+                    db.close()
+            run_once(consumer)
+        except RedisError as e:
+            print(f"通知队列读取失败: {e}")
+            time.sleep(1)
+    print("通知 worker 已退出")
+
+
+if __name__ == "__main__":
+    main()
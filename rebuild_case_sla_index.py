@@ -0,0 +1,25 @@
+"""
+重建律师回复 SLA 索引（Redis 有序集合 case_sla_open）
+用于首次上线或 Redis 数据丢失时，从案件表按案件ID分批重建
+运行: python rebuild_case_sla_index.py
+"""
+from app.core.database import SessionLocal
+from app.utils.case_sla import CaseSlaIndex
+
+
+def rebuild_case_sla_index():
+    """重建索引"""
+    db = SessionLocal()
+    try:
+        total = CaseSlaIndex.rebuild(db)
+        print(f"等待律师回复的案件 {total} 个")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("开始重建律师回复 SLA 索引...")
+    print("-" * 40)
+    rebuild_case_sla_index()
+    print("-" * 40)
+    print("SLA 索引重建完成！")
@@ -0,0 +1,50 @@
+"""
+重建交流消息搜索索引（communication_search_token）
+用于首次上线或索引数据异常时，按消息ID分批重建
+运行: python rebuild_search_index.py
+"""
+from sqlalchemy import select, insert
+
+from app.core.database import SessionLocal
+from app.models import CaseCommunication, CommunicationSearchToken
+from app.search.communication_index import message_token_rows, delete_message_tokens_query
+
+# 每批处理的消息数
+BATCH_SIZE = 1000
+
+
+def rebuild_communication_index():
+    """按消息ID顺序分批重建索引，每批一个事务"""
+    db = SessionLocal()
+    last_id = 0
+    total = 0
+    try:
+        while True:
+            records = db.scalars(
+                select(CaseCommunication).where(
+                    CaseCommunication.case_communication_id > last_id
+                ).order_by(CaseCommunication.case_communication_id).limit(BATCH_SIZE)
+            ).all()
+            if not records:
+                break
+
+            ids = [r.case_communication_id for r in records]
+            db.execute(delete_message_tokens_query(ids))
+            rows = [row for r in records for row in message_token_rows(r)]
+            if rows:
+                db.execute(insert(CommunicationSearchToken), rows)
+            db.commit()
+
+            last_id = ids[-1]
+            total += len(records)
+            print(f"已处理 {total} 条消息")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("开始重建交流消息搜索索引...")
+    print("-" * 40)
+    rebuild_communication_index()
+    print("-" * 40)
+    print("搜索索引重建完成！")
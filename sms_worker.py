@@ -0,0 +1,145 @@
+"""
+短信发送 worker
+消费短信发送队列（sms_outbox），调用短信通道发送，失败按指数退避重试，结果写入 sms 表：
+发送成功后验证码写入 Redis（VerificationCodeStore，登录校验用）并写入 type=1（未使用），放弃发送写入 type=3（发送失败）
+可同时运行多个进程，同一消费组内自动分摊；进程中途退出时未确认的短信由其他进程接管
+运行: python sms_worker.py [消费者名称]
+"""
+import os
+import signal
+import socket
+import sys
+import time
+
+from redis import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import SMS_MAX_ATTEMPTS, SMS_RETRY_BASE_SECONDS
+from app.core.database import SessionLocal
+from app.models import Sms
+from app.sms import SmsOutbox, SmsProvider, VerificationCodeStore, create_sms_provider
+
+# 每次读取的短信数
+BATCH_SIZE = 10
+# 队列为空时最长等待毫秒数
+BLOCK_MS = 1000
+# 未确认超过该毫秒数的短信由当前进程接管
+STALE_IDLE_MS = 60000
+# 请求超过该秒数仍未发出则放弃（验证码 5 分钟有效，太晚送达无意义）
+SEND_DEADLINE_SECONDS = 120
+# 单次重试最长等待秒数
+MAX_RETRY_DELAY = 60
+
+# 短信记录类型
+SMS_TYPE_UNUSED = 1
+SMS_TYPE_FAILED = 3
+
+running = True
+
+
+def stop(signum, frame):
+    """收到退出信号后处理完当前批次再退出"""
+    global running
+    running = False
+
+
+def retry_delay(attempt: int) -> float:
+    """
+    第 attempt 次发送失败后的等待秒数
+
+    :param attempt: 已发送次数
+    :return: 等待秒数
+    """
+    return min(SMS_RETRY_BASE_SECONDS * (2 ** (attempt - 1)), MAX_RETRY_DELAY)
+
+
+def record_sms(db, mobile: str, code: str, timestamp: int, sms_type: int):
+    """写入短信记录"""
+    db.add(Sms(mobile=mobile, sms_code=code, timestamp=timestamp, type=sms_type))
+    db.commit()
+
+
+def handle_entry(provider: SmsProvider, db, entry_id: str, fields: dict):
+    """
+    发送一条短信并记录结果
+
+    :param provider: 短信通道
+    :param db: 数据库会话
+    :param entry_id: 队列消息ID
+    :param fields: 消息字段 {"mobile", "code", "requested_at", "attempt"}
+    """
+    mobile = fields["mobile"]
+    code = fields["code"]
+    attempt = int(fields.get("attempt", 1))
+    now = int(time.time())
+
+    if now - int(fields["requested_at"]) > SEND_DEADLINE_SECONDS:
+        print(f"短信发送超时放弃: {mobile}（第 {attempt} 次）")
+        record_sms(db, mobile, code, now, SMS_TYPE_FAILED)
+        SmsOutbox.done(entry_id)
+        return
+
+    result = provider.send_code(mobile, code)
+    sent_at = int(time.time())
+    if result.ok:
+        # 先保存验证码再确认：确认前进程退出会导致重复发送（同一验证码），但不会丢失可登录的验证码
+        VerificationCodeStore.issue(mobile, code)
+        record_sms(db, mobile, code, sent_at, SMS_TYPE_UNUSED)
+        SmsOutbox.done(entry_id)
+    elif result.retryable and attempt < SMS_MAX_ATTEMPTS:
+        delay = retry_delay(attempt)
+        print(f"短信发送失败，{delay} 秒后重试: {mobile}（第 {attempt} 次）{result.message}")
+        SmsOutbox.retry(entry_id, fields, delay)
+    else:
+        print(f"短信发送失败: {mobile}（第 {attempt} 次）{result.message}")
+        record_sms(db, mobile, code, sent_at, SMS_TYPE_FAILED)
+        SmsOutbox.done(entry_id)
+
+
+def run_once(provider: SmsProvider, consumer: str, block_ms: int = BLOCK_MS) -> int:
+    """
+    处理一轮：到期重试重新入队，接管超时未确认的短信，读取新短信
+
+    :param provider: 短信通道
+    :param consumer: 消费者名称
+    :param block_ms: 队列为空时最长等待毫秒数
+    :return: 本轮处理的短信数
+    """
+    SmsOutbox.promote_due_retries()
+    entries = SmsOutbox.claim_stale(consumer, STALE_IDLE_MS, BATCH_SIZE)
+    if not entries:
+        entries = SmsOutbox.read(consumer, BATCH_SIZE, block_ms)
+
+    db = SessionLocal()
+    try:
+        for entry_id, fields in entries:
+            try:
+                handle_entry(provider, db, entry_id, fields)
+            except SQLAlchemyError as e:
+                # 未确认，STALE_IDLE_MS 后重新处理
+                db.rollback()
+                print(f"短信记录写入失败: {fields.get('mobile')} {e}")
+    finally:
+        db.close()
+    return len(entries)
+
+
+def main():
+    consumer = sys.argv[1] if len(sys.argv) > 1 else f"{socket.gethostname()}-{os.getpid()}"
+    provider = create_sms_provider()
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    SmsOutbox.ensure_group()
+    print(f"短信 worker 已启动: {consumer}（通道: {provider.name}）")
+    while running:
+        try:
+            run_once(provider, consumer)
+        except RedisError as e:
+            print(f"短信队列读取失败: {e}")
+            time.sleep(1)
+    print("短信 worker 已退出")
+
+
+if __name__ == "__main__":
+    main()
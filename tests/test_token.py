@@ -0,0 +1,67 @@
+"""
+签名 Token 签发与吊销测试
+使用 fakeredis 代替 Redis，直接修改 Redis 中的数据模拟其他进程的操作
+运行: pip install pytest fakeredis && python -m pytest tests
+"""
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.utils import token as token_module
+from app.utils.token import TokenManager
+
+ACCOUNT_ID = 7
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """同一个 fakeredis 服务的同步/异步客户端，并配置签名密钥、清空进程内缓存"""
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    async_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(token_module, "redis_client", client)
+    monkeypatch.setattr(token_module, "async_redis_client", async_client)
+    monkeypatch.setattr(token_module, "TOKEN_SECRET_KEY", "test-secret")
+    TokenManager._revocation_cache.clear()
+    yield client
+    TokenManager._revocation_cache.clear()
+
+
+def expire_revocation_cache():
+    """让进程内吊销状态缓存过期（模拟 TOKEN_REVOCATION_CACHE_TTL_SECONDS 之后）"""
+    TokenManager._revocation_cache.clear()
+
+
+def test_generate_after_epoch_bump_by_other_process(fake_redis):
+    # 本进程缓存了纪元 0
+    old_token = TokenManager.generate(ACCOUNT_ID, stateless=True)
+    assert TokenManager.verify(old_token) is not None
+
+    # 其他进程递增纪元（delete_by_account / 单点登录）
+    fake_redis.hincrby(TokenManager._get_revoke_key(ACCOUNT_ID), "epoch", 1)
+
+    new_token = TokenManager.generate(ACCOUNT_ID, stateless=True)
+    assert TokenManager.verify(new_token) is not None
+
+    expire_revocation_cache()
+    assert TokenManager.verify(new_token) is not None
+    assert TokenManager.verify(old_token) is None
+
+
+def test_agenerate_after_epoch_bump_by_other_process(fake_redis):
+    async def run():
+        old_token = await TokenManager.agenerate(ACCOUNT_ID, stateless=True)
+        assert await TokenManager.averify(old_token) is not None
+
+        fake_redis.hincrby(TokenManager._get_revoke_key(ACCOUNT_ID), "epoch", 1)
+
+        new_token = await TokenManager.agenerate(ACCOUNT_ID, stateless=True)
+        assert await TokenManager.averify(new_token) is not None
+
+        expire_revocation_cache()
+        assert await TokenManager.averify(new_token) is not None
+        assert await TokenManager.averify(old_token) is None
+
+    asyncio.run(run())